@@ -0,0 +1,244 @@
+"""
+Framework overhead benchmarks.
+
+Times the core primitives of the framework itself (not the site under test):
+
+- BasePage: click, enter_text, get_text, find_elements, select_from_dropdown,
+  wait_for_page_load, against benchmarks/static/primitives.html served from a
+  local HTTP server in headless Chrome
+- run_keywords on a synthetic 1,000-step plan against the same page
+- get_data on large generated CSV/XLSX files (cold and warm cache)
+- driver.get of benchmarks/static/heavy.html, whose images and tracker are
+  served slowly, with and without utils.resource_blocking
+
+Results are written as JSON and compared with a saved baseline; any metric
+whose median is slower than the baseline by more than --threshold fails the
+run (exit code 1).
+
+Usage:
+    python -m benchmarks.bench_framework                       # run, compare with benchmarks/baseline.json
+    python -m benchmarks.bench_framework --save-baseline       # run and store as the new baseline
+    python -m benchmarks.bench_framework --skip-browser        # data loader benchmarks only
+"""
+import argparse
+import csv
+import functools
+import json
+import os
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+
+from selenium.webdriver.common.by import By
+
+from data.Complete_Test_Data import data_loader
+from page_objects.base_page import BasePage
+from utils.driver_utils import get_driver
+from utils.keyword_engine import compile_keywords, run_keywords
+from utils.resource_blocking import install_blocker
+
+STATIC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'static')
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baseline.json')
+DEFAULT_OUTPUT = os.path.join('reports', 'benchmarks.json')
+
+NAME_INPUT = (By.ID, 'name')
+BUTTON = (By.ID, 'btn')
+LABEL = (By.ID, 'label')
+CHOICE = (By.ID, 'choice')
+ITEMS = (By.CSS_SELECTOR, 'li.item')
+
+# Delay of every /slow/ response, standing in for third-party images and trackers
+SLOW_RESOURCE_SECONDS = 0.3
+
+
+def measure(fn, iterations):
+    """Call `fn` `iterations` times and return latency statistics in milliseconds."""
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    samples.sort()
+    return {
+        'iterations': iterations,
+        'median_ms': round(statistics.median(samples), 3),
+        'mean_ms': round(statistics.fmean(samples), 3),
+        'p95_ms': round(samples[min(len(samples) - 1, int(len(samples) * 0.95))], 3),
+        'min_ms': round(samples[0], 3),
+    }
+
+
+class _StaticServer:
+    """Serve STATIC_DIR on a random local port."""
+
+    def __init__(self):
+        handler = functools.partial(_QuietHandler, directory=STATIC_DIR)
+        self._server = ThreadingHTTPServer(('127.0.0.1', 0), handler)
+        self.url = f"http://127.0.0.1:{self._server.server_address[1]}"
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+
+class _QuietHandler(SimpleHTTPRequestHandler):
+    def do_GET(self):
+        if not self.path.startswith('/slow/'):
+            return super().do_GET()
+        time.sleep(SLOW_RESOURCE_SECONDS)
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/octet-stream')
+        self.send_header('Content-Length', '0')
+        # never cached, so every page load pays for it
+        self.send_header('Cache-Control', 'no-store')
+        self.end_headers()
+
+    def log_message(self, format, *args):
+        pass
+
+
+def synthetic_plan(url, steps=1000):
+    """A keyword plan of `steps` rows cycling through enter_text/click/assert_text."""
+    cycle = [
+        {'action': 'enter_text', 'locator_type': 'id', 'locator': 'name', 'value': 'benchmark'},
+        {'action': 'click', 'locator_type': 'id', 'locator': 'btn', 'value': ''},
+        {'action': 'assert_text', 'locator_type': 'id', 'locator': 'label', 'value': 'Ready'},
+    ]
+    rows = [{'action': 'open_url', 'locator_type': '', 'locator': '', 'value': url}]
+    rows += [cycle[i % len(cycle)] for i in range(steps - 1)]
+    return compile_keywords(rows)
+
+
+def bench_browser(iterations, browser='chrome'):
+    os.environ.setdefault('HEADLESS', 'true')
+    server = _StaticServer()
+    page_url = server.url + '/primitives.html'
+    driver = get_driver(browser)
+    results = {}
+    try:
+        driver.get(page_url)
+        page = BasePage(driver)
+        results['base_page.click'] = measure(lambda: page.click(BUTTON), iterations)
+        results['base_page.enter_text'] = measure(lambda: page.enter_text(NAME_INPUT, 'benchmark'), iterations)
+        results['base_page.get_text'] = measure(lambda: page.get_text(LABEL), iterations)
+        results['base_page.find_elements'] = measure(lambda: page.find_elements(ITEMS), iterations)
+        results['base_page.select_from_dropdown'] = measure(
+            lambda: page.select_from_dropdown(CHOICE, 'Two'), iterations)
+        results['base_page.wait_for_page_load'] = measure(page.wait_for_page_load, iterations)
+        plan = synthetic_plan(page_url)
+        results['keyword_engine.run_keywords_1000'] = measure(lambda: run_keywords(driver, plan), 1)
+        heavy_url = server.url + '/heavy.html'
+        page_loads = max(1, iterations // 10)
+        results['page_load.heavy_unblocked'] = measure(lambda: driver.get(heavy_url), page_loads)
+        if hasattr(driver, 'execute_cdp_cmd'):
+            install_blocker(driver, deny=['*/slow/*'])
+            results['page_load.heavy_blocked'] = measure(lambda: driver.get(heavy_url), page_loads)
+            print(f"blocked requests: {driver.resource_blocker.stats()['blocked']}")
+            driver.resource_blocker.clear()
+    finally:
+        driver.quit()
+        server.stop()
+    return results
+
+
+def _write_data_files(directory, csv_rows, xlsx_rows):
+    from openpyxl import Workbook
+
+    header = ['first_name', 'last_name', 'company_field', 'province', 'address_line_1', 'city', 'postal_code', 'phone_number']
+    row = ['Pratyush', 'Jaishankar', 'Ascendion', 'Karnataka', '123 MG Road', 'Bangalore', '560001', '9876543210']
+    csv_path = os.path.join(directory, 'large.csv')
+    with open(csv_path, 'w', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(header)
+        writer.writerows(row for _ in range(csv_rows))
+    xlsx_path = os.path.join(directory, 'large.xlsx')
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet()
+    sheet.append(header)
+    for _ in range(xlsx_rows):
+        sheet.append(row)
+    workbook.save(xlsx_path)
+    return csv_path, xlsx_path
+
+
+def bench_data(csv_rows, xlsx_rows, iterations):
+    results = {}
+    with tempfile.TemporaryDirectory() as directory:
+        csv_path, xlsx_path = _write_data_files(directory, csv_rows, xlsx_rows)
+        for label, path in (('csv', csv_path), ('xlsx', xlsx_path)):
+            def cold(path=path):
+                data_loader.clear_cache()
+                data_loader.get_data(path)
+
+            results[f'data_loader.get_data_{label}_cold'] = measure(cold, iterations)
+            data_loader.get_data(path)
+            results[f'data_loader.get_data_{label}_warm'] = measure(lambda path=path: data_loader.get_data(path), iterations)
+    data_loader.clear_cache()
+    return results
+
+
+def compare(results, baseline, threshold):
+    """Return (rows, regressions) comparing median_ms of each metric with the baseline."""
+    rows = []
+    regressions = []
+    for name, current in sorted(results.items()):
+        previous = baseline.get(name)
+        if not previous or not previous.get('median_ms'):
+            rows.append((name, current['median_ms'], None, None))
+            continue
+        ratio = current['median_ms'] / previous['median_ms']
+        rows.append((name, current['median_ms'], previous['median_ms'], ratio))
+        if ratio > 1 + threshold:
+            regressions.append(name)
+    return rows, regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark framework primitives.")
+    parser.add_argument('--iterations', type=int, default=50)
+    parser.add_argument('--browser', default='chrome')
+    parser.add_argument('--skip-browser', action='store_true', help="only run the data loader benchmarks")
+    parser.add_argument('--csv-rows', type=int, default=50000)
+    parser.add_argument('--xlsx-rows', type=int, default=10000)
+    parser.add_argument('--output', default=DEFAULT_OUTPUT)
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE)
+    parser.add_argument('--save-baseline', action='store_true')
+    parser.add_argument('--threshold', type=float, default=0.2, help="allowed slowdown vs baseline (0.2 = 20%%)")
+    args = parser.parse_args(argv)
+
+    results = {}
+    if not args.skip_browser:
+        results.update(bench_browser(args.iterations, args.browser))
+    results.update(bench_data(args.csv_rows, args.xlsx_rows, max(1, args.iterations // 10)))
+
+    os.makedirs(os.path.dirname(args.output) or '.', exist_ok=True)
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(results, f, indent=2)
+
+    if args.save_baseline:
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+        print(f"Baseline saved to {args.baseline}")
+
+    baseline = {}
+    if os.path.exists(args.baseline) and not args.save_baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            baseline = json.load(f)
+
+    rows, regressions = compare(results, baseline, args.threshold)
+    print(f"{'benchmark':<45} {'median ms':>10} {'baseline':>10} {'ratio':>7}")
+    for name, current, previous, ratio in rows:
+        previous_text = f"{previous:>10.3f}" if previous is not None else f"{'-':>10}"
+        ratio_text = f"{ratio:>7.2f}" if ratio is not None else f"{'-':>7}"
+        flag = '  REGRESSION' if name in regressions else ''
+        print(f"{name:<45} {current:>10.3f} {previous_text} {ratio_text}{flag}")
+    print(f"Results written to {args.output}")
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
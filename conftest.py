@@ -1,26 +1,303 @@
-# conftest.py
 import os
+import inspect
+import json
+import threading
 import pytest
 import allure
 from utils.driver_utils import get_driver
+from utils.driver_pool import DriverPool, is_pool_enabled, is_prewarm_enabled
+from utils.browser_config import get_browsers
+from utils import wait_budget
+from utils.command_metrics import get_recorder, merge_summaries
+from utils.resource_blocking import get_blocker
+from utils.failure_artifacts import FailureArtifacts, is_failure_artifacts_enabled
+from utils.site_config import get_base_url, is_local_site_enabled
+from utils.duration_history import is_duration_recording_enabled, is_duration_scheduling_enabled, update_history
+from utils.tab_runner import TabRows, TabRunner, raise_for_failures, settings_warnings, tab_count
+from utils.account_pool import AccountPool, default_owner, is_account_pool_enabled
+from data.Complete_Test_Data.data_loader import combine, iter_data, parse_shard
+
+
+# Per-test WebDriver command summaries, collected from all xdist workers on the controller
+_command_metrics = {}
+# nodeid -> seconds spent in setup + call + teardown
+_durations = {}
+# Background encoder for failure screenshots/DOM/console, created on the first failure
+_failure_artifacts = None
+
+_ATTACHMENT_TYPES = {
+    'png': allure.attachment_type.PNG,
+    'jpg': allure.attachment_type.JPG,
+    'json': allure.attachment_type.JSON,
+    'txt': allure.attachment_type.TEXT,
+}
+
+
+def pytest_configure(config):
+    config.addinivalue_line(
+        'markers',
+        'data_rows(argname, path, columns=None, where=None, start=0, stop=None, shard=False): '
+        'parametrize `argname` with rows streamed from a CSV/XLSX data file',
+    )
+    config.addinivalue_line(
+        'markers',
+        'data_combinations(strength=2, seed=0, shard=False, indirect=(), **sources): parametrize one argument '
+        'per source (data file path or list) with a pairwise/n-wise covering set instead of the full product',
+    )
+    config.addinivalue_line(
+        'markers',
+        'block_resources(deny=None, allow=None): URL patterns to block/allow when BLOCK_RESOURCES=true',
+    )
+    config.addinivalue_line(
+        'markers',
+        'tab_rows(argname, rows=None): with TAB_ROWS=N, run the `argname` rows of a test in N tabs of one '
+        'browser; `rows` parametrizes `argname` (otherwise it comes from data_rows/data_combinations)',
+    )
+    if tab_count() > 1:
+        for message in settings_warnings():
+            config.issue_config_time_warning(pytest.PytestConfigWarning(message), stacklevel=2)
+
+
+def pytest_generate_tests(metafunc):
+    """Parametrize tests marked with `data_rows` from a data file.
+
+    Rows are streamed with `iter_data`, so only the projected columns of the selected rows
+    are kept in memory. For markers with `shard=True`, DATA_SHARD=i/n keeps every n-th row
+    starting at i, which lets separate pytest runs (e.g. Jenkins agents) split a large data
+    file between them. Test ids use the row number in the file, so they are stable across shards.
+
+    Sharding is per pytest run, not per xdist worker: xdist requires every worker to collect
+    the same tests.
+
+    Tests marked with `data_combinations` are parametrized with a pairwise (or `strength`-wise)
+    covering set of their sources (see data_loader.combine) instead of stacked parametrize
+    axes; `shard=True` shards the combinations the same way.
+
+    With TAB_ROWS=N (N > 1) the rows of a `tab_rows(argname)` test become a single parameter
+    value, a TabRows list: `test_x[chrome-address_data0]`, `test_x[chrome-address_data1]`, ...
+    are collected as one `test_x[chrome-address_data-tabs]`, whose call runs every row in its
+    own tab (see utils/tab_runner.py and pytest_pyfunc_call below). With data_combinations the
+    rows are grouped by the values of the other arguments.
+    """
+    shard = parse_shard(os.environ.get('DATA_SHARD'))
+    tab_marker = metafunc.definition.get_closest_marker('tab_rows')
+    tab_argname = tab_marker.args[0] if tab_marker is not None and tab_count() > 1 else None
+    if tab_marker is not None:
+        argname = tab_marker.args[0]
+        rows = tab_marker.args[1] if len(tab_marker.args) > 1 else tab_marker.kwargs.get('rows')
+        if rows is not None:
+            _parametrize_rows(metafunc, argname, list(rows), [f"{argname}{n}" for n in range(len(rows))],
+                              tab_argname)
+    for marker in metafunc.definition.iter_markers('data_rows'):
+        argname, path = marker.args
+        kwargs = dict(marker.kwargs)
+        use_shard = shard if kwargs.pop('shard', False) else None
+        rows = list(iter_data(path, shard=use_shard, with_index=True, **kwargs))
+        _parametrize_rows(metafunc, argname, [row for _, row in rows], [f"{argname}{n}" for n, _ in rows],
+                          tab_argname)
+    for marker in metafunc.definition.iter_markers('data_combinations'):
+        sources = dict(marker.kwargs)
+        strength = sources.pop('strength', 2)
+        seed = sources.pop('seed', 0)
+        indirect = list(sources.pop('indirect', ()))
+        use_shard = shard if sources.pop('shard', False) else None
+        names = list(sources)
+        combos = combine(sources, strength=strength, seed=seed, with_index=True)
+        if use_shard:
+            combos = [c for n, c in enumerate(combos) if n % use_shard[1] == use_shard[0]]
+        values = [tuple(combination[name] for name in names) for _, combination in combos]
+        ids = [[combination[name] if isinstance(combination[name], str) else f"{name}{index[name]}"
+                for name in names] for index, combination in combos]
+        if tab_argname in names and tab_argname not in indirect:
+            values, ids = _fold_combinations(values, ids, names.index(tab_argname), tab_argname)
+        metafunc.parametrize(names, values, ids=['-'.join(parts) for parts in ids], indirect=indirect)
+
+
+def _parametrize_rows(metafunc, argname, rows, ids, tab_argname):
+    """Parametrize `argname` with one value per row, or with all rows as one TabRows value."""
+    if argname == tab_argname and len(rows) > 1:
+        metafunc.parametrize(argname, [TabRows(zip(ids, rows))], ids=[f"{argname}-tabs"])
+    else:
+        metafunc.parametrize(argname, rows, ids=ids)
+
+
+def _fold_combinations(values, ids, position, argname):
+    """Fold combinations that differ only in the `position` argument into one TabRows value each."""
+    groups = {}
+    for value, parts in zip(values, ids):
+        # repr: data_combinations hands out a copy of a row per combination
+        key = tuple(repr(v) for i, v in enumerate(value) if i != position)
+        groups.setdefault(key, []).append((value, parts))
+    folded_values, folded_ids = [], []
+    for group in groups.values():
+        value, parts = group[0]
+        if len(group) > 1:
+            rows = TabRows((p[position], v[position]) for v, p in group)
+            value = value[:position] + (rows,) + value[position + 1:]
+            parts = parts[:position] + [f"{argname}-tabs"] + parts[position + 1:]
+        folded_values.append(value)
+        folded_ids.append(parts)
+    return folded_values, folded_ids
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_pyfunc_call(pyfuncitem):
+    """Call a folded `tab_rows` test once per row, rows side by side in tabs of the test's browser."""
+    marker = pyfuncitem.get_closest_marker('tab_rows')
+    if marker is None or not isinstance(pyfuncitem.funcargs.get(marker.args[0]), TabRows):
+        return None
+    argname = marker.args[0]
+    rows = pyfuncitem.funcargs[argname]
+    funcargs = {name: pyfuncitem.funcargs[name] for name in inspect.signature(pyfuncitem.obj).parameters}
+    runner = TabRunner(funcargs['driver'], max_tabs=tab_count())
+    results = runner.run(rows, _row_caller(pyfuncitem.obj, funcargs, argname))
+    try:
+        allure.attach(json.dumps({r.row_id: r.as_dict() for r in results}, indent=2), name='tab rows',
+                      attachment_type=allure.attachment_type.JSON)
+        for r in results:
+            if r.screenshot:
+                allure.attach(r.screenshot, name=f'screenshot {r.row_id}', attachment_type=allure.attachment_type.PNG)
+    except Exception:
+        pass
+    raise_for_failures(results)
+    return True
+
+
+def _row_caller(test, funcargs, argname):
+    """`fn(row)` for TabRunner; with ACCOUNT_POOL=true every row logs in with an account of its own.
+
+    The test's `leased_account` goes to the first row, the other rows lease one each,
+    so rows in different tabs never edit the same account at the same time.
+    """
+    if funcargs.get('leased_account') is None:
+        return lambda row: test(**{**funcargs, argname: row})
+    spare = [funcargs['leased_account']]
+    spare_lock = threading.Lock()
+
+    def call_row(row):
+        args = {**funcargs, argname: row}
+        with spare_lock:
+            account = spare.pop() if spare else None
+        if account is not None:
+            return test(**{**args, 'leased_account': account})
+        pool = AccountPool(funcargs.get('base_url'))
+        owner = f"{default_owner()}:{threading.current_thread().name}"
+        account = pool.lease(owner)
+        try:
+            return test(**{**args, 'leased_account': account})
+        finally:
+            pool.release(account, owner)
+
+    return call_row
+
+
+@pytest.fixture(scope='session')
+def base_url():
+    """Root URL of the site under test (no trailing slash).
+
+    With LOCAL_SITE=true the bundled stand-in (utils/local_site.py) is started for the
+    session and BASE_URL is pointed at it, so page objects follow automatically.
+    Otherwise BASE_URL (default https://market99.com) is used as-is.
+    """
+    if not is_local_site_enabled():
+        yield get_base_url()
+        return
+    from utils.local_site import LocalSite
+    site = LocalSite().start()
+    previous = os.environ.get('BASE_URL')
+    os.environ['BASE_URL'] = site.url
+    yield site.url
+    site.stop()
+    if previous is None:
+        os.environ.pop('BASE_URL', None)
+    else:
+        os.environ['BASE_URL'] = previous
+
+
+@pytest.fixture
+def leased_account(base_url):
+    """An account from the pool held exclusively by this test, or None unless ACCOUNT_POOL=true.
+
+    Returns {'email', 'password'} (usable wherever a login_data row is) and gives the
+    account back on teardown; see utils/account_pool.py.
+    """
+    if not is_account_pool_enabled():
+        yield None
+        return
+    pool = AccountPool(base_url)
+    account = pool.lease()
+    yield account
+    pool.release(account)
+
+
+def pytest_sessionstart(session):
+    """With PREWARM_BROWSERS=true, start launching browsers while tests are being collected.
+
+    Runs in every xdist worker (each warms its own pool) but not in the xdist controller,
+    which never runs tests.
+    """
+    config = session.config
+    if not (is_pool_enabled() and is_prewarm_enabled()):
+        return
+    if not hasattr(config, 'workerinput') and getattr(config.option, 'numprocesses', None):
+        return
+    config._driver_pool = DriverPool()
+    config._driver_pool.prewarm(get_browsers(), os.environ.get('SELENIUM_REMOTE_URL'))
+
+
+@pytest.fixture(scope='session')
+def driver_pool(request):
+    """Session-wide pool of warm browsers (one pool per xdist worker process)."""
+    pool = getattr(request.config, '_driver_pool', None) or DriverPool()
+    yield pool
+    pool.close()
 
 
 @pytest.fixture
-def driver(request):
+def driver(request, driver_pool):
     """PyTest fixture that returns a WebDriver instance.
 
     Use `@pytest.mark.parametrize('driver', ['chrome'], indirect=True)` in tests to pass browser.
     The fixture supports remote execution via the SELENIUM_REMOTE_URL environment variable.
+
+    Drivers are borrowed from `driver_pool` and reset between tests; set DRIVER_POOL=false
+    to get a fresh browser per test instead.
     """
     browser = request.param if hasattr(request, 'param') else os.environ.get('BROWSER', 'chrome')
     remote_url = os.environ.get('SELENIUM_REMOTE_URL')
     caps = None
-    driver = get_driver(browser, remote_url, caps)
+    if not is_pool_enabled():
+        driver = get_driver(browser, remote_url, caps)
+        _apply_block_lists(request, driver)
+        yield driver
+        try:
+            driver.quit()
+        except Exception:
+            pass
+        return
+
+    driver = driver_pool.acquire(browser, remote_url, caps)
+    recorder = get_recorder(driver)
+    if recorder is not None:
+        # Pooled drivers carry commands from earlier tests and from the pool reset
+        recorder.reset()
+    _apply_block_lists(request, driver)
     yield driver
-    try:
-        driver.quit()
-    except Exception:
-        pass
+    # A failed test may leave the browser in an unknown state; replace it
+    rep = getattr(request.node, 'rep_call', None)
+    failed = rep is not None and rep.failed
+    driver_pool.release(driver, discard=failed)
+
+
+def _apply_block_lists(request, driver):
+    """Re-apply the block lists of the test's `block_resources` marker (pooled drivers keep the last ones)."""
+    blocker = get_blocker(driver)
+    if blocker is None:
+        return
+    marker = request.node.get_closest_marker('block_resources')
+    kwargs = marker.kwargs if marker else {}
+    blocker.apply(kwargs.get('deny'), kwargs.get('allow'))
+    blocker.reset_counters()
 
 
 # Attach screenshots on failure to Allure report
@@ -28,16 +305,128 @@ def driver(request):
 def pytest_runtest_makereport(item, call):
     outcome = yield
     rep = outcome.get_result()
-    if rep.when == 'call' and rep.failed:
-        driver = item.funcargs.get('driver') if hasattr(item, 'funcargs') else None
-        if not driver:
-            # Try alternative access
-            driver = item._request.funcargs.get('driver') if hasattr(item, '_request') else None
-        if driver:
-            try:
-                png = driver.get_screenshot_as_png()
-                allure.attach(png, name='screenshot', attachment_type=allure.attachment_type.PNG)
-            except Exception:
-                # don't raise in hook
-                pass
+    # Expose the report to fixtures (e.g. the driver pool recycles after failures)
+    setattr(item, 'rep_' + rep.when, rep)
+    if rep.when == 'teardown':
+        _attach_failure_artifacts(item)
+    if rep.when != 'call':
+        return
+    driver = item.funcargs.get('driver') if hasattr(item, 'funcargs') else None
+    if not driver:
+        # Try alternative access
+        request = getattr(item, '_request', None)
+        driver = getattr(request, 'funcargs', {}).get('driver') if request else None
+    recorder = get_recorder(driver)
+    if recorder is not None:
+        # WebDriver command latency summary for every test
+        summary = recorder.summary()
+        rep.user_properties.append(('command_metrics', summary))
+        try:
+            allure.attach(json.dumps(summary, indent=2), name='webdriver commands',
+                          attachment_type=allure.attachment_type.JSON)
+        except Exception:
+            pass
+    blocker = get_blocker(driver)
+    if blocker is not None:
+        try:
+            allure.attach(json.dumps(blocker.stats(), indent=2), name='blocked requests',
+                          attachment_type=allure.attachment_type.JSON)
+        except Exception:
+            pass
+    if rep.failed and driver:
+        if is_failure_artifacts_enabled():
+            # Only the WebDriver calls happen here; encoding overlaps the driver teardown
+            global _failure_artifacts
+            if _failure_artifacts is None:
+                _failure_artifacts = FailureArtifacts()
+            item._failure_artifacts = _failure_artifacts.capture(driver, item.nodeid)
+            return
+        try:
+            png = driver.get_screenshot_as_png()
+            allure.attach(png, name='screenshot', attachment_type=allure.attachment_type.PNG)
+        except Exception:
+            # don't raise in hook
+            pass
+
+
+def _attach_failure_artifacts(item):
+    future = getattr(item, '_failure_artifacts', None)
+    if future is None:
+        return
+    try:
+        for name, body, extension in future.result(timeout=60):
+            allure.attach(body, name=name, attachment_type=_ATTACHMENT_TYPES.get(extension), extension=extension)
+    except Exception:
+        # don't raise in hook
+        pass
+
+
+@pytest.fixture(autouse=True)
+def _wait_budget(request):
+    """Record time spent in sleeps vs waits per test when WAIT_BUDGET=true."""
+    if not wait_budget.is_wait_budget_enabled():
+        yield
+        return
+    wait_budget.start()
+    try:
+        yield
+    finally:
+        budget = wait_budget.stop().as_dict()
+        request.node.user_properties.append(('wait_budget', budget))
+        allure.attach(json.dumps(budget, indent=2), name='wait budget',
+                      attachment_type=allure.attachment_type.JSON)
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_xdist_make_scheduler(config, log):
+    """Hand out the longest tests first under `-n N` (see utils/lpt_scheduler.py)."""
+    if not is_duration_scheduling_enabled() or config.getoption('dist') != 'load':
+        return None
+    from utils.lpt_scheduler import DurationScheduling
+    return DurationScheduling(config, log)
+
+
+def pytest_runtest_logreport(report):
+    _durations[report.nodeid] = _durations.get(report.nodeid, 0.0) + report.duration
+    if report.when != 'call':
+        return
+    for name, value in report.user_properties:
+        if name == 'command_metrics':
+            _command_metrics[report.nodeid] = value
+
+
+def pytest_sessionfinish(session):
+    """Write the session-wide command metrics and test durations (controller only under xdist)."""
+    # Pre-warmed browsers are leaked if no test ever requested the driver_pool fixture
+    pool = getattr(session.config, '_driver_pool', None)
+    if pool is not None:
+        pool.close()
+    if _failure_artifacts is not None:
+        _failure_artifacts.shutdown()
+    if hasattr(session.config, 'workerinput'):
+        return
+    if is_duration_recording_enabled(session.config.getoption('numprocesses', None)):
+        update_history(_durations)
+    if not _command_metrics:
+        return
+    path = os.environ.get('COMMAND_METRICS_FILE', os.path.join('reports', 'command_metrics.json'))
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(merge_summaries(_command_metrics), f, indent=2)
+
 
+def pytest_terminal_summary(terminalreporter):
+    """Print the slowest tests by sleep time (works with xdist: budgets travel in user_properties)."""
+    rows = []
+    for reports in terminalreporter.stats.values():
+        for rep in reports:
+            if getattr(rep, 'when', None) != 'teardown':
+                continue
+            for name, value in getattr(rep, 'user_properties', []):
+                if name == 'wait_budget':
+                    rows.append((rep.nodeid, value))
+    if not rows:
+        return
+    terminalreporter.write_sep('=', 'wait budget')
+    for line in wait_budget.format_report(rows):
+        terminalreporter.write_line(line)
@@ -1,29 +1,355 @@
 import os
 import csv
-from typing import List, Dict
+import hashlib
+import json
+import random
+from functools import lru_cache
+from itertools import combinations, islice, product
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+
+# Parsed files, keyed by (absolute path, mtime, size) so an edited file is re-read
+_cache: Dict[tuple, List[Dict[str, str]]] = {}
+
+# Bump when the on-disk cache format changes
+_DISK_CACHE_VERSION = 1
+
+# Candidate tests built per chosen test when covering combinations; more = fewer tests, slower
+_COMBINATION_CANDIDATES = 20
+
+# Pairwise: the greedy search is only tried against the orthogonal array below this many pairs
+# (it costs seconds at a few thousand, and runs at collection time)
+_GREEDY_MAX_PAIRS = 500
+
+
+def _file_key(path: str) -> tuple:
+    st = os.stat(path)
+    return (os.path.abspath(path), st.st_mtime_ns, st.st_size)
+
+
+def _cell_to_str(value) -> str:
+    if value is None:
+        return ''
+    if isinstance(value, float) and value.is_integer():
+        # Excel stores numbers as floats; keep '560001' rather than '560001.0'
+        return str(int(value))
+    return str(value)
+
+
+def _iter_csv(path: str) -> Iterator[Dict[str, str]]:
+    with open(path, newline='') as csvfile:
+        reader = csv.DictReader(csvfile)
+        yield from reader
+
+
+def _iter_excel(path: str) -> Iterator[Dict[str, str]]:
+    # import openpyxl only when needed to avoid requiring it for CSV-only runs
+    try:
+        from openpyxl import load_workbook
+    except Exception:
+        raise RuntimeError("openpyxl is required to read Excel files (install openpyxl)")
+    # read_only streams rows instead of loading the whole workbook into memory
+    workbook = load_workbook(path, read_only=True, data_only=True)
+    try:
+        rows = workbook.active.iter_rows(values_only=True)
+        header = next(rows, None)
+        if header is None:
+            return
+        columns = [_cell_to_str(c) for c in header]
+        for values in rows:
+            if values is None or all(v is None for v in values):
+                # skip blank rows (pandas did the same)
+                continue
+            cells = [_cell_to_str(v) for v in values]
+            cells += [''] * (len(columns) - len(cells))
+            yield dict(zip(columns, cells))
+    finally:
+        workbook.close()
+
+
+def _read_csv(path: str) -> List[Dict[str, str]]:
+    return list(_iter_csv(path))
+
+
+def _read_excel(path: str) -> List[Dict[str, str]]:
+    return list(_iter_excel(path))
+
+
+def _disk_cache_path(key: tuple):
+    cache_dir = os.environ.get('DATA_CACHE_DIR')
+    if not cache_dir:
+        return None
+    digest = hashlib.sha256(repr(key).encode('utf-8')).hexdigest()
+    return os.path.join(cache_dir, f"{digest}.json")
+
+
+def _load_disk_cache(key: tuple):
+    cache_path = _disk_cache_path(key)
+    if not cache_path or not os.path.exists(cache_path):
+        return None
+    try:
+        with open(cache_path, encoding='utf-8') as f:
+            cached = json.load(f)
+        if cached.get('version') == _DISK_CACHE_VERSION:
+            return cached['rows']
+    except (OSError, ValueError, KeyError):
+        pass
+    return None
+
+
+def _save_disk_cache(key: tuple, rows: List[Dict[str, str]]):
+    cache_path = _disk_cache_path(key)
+    if not cache_path:
+        return
+    try:
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+        tmp = f"{cache_path}.{os.getpid()}.tmp"
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump({'version': _DISK_CACHE_VERSION, 'rows': rows}, f)
+        os.replace(tmp, cache_path)
+    except OSError:
+        # The disk cache is only an optimisation
+        pass
+
+
+def clear_cache():
+    """Forget every parsed file held in memory."""
+    _cache.clear()
+
+
+def _check_path(path: str) -> str:
+    if not os.path.exists(path):
+        raise FileNotFoundError(f"Data file not found: {path}")
+    lower = path.lower()
+    if not lower.endswith(('.csv', '.xls', '.xlsx')):
+        raise ValueError("Unsupported data file type. Provide .csv or .xlsx")
+    return lower
 
 
 def get_data(path: str) -> List[Dict[str, str]]:
     """
     Load test data from CSV or Excel (.xlsx). Returns a list of dict rows.
+
+    Parsed rows are cached in memory per (path, mtime, size), so repeated calls
+    during collection only touch the file system for a stat. Set DATA_CACHE_DIR
+    to also keep parsed files on disk between runs (useful for large workbooks).
     """
-    if not os.path.exists(path):
-        raise FileNotFoundError(f"Data file not found: {path}")
+    lower = _check_path(path)
+    key = _file_key(path)
+    rows = _cache.get(key)
+    if rows is None:
+        rows = _load_disk_cache(key)
+        if rows is None:
+            rows = _read_csv(path) if lower.endswith('.csv') else _read_excel(path)
+            _save_disk_cache(key, rows)
+        # drop rows parsed from an older version of the same file
+        for stale in [k for k in _cache if k[0] == key[0]]:
+            del _cache[stale]
+        _cache[key] = rows
+    # hand out copies so a test mutating its row cannot leak into other tests
+    return [dict(row) for row in rows]
 
-    lower = path.lower()
-    if lower.endswith('.csv'):
-        with open(path, newline='') as csvfile:
-            reader = csv.DictReader(csvfile)
-            return [row for row in reader]
-    elif lower.endswith(('.xls', '.xlsx')):
-        # import pandas only when needed to avoid requiring it for CSV-only runs
-        try:
-            import pandas as pd
-        except Exception:
-            raise RuntimeError("pandas is required to read Excel files (install pandas and openpyxl)")
-        df = pd.read_excel(path, engine='openpyxl')
-        # Convert NaN to empty string and then to dicts of strings
-        df = df.fillna('')
-        return df.astype(str).to_dict(orient='records')
+
+def parse_shard(spec: Optional[str]) -> Optional[Tuple[int, int]]:
+    """Parse an "i/n" shard spec (0-based i) as used by DATA_SHARD; None/'' means no sharding."""
+    if not spec:
+        return None
+    try:
+        index, count = (int(part) for part in spec.split('/'))
+    except ValueError:
+        raise ValueError(f"Invalid shard '{spec}', expected 'i/n' e.g. '0/4'")
+    if count < 1 or not 0 <= index < count:
+        raise ValueError(f"Invalid shard '{spec}': need 0 <= i < n")
+    return index, count
+
+
+def iter_data(path: str,
+              columns: Optional[Iterable[str]] = None,
+              where: Union[Callable[[Dict[str, str]], bool], Dict[str, str], None] = None,
+              start: int = 0,
+              stop: Optional[int] = None,
+              shard: Optional[Tuple[int, int]] = None,
+              with_index: bool = False) -> Iterator:
+    """
+    Lazily yield rows of a CSV or Excel file.
+
+    Unlike get_data, rows are streamed one at a time (unless the file is
+    already in get_data's cache), so memory stays flat for huge files.
+
+    Args:
+        columns: keep only these columns (projection)
+        where: callable(row) -> bool, or {column: value} equality filter
+        start, stop: slice on the file's data row number (0-based, header excluded)
+        shard: (i, n) keeps rows whose number % n == i
+        with_index: yield (row_number, row) pairs instead of rows
+    """
+    lower = _check_path(path)
+    cached = _cache.get(_file_key(path))
+    if cached is not None:
+        rows = iter(cached)
     else:
-        raise ValueError("Unsupported data file type. Provide .csv or .xlsx")
+        rows = _iter_csv(path) if lower.endswith('.csv') else _iter_excel(path)
+
+    if isinstance(where, dict):
+        expected = dict(where)
+        where = lambda row: all(row.get(k) == v for k, v in expected.items())
+    columns = list(columns) if columns is not None else None
+
+    for number, row in islice(enumerate(rows), start, stop):
+        if shard and number % shard[1] != shard[0]:
+            continue
+        if where is not None and not where(row):
+            continue
+        if columns is not None:
+            row = {c: row.get(c, '') for c in columns}
+        else:
+            row = dict(row)
+        yield (number, row) if with_index else row
+
+
+def _combination_values(source) -> List[Any]:
+    if isinstance(source, str) and source.lower().endswith(('.csv', '.xls', '.xlsx')):
+        return get_data(source)
+    return list(source)
+
+
+def _cover(sizes: Sequence[int], strength: int, rng: random.Random) -> List[Tuple[int, ...]]:
+    """Greedy (AETG-style) covering array: value indices per test, every `strength`-tuple covered."""
+    columns = range(len(sizes))
+    uncovered = set()
+    for cols in combinations(columns, strength):
+        for values in product(*(range(sizes[c]) for c in cols)):
+            uncovered.add(tuple(zip(cols, values)))
+
+    def gain(assigned, column, value):
+        # uncovered tuples completed by setting `column`, given the columns assigned so far
+        others = sorted(assigned)
+        count = 0
+        for cols in combinations(others, strength - 1):
+            pairs = sorted([(c, assigned[c]) for c in cols] + [(column, value)])
+            count += tuple(pairs) in uncovered
+        return count
+
+    tests = []
+    while uncovered:
+        ordered = sorted(uncovered)
+        best, best_covered = None, -1
+        for _ in range(_COMBINATION_CANDIDATES):
+            assigned = dict(rng.choice(ordered))
+            rest = [c for c in columns if c not in assigned]
+            rng.shuffle(rest)
+            for column in rest:
+                gains = [(gain(assigned, column, v), rng.random(), v) for v in range(sizes[column])]
+                assigned[column] = max(gains)[2]
+            test = tuple(assigned[c] for c in columns)
+            covered = sum(
+                tuple((c, test[c]) for c in cols) in uncovered for cols in combinations(columns, strength)
+            )
+            if covered > best_covered:
+                best, best_covered = test, covered
+        tests.append(best)
+        for cols in combinations(columns, strength):
+            uncovered.discard(tuple((c, best[c]) for c in cols))
+    return tests
+
+
+def _next_prime(n: int) -> int:
+    n = max(n, 2)
+    while any(n % d == 0 for d in range(2, int(n ** 0.5) + 1)):
+        n += 1
+    return n
+
+
+def _pairwise_array(sizes: Sequence[int], rng: random.Random) -> List[Tuple[int, ...]]:
+    """
+    Pairwise cover cut from the orthogonal array OA(p^2, p+1, p, 2), p prime.
+
+    Row (a, b) has b, a, a+b, a+2b, ... (mod p) in its columns, so every pair of values
+    of every two columns occurs exactly once. Values above a column's size are folded
+    back into it, and rows adding no new pair are dropped. For up to p+1 sources of
+    prime size p this is the optimal p^2 tests (25 for 5x5x5x5), and (50, 40, 3)
+    gives the optimal 2000; other shapes can come out above the minimum.
+    """
+    p = _next_prime(max(max(sizes), len(sizes) - 1))
+    # seeded relabelling of the values of each column keeps the array valid
+    labels = [rng.sample(range(p), p) for _ in sizes]
+    rows = []
+    for a in range(p):
+        for b in range(p):
+            cells = [b, a] + [(a * m + b) % p for m in range(1, len(sizes) - 1)]
+            rows.append([labels[c][v] for c, v in enumerate(cells[:len(sizes)])])
+    # rows that need no folding first: an exact array for the given sizes is made of them
+    rows.sort(key=lambda row: sum(v >= size for v, size in zip(row, sizes)))
+    columns = list(combinations(range(len(sizes)), 2))
+    uncovered = {(i, j, x, y) for i, j in columns for x in range(sizes[i]) for y in range(sizes[j])}
+    tests = []
+    for row in rows:
+        test = tuple(v % size for v, size in zip(row, sizes))
+        new = {(i, j, test[i], test[j]) for i, j in columns} & uncovered
+        if new:
+            tests.append(test)
+            uncovered -= new
+            if not uncovered:
+                break
+    return tests
+
+
+@lru_cache(maxsize=None)
+def _covering_tests(sizes: Tuple[int, ...], strength: int, seed: int) -> Tuple[Tuple[int, ...], ...]:
+    """Value indices of the tests covering every `strength`-tuple; cached per size tuple."""
+    if strength >= len(sizes):
+        return tuple(product(*(range(size) for size in sizes)))
+    if strength != 2:
+        return tuple(sorted(_cover(sizes, strength, random.Random(seed))))
+    tests = _pairwise_array(sizes, random.Random(seed))
+    largest = sorted(sizes)[-2:]
+    pairs = sum(sizes[i] * sizes[j] for i, j in combinations(range(len(sizes)), 2))
+    if len(tests) > largest[0] * largest[1] and pairs <= _GREEDY_MAX_PAIRS:
+        greedy = _cover(sizes, strength, random.Random(seed))
+        if len(greedy) < len(tests):
+            tests = greedy
+    return tuple(sorted(tests))
+
+
+def combine(sources: Dict[str, Union[str, Iterable[Any]]],
+            strength: int = 2,
+            seed: int = 0,
+            with_index: bool = False) -> List:
+    """
+    Pick combinations of several data sources that cover every pair (or n-tuple) of values.
+
+    Stacked parametrize axes run the full product: 2 browsers x 10 addresses x
+    5 logins is 100 tests. combine() returns a much smaller set in which every
+    value of every source still meets every value of every other source at
+    least once (pairwise, strength=2) or every `strength` sources together.
+    strength >= len(sources) gives the full product.
+
+    The result is deterministic for a given seed, so xdist workers and reruns
+    collect the same tests. Pairwise sets come from an orthogonal array (optimal
+    for e.g. 5x5x5x5: 25 tests), or from a greedy search when that is smaller; higher strengths use the greedy search, which may
+    return somewhat more tests than the minimum. Sets are cached per size tuple.
+
+    Args:
+        sources: {name: path to a CSV/Excel file (rows via get_data) or a list of values}
+        strength: size of the value tuples to cover (2 = pairwise)
+        seed: seed for tie-breaking; change it to get a different covering set
+        with_index: return ({name: index}, combination) pairs instead of combinations
+
+    Returns:
+        [{name: value}, ...]; row dicts are copies, one per combination
+    """
+    if strength < 1:
+        raise ValueError(f"Invalid strength {strength}: must be at least 1")
+    names = list(sources)
+    values = [_combination_values(sources[name]) for name in names]
+    if not names or any(not v for v in values):
+        return []
+    tests = _covering_tests(tuple(len(v) for v in values), strength, seed)
+
+    result = []
+    for test in tests:
+        combination = {}
+        for name, column, index in zip(names, values, test):
+            value = column[index]
+            combination[name] = dict(value) if isinstance(value, dict) else value
+        result.append((dict(zip(names, test)), combination) if with_index else combination)
+    return result
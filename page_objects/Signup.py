@@ -4,16 +4,14 @@ Project_Name: ASC_Capstone
 
 Functions created in this module:
 - open_registration()
-- add_customer(first_name, last_name, email, password)
-- is_registration_successful(homepage_url="https://market99.com")
+- add_customer(first_name, last_name, email, password, fill_mode=None)
+- is_registration_successful(homepage_url=None)
 - is_registration_page_loaded(timeout=2)
 """
 
-import time
 from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
 from .base_page import BasePage
+from utils.site_config import get_base_url
 
 class AddCustomerPage(BasePage):
     FIRST_NAME_INPUT = (By.ID, "FirstName")
@@ -22,23 +20,28 @@ class AddCustomerPage(BasePage):
     PASSWORD_INPUT = (By.ID, "CreatePassword")
     # match by exact text and type
     SUBMIT_BUTTON = (By.XPATH, "//button[@type='submit' and normalize-space(text())='Create']")
+    READY_LOCATORS = (FIRST_NAME_INPUT, SUBMIT_BUTTON)
 
     def open_registration(self):
-        wait = WebDriverWait(self.driver, 10)
-        wait.until(EC.element_to_be_clickable((By.CSS_SELECTOR, "a[href='/account']"))).click()
-        wait.until(EC.element_to_be_clickable((By.ID, "loginWithEmailButton"))).click()
-        wait.until(EC.element_to_be_clickable((By.PARTIAL_LINK_TEXT, "Sign up"))).click()
-        time.sleep(3)  # Wait for the registration page to load
+        wait = self._make_wait(10)
+        wait.until(self.ec.element_to_be_clickable((By.CSS_SELECTOR, "a[href='/account']"))).click()
+        wait.until(self.ec.element_to_be_clickable((By.ID, "loginWithEmailButton"))).click()
+        wait.until(self.ec.element_to_be_clickable((By.PARTIAL_LINK_TEXT, "Sign up"))).click()
+        # Wait for the registration form to be usable
+        self.wait_until_ready()
 
-    def add_customer(self, first_name, last_name, email, password):
-        self.enter_text(self.FIRST_NAME_INPUT, first_name)
-        self.enter_text(self.LAST_NAME_INPUT, last_name)
-        self.enter_text(self.EMAIL_INPUT, email)
-        self.enter_text(self.PASSWORD_INPUT, password)
+    def add_customer(self, first_name, last_name, email, password, fill_mode=None):
+        self.fill_form({
+            self.FIRST_NAME_INPUT: first_name,
+            self.LAST_NAME_INPUT: last_name,
+            self.EMAIL_INPUT: email,
+            self.PASSWORD_INPUT: password,
+        }, mode=fill_mode)
         self.click(self.SUBMIT_BUTTON)
 
     # Helper: return True when current URL looks like the site homepage (registration succeeded)
-    def is_registration_successful(self, homepage_url="https://market99.com"):
+    def is_registration_successful(self, homepage_url=None):
+        homepage_url = homepage_url or get_base_url()
         try:
             return self.driver.current_url.strip("/") == homepage_url
         except Exception:
@@ -47,7 +50,7 @@ class AddCustomerPage(BasePage):
     # Helper: return True if the registration form is still present on the page (used for negative tests)
     def is_registration_page_loaded(self, timeout=2):
         try:
-            WebDriverWait(self.driver, timeout).until(EC.presence_of_element_located(self.FIRST_NAME_INPUT))
+            self._make_wait(timeout).until(self.ec.presence_of_element_located(self.FIRST_NAME_INPUT))
             return True
         except Exception:
             return False
@@ -3,12 +3,11 @@ Author_Name: Pratyush Jaishankar
 Project_Name: ASC_Capstone
 
 Functions created in this module:
-- __init__(driver)
-- new_address(first_name, last_name, company_field, province, address_line_1, address_line_2, city, postal_code, phone_number)
+- __init__(driver, element_cache=None)
+- new_address(first_name, last_name, company_field, province, address_line_1, address_line_2, city, postal_code, phone_number, fill_mode=None)
 - isSuccessfullyAdded(first_name)
 """
 
-from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.common.by import By
 from .base_page import BasePage
 import time
@@ -31,24 +30,27 @@ class AddressPage(BasePage):
     ADD_ADDRESS_CONFIRM = (By.XPATH, "//*[@id='address_form_new']/p[2]/button")
     RESULT_ADDRESS = (By.CSS_SELECTOR, "div.address p")
 
-    def __init__(self, driver):
-        super().__init__(driver)
-        self.wait = WebDriverWait(driver, 10)
+    def __init__(self, driver, element_cache=None):
+        super().__init__(driver, element_cache)
+        self.wait = self._make_wait(10)
 
-    def new_address(self, first_name, last_name, company_field, province,address_line_1, address_line_2, city, postal_code, phone_number):
+    def new_address(self, first_name, last_name, company_field, province,address_line_1, address_line_2, city, postal_code, phone_number, fill_mode=None):
 
         self.click(self.MY_ACCOUNT_ICON)
         self.click(self.VIEW_ADDRESS)
         self.click(self.ADD_ADDRESS)
-        self.enter_text(self.FIRST_NAME_INPUT, first_name)
-        self.enter_text(self.LAST_NAME_INPUT, last_name)
-        self.enter_text(self.COMPANY_FIELD, company_field)
-        self.enter_text(self.ADDRESS_LINE_1, address_line_1)
-        self.enter_text(self.ADDRESS_LINE_2, address_line_2)
-        self.enter_text(self.CITY, city)
-        self.enter_text(self.POSTAL_CODE, postal_code)
-        self.enter_text(self.PHONE_NUMBER, phone_number)
-        self.select_from_dropdown(self.PROVINCE, province)
+        # One wait for the whole form, then fill it (fill_mode: 'faithful' keystrokes or 'fast' script)
+        self.fill_form({
+            self.FIRST_NAME_INPUT: first_name,
+            self.LAST_NAME_INPUT: last_name,
+            self.COMPANY_FIELD: company_field,
+            self.ADDRESS_LINE_1: address_line_1,
+            self.ADDRESS_LINE_2: address_line_2,
+            self.CITY: city,
+            self.POSTAL_CODE: postal_code,
+            self.PHONE_NUMBER: phone_number,
+            self.PROVINCE: province,
+        }, mode=fill_mode)
         self.scroll_to_element(self.ADD_ADDRESS_CONFIRM)
         self.click(self.DEFAULT_ADDRESS_CHECKBOX)
         time.sleep(2)
@@ -58,26 +60,11 @@ class AddressPage(BasePage):
 
     def isSuccessfullyAdded(self, first_name):
         try:
-            # Scroll to the bottom of the page to ensure all addresses are loaded
-            self.driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-            time.sleep(1)
+            # Wait for address blocks and read the text of all of them in one round trip
+            # (innerText does not depend on the block being scrolled into view)
+            texts = self.get_texts(self.RESULT_ADDRESS, min_count=1)
 
-            # Scroll back to top to start from the beginning
-            self.driver.execute_script("window.scrollTo(0, 0);")
-            time.sleep(1)
-
-            # Wait for address blocks to be present
-            self.wait.until(lambda driver: len(driver.find_elements(By.CSS_SELECTOR, "div.address p")) > 0)
-
-            # Collect all <p> inside address divs
-            address_blocks = self.driver.find_elements(By.CSS_SELECTOR, "div.address p")
-
-            for block in address_blocks:
-                # Scroll each block into view before reading text
-                self.driver.execute_script("arguments[0].scrollIntoView({block: 'center', behavior: 'smooth'});", block)
-                time.sleep(0.3)
-
-                text = block.text.strip()
+            for text in texts:
                 if first_name.lower() in text.lower():
                     print(f"Found matching address for '{first_name}'")
                     return True
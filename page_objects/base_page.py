@@ -19,33 +19,131 @@ Functions created in this module:
 - execute_script(script, *args)
 - send_keys(keys, by_locator=None)
 - wait_for_page_load(timeout=30)
+- readiness_conditions()
+- wait_until_ready()
+- open(url)
+- wait_until_settled(by_locator)
+- wait_for_network_idle(quiet_ms=500)
+- query_all(by_locator, attributes=(), styles=(), child_selector=None, min_count=0)
+- get_texts(by_locator, child_selector=None, min_count=0)
+- get_attributes(by_locator, name)
+- get_css_values(by_locator, css_property)
+- fill_form(fields, mode=None)
+- invalidate_element_cache()
 """
 
-import time
 import os
 
+from selenium.common.exceptions import (ElementClickInterceptedException, ElementNotInteractableException,
+                                        StaleElementReferenceException, TimeoutException)
 from selenium.webdriver import ActionChains, Keys
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.support.ui import Select
 
+from utils import browser_waits
+from utils.dom_scripts import FIND_ALL_JS
+from utils.wait_conditions import element_settled, input_value_settled, network_idle, page_ready, requests_idle
+
+# Reads everything requested from every match, so a list of N elements costs one round trip.
+_QUERY_ALL_SCRIPT = FIND_ALL_JS + """
+var by = arguments[0], value = arguments[1], attrs = arguments[2], styles = arguments[3], child = arguments[4];
+return findAll(by, value).map(function (el) {
+  var source = child ? el.querySelector(child) : el;
+  var row = {element: el, text: source ? source.innerText.trim() : '', attributes: {}, styles: {}};
+  attrs.forEach(function (name) { row.attributes[name] = el.getAttribute(name); });
+  if (styles.length) {
+    var computed = window.getComputedStyle(el);
+    styles.forEach(function (name) { row.styles[name] = computed.getPropertyValue(name); });
+  }
+  return row;
+});
+"""
+
+# Returns the first visible match of every locator, or null while any of them is missing.
+_FIND_FIELDS_SCRIPT = FIND_ALL_JS + """
+var locators = arguments[0], found = [];
+for (var i = 0; i < locators.length; i++) {
+  var el = findAll(locators[i][0], locators[i][1]).filter(isShown)[0];
+  if (!el) { return null; }
+  found.push(el);
+}
+return found;
+"""
+
+# Sets values directly and fires the events a user's typing would, for every field at once.
+# Returns null (and changes nothing) while any field is missing.
+_FILL_FIELDS_SCRIPT = FIND_ALL_JS + """
+var fields = arguments[0], elements = [];
+for (var i = 0; i < fields.length; i++) {
+  var el = findAll(fields[i][0], fields[i][1]).filter(isShown)[0];
+  if (!el) { return null; }
+  elements.push(el);
+}
+elements.forEach(function (el, i) {
+  var text = fields[i][2];
+  if (el.tagName === 'SELECT') {
+    var option = Array.from(el.options).filter(function (o) { return o.text.trim() === text; })[0];
+    if (!option) { throw new Error('Option "' + text + '" not found in ' + fields[i][1]); }
+    el.value = option.value;
+  } else if (el.type === 'checkbox' || el.type === 'radio') {
+    el.checked = ['true', '1', 'yes', 'on'].indexOf(String(text).toLowerCase()) !== -1;
+  } else {
+    // Use the native setter so framework-controlled inputs notice the change
+    var proto = el.tagName === 'TEXTAREA' ? HTMLTextAreaElement.prototype : HTMLInputElement.prototype;
+    Object.getOwnPropertyDescriptor(proto, 'value').set.call(el, text);
+  }
+  el.dispatchEvent(new Event('input', {bubbles: true}));
+  el.dispatchEvent(new Event('change', {bubbles: true}));
+});
+return elements.length;
+"""
+
+# A cached element that raises one of these is looked up again from scratch
+_CACHE_MISS_ERRORS = (StaleElementReferenceException, ElementNotInteractableException, ElementClickInterceptedException)
+
+
+def is_element_cache_enabled():
+    """ELEMENT_CACHE=true lets page objects reuse elements they already located."""
+    return os.environ.get('ELEMENT_CACHE', 'false').lower() == 'true'
+
+
 class BasePage:
-    def __init__(self, driver):
+    # Readiness detector used with the eager/none page-load strategies:
+    # elements that must be present, and how long fetch/XHR and the DOM must stay quiet
+    READY_LOCATORS = ()
+    READY_QUIET_MS = 300
+
+    def __init__(self, driver, element_cache=None):
         self.driver = driver
+        # locator -> element found by an earlier interaction (None: cache off)
+        use_cache = is_element_cache_enabled() if element_cache is None else element_cache
+        self._element_cache = {} if use_cache else None
         # Increase wait time for CI environments
         wait_timeout = 30 if os.environ.get('CI', 'false').lower() == 'true' else 10
-        self.wait = WebDriverWait(driver, wait_timeout)
+        # BROWSER_WAITS=true evaluates element waits inside the page (one round trip)
+        # instead of polling every 0.5 s; other conditions keep polling as before
+        use_browser_waits = browser_waits.is_browser_waits_enabled()
+        self._wait_class = browser_waits.BrowserWait if use_browser_waits else WebDriverWait
+        self.ec = browser_waits if use_browser_waits else EC
+        self.wait = self._make_wait(wait_timeout)
+        # Short-poll wait for readiness conditions that usually pass within a frame or two
+        self.settle_wait = self._make_wait(wait_timeout, poll_frequency=0.05)
+
+    def _make_wait(self, timeout, poll_frequency=0.5):
+        """A wait of the kind this page uses (BrowserWait with BROWSER_WAITS=true); use with `self.ec` conditions."""
+        return self._wait_class(self.driver, timeout, poll_frequency=poll_frequency)
 
     def cart_dropdown(self, by_locator, option_locator):
-        dropdown_toggle = self.wait.until(EC.element_to_be_clickable(by_locator))
+        dropdown_toggle = self.wait.until(self.ec.element_to_be_clickable(by_locator))
         dropdown_toggle.click()
-        time.sleep(0.5)  # Small delay for dropdown animation
-        # 2️⃣ Select the quantity '6'
-        option = self.wait.until(EC.element_to_be_clickable(option_locator))
+        # 2️⃣ Select the quantity '6' once the dropdown animation has finished
+        self.wait.until(self.ec.element_to_be_clickable(option_locator))
+        option = self.settle_wait.until(element_settled(option_locator))
         option.click()
 
     def paste_text(self, by_locator):
-        elem = self.wait.until(EC.visibility_of_element_located(by_locator))
+        elem = self.wait.until(self.ec.visibility_of_element_located(by_locator))
         elem.clear()
         # In CI environment, clipboard operations don't work reliably
         try:
@@ -53,72 +151,99 @@ class BasePage:
         except:
             # Fallback: just clear the field
             pass
-        time.sleep(2)
+        self.settle_wait.until(input_value_settled(elem))
         try:
             elem.send_keys(Keys.ESCAPE)
         except:
             pass
-        time.sleep(2)
+        self.wait_for_network_idle()
+
+    def _with_element(self, by_locator, condition, action):
+        """
+        Run `action(element)` on the element at `by_locator`.
+
+        With the element cache on, an element located earlier is used directly
+        (one round trip). If it went stale (navigation, re-render) or cannot be
+        interacted with any more, it is dropped and looked up again with `condition`.
+        """
+        cache = self._element_cache
+        if cache is not None and by_locator in cache:
+            try:
+                return action(cache[by_locator])
+            except _CACHE_MISS_ERRORS:
+                del cache[by_locator]
+        element = self.wait.until(condition(by_locator))
+        result = action(element)
+        if cache is not None:
+            cache[by_locator] = element
+        return result
+
+    def invalidate_element_cache(self):
+        """Forget every cached element (e.g. after the page re-rendered without navigating)"""
+        if self._element_cache is not None:
+            self._element_cache.clear()
 
     def double_click(self, by_locator):
-        elem = self.wait.until(EC.visibility_of_element_located(by_locator))
-        action = ActionChains(self.driver)
-        action.double_click(elem).perform()
+        self._with_element(by_locator, self.ec.visibility_of_element_located,
+                           lambda elem: ActionChains(self.driver).double_click(elem).perform())
 
     def get_color(self, by_locator, css_property):
-        elem = self.wait.until(EC.visibility_of_element_located(by_locator))
-        return elem.value_of_css_property(css_property)
+        return self._with_element(by_locator, self.ec.visibility_of_element_located,
+                                  lambda elem: elem.value_of_css_property(css_property))
 
     def mouse_hover(self, by_locator):
-        elem = self.wait.until(EC.visibility_of_element_located(by_locator))
-        action = ActionChains(self.driver)
-        action.move_to_element(elem).perform()
+        self._with_element(by_locator, self.ec.visibility_of_element_located,
+                           lambda elem: ActionChains(self.driver).move_to_element(elem).perform())
 
     def click(self, by_locator):
-        element = self.wait.until(EC.element_to_be_clickable(by_locator))
-        # Scroll element into view before clicking (helps in CI)
-        if os.environ.get('CI', 'false').lower() == 'true':
-            self.driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", element)
-            time.sleep(0.3)
-        element.click()
+        def click_element(element):
+            # Scroll element into view before clicking (helps in CI)
+            if os.environ.get('CI', 'false').lower() == 'true':
+                self.driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", element)
+                self.settle_wait.until(element_settled(element))
+            element.click()
+
+        self._with_element(by_locator, self.ec.element_to_be_clickable, click_element)
 
     def enter_text(self, by_locator, text):
-        elem = self.wait.until(EC.visibility_of_element_located(by_locator))
+        self._with_element(by_locator, self.ec.visibility_of_element_located,
+                           lambda elem: self._type_into(elem, text))
+
+    def _type_into(self, elem, text):
         # Scroll into view in CI
         if os.environ.get('CI', 'false').lower() == 'true':
             self.driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", elem)
-            time.sleep(0.3)
+            self.settle_wait.until(element_settled(elem))
         elem.clear()
         elem.send_keys(text)
 
     def find_element(self, by_locator):
-        return self.wait.until(EC.presence_of_element_located(by_locator))
+        return self.wait.until(self.ec.presence_of_element_located(by_locator))
 
     def find_elements(self, by_locator):
-        return self.wait.until(EC.presence_of_all_elements_located(by_locator))
+        return self.wait.until(self.ec.presence_of_all_elements_located(by_locator))
 
 
     def select_from_dropdown(self, by_locator, text):
-        elem = self.wait.until(EC.visibility_of_element_located(by_locator))
-        select = Select(elem)
-        select.select_by_visible_text(text)
+        self._with_element(by_locator, self.ec.visibility_of_element_located,
+                           lambda elem: Select(elem).select_by_visible_text(text))
 
     def get_text(self, by_locator):
-        element = self.wait.until(EC.visibility_of_element_located(by_locator))
+        element = self.wait.until(self.ec.visibility_of_element_located(by_locator))
         # Scroll into view to ensure element is rendered in CI
         if os.environ.get('CI', 'false').lower() == 'true':
             self.driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", element)
-            time.sleep(0.2)
+            self.settle_wait.until(element_settled(element))
         return element.text
 
     def is_visible(self, by_locator):
-        return self.wait.until(EC.visibility_of_element_located(by_locator))
+        return self.wait.until(self.ec.visibility_of_element_located(by_locator))
 
     def scroll_to_element(self, by_locator):
         """Scroll to make an element visible in the viewport"""
-        element = self.wait.until(EC.presence_of_element_located(by_locator))
+        element = self.wait.until(self.ec.presence_of_element_located(by_locator))
         self.driver.execute_script("arguments[0].scrollIntoView({block: 'center', behavior: 'smooth'});", element)
-        time.sleep(0.5)  # Brief pause after scrolling
+        self.settle_wait.until(element_settled(element))  # smooth scroll finished
 
     # Added helper to execute JavaScript on the page
     def execute_script(self, script, *args):
@@ -127,13 +252,117 @@ class BasePage:
     # Added helper to send keys to the active element or to a specific locator
     def send_keys(self, keys, by_locator=None):
         if by_locator:
-            elem = self.wait.until(EC.visibility_of_element_located(by_locator))
-            elem.send_keys(keys)
+            self._with_element(by_locator, self.ec.visibility_of_element_located, lambda elem: elem.send_keys(keys))
         else:
             # send to the currently focused element
             self.driver.switch_to.active_element.send_keys(keys)
 
     # Add method to wait for page load
     def wait_for_page_load(self, timeout=30):
-        """Wait for page to be fully loaded"""
+        """Wait for page to be fully loaded (usable, under the eager/none page-load strategies)"""
+        if self._loads_eagerly():
+            self.wait_until_ready()
+            return
         self.wait.until(lambda driver: driver.execute_script('return document.readyState') == 'complete')
+
+    def _loads_eagerly(self):
+        try:
+            return self.driver.capabilities.get('pageLoadStrategy', 'normal') != 'normal'
+        except AttributeError:
+            return False
+
+    def readiness_conditions(self):
+        """Conditions that together mean the page is usable; override for custom detectors"""
+        return [page_ready(self.READY_LOCATORS, self.READY_QUIET_MS)]
+
+    def wait_until_ready(self):
+        """Wait until every readiness condition of this page object holds"""
+        self.settle_wait.until(self.ec.all_of(*self.readiness_conditions()))
+
+    def open(self, url):
+        """Navigate to `url` and wait until the page is loaded/usable"""
+        self.invalidate_element_cache()
+        try:
+            # Lets the readiness detector tell the old document from the new one
+            self.driver.execute_script('window.__leavingPage = true;')
+        except Exception:
+            pass
+        self.driver.get(url)
+        self.wait_for_page_load()
+
+    def wait_until_settled(self, by_locator):
+        """Wait until an element stops moving/animating and return it"""
+        self.wait.until(self.ec.presence_of_element_located(by_locator))
+        return self.settle_wait.until(element_settled(by_locator))
+
+    def wait_for_network_idle(self, quiet_ms=500):
+        """
+        Wait until no request has completed for `quiet_ms` milliseconds.
+
+        Best effort: trackers and chat widgets on the live site may never go quiet,
+        so returns False after the wait's timeout instead of failing the test.
+        """
+        # only fetch/XHR under eager/none: images and trackers may still be loading by design
+        condition = requests_idle(quiet_ms) if self._loads_eagerly() else network_idle(quiet_ms)
+        try:
+            return self.settle_wait.until(condition)
+        except TimeoutException:
+            return False
+
+    def query_all(self, by_locator, attributes=(), styles=(), child_selector=None, min_count=0):
+        """
+        Read every element matching `by_locator` in a single execute_script call.
+
+        Returns a list of dicts: {'element', 'text', 'attributes': {...}, 'styles': {...}}.
+        `text` is the trimmed innerText of the element, or of its first `child_selector`
+        (CSS) descendant when given. With `min_count` > 0, polls until that many match.
+        """
+        by, value = by_locator
+        args = (_QUERY_ALL_SCRIPT, by, value, list(attributes), list(styles), child_selector)
+        if min_count <= 0:
+            return self.driver.execute_script(*args)
+
+        def enough_rows(driver):
+            rows = driver.execute_script(*args)
+            return rows if len(rows) >= min_count else False
+
+        return self.wait.until(enough_rows)
+
+    def get_texts(self, by_locator, child_selector=None, min_count=0):
+        """Texts of all elements matching `by_locator` (one round trip)"""
+        return [row['text'] for row in self.query_all(by_locator, child_selector=child_selector, min_count=min_count)]
+
+    def get_attributes(self, by_locator, name):
+        """Attribute `name` of all elements matching `by_locator` (one round trip)"""
+        return [row['attributes'][name] for row in self.query_all(by_locator, attributes=(name,))]
+
+    def get_css_values(self, by_locator, css_property):
+        """Computed `css_property` of all elements matching `by_locator` (one round trip)"""
+        return [row['styles'][css_property] for row in self.query_all(by_locator, styles=(css_property,))]
+
+    def fill_form(self, fields, mode=None):
+        """
+        Fill several fields after a single wait for all of them.
+
+        `fields` maps locators to values ({(By.ID, "Email"): "a@b.c", ...}); <select>
+        fields are chosen by visible text. `mode` (default: FORM_FILL_MODE env, 'faithful'):
+        - 'faithful': real clear() + send_keys per field, as a user would type
+        - 'fast': one execute_script that sets every value and fires input/change events
+        """
+        mode = (mode or os.environ.get('FORM_FILL_MODE', 'faithful')).lower()
+        if mode not in ('fast', 'faithful'):
+            raise ValueError(f"Unsupported form fill mode: {mode}")
+        items = [(by, value, '' if text is None else str(text)) for (by, value), text in fields.items()]
+        if not items:
+            return
+        if mode == 'fast':
+            self.wait.until(lambda driver: driver.execute_script(_FILL_FIELDS_SCRIPT, items))
+            return
+        elements = self.wait.until(
+            lambda driver: driver.execute_script(_FIND_FIELDS_SCRIPT, [[by, value] for by, value, _ in items]))
+        for element, (_, _, text) in zip(elements, items):
+            if element.tag_name.lower() == 'select':
+                Select(element).select_by_visible_text(text)
+            else:
+                # same steps as enter_text, including the CI scroll-and-settle
+                self._type_into(element, text)
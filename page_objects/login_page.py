@@ -3,20 +3,23 @@ Author_Name: Pratyush Jaishankar
 Project_Name: ASC_Capstone
 
 Functions created in this module:
-- __init__(driver)
+- __init__(driver, element_cache=None)
 - mouse_hover_perform()
 - open_login()
-- login(email, password)
+- login(email, password, fill_mode=None)
 - logout()
+- has_active_session()
+- login_with_session_cache(login_data, cache=None)
 - is_logged_in(timeout=3)
 - is_login_page_loaded(timeout=3)
 """
 
 import time
 
-from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.common.by import By
 from .base_page import BasePage
+from utils.site_config import get_base_url
+from utils.session_cache import SessionCache, capture_session, is_session_cache_enabled, restore_session, session_key
 
 class LoginPage(BasePage):
     LOGIN_ICON = (By.CSS_SELECTOR, "a[href='/account']")
@@ -26,10 +29,11 @@ class LoginPage(BasePage):
     LOGOUT_LINK = (By.LINK_TEXT, "Log out")
     LOGIN_WITH_EMAIL_BUTTON = (By.ID, "loginWithEmailButton")
     LOGOUT_MYACCOUNT=(By.XPATH, "//*[@id='NavStandard']/div[5]/div[1]/a")
+    READY_LOCATORS = (LOGIN_ICON,)
 
-    def __init__(self, driver):
-        super().__init__(driver)
-        self.wait = WebDriverWait(driver, 10)
+    def __init__(self, driver, element_cache=None):
+        super().__init__(driver, element_cache)
+        self.wait = self._make_wait(10)
 
     def mouse_hover_perform(self):
         before_color=self.get_color(self.SUBMIT_BUTTON,"background-color")
@@ -45,21 +49,65 @@ class LoginPage(BasePage):
         self.click(self.LOGIN_ICON)
         self.click(self.LOGIN_WITH_EMAIL_BUTTON)
 
-    def login(self, email, password):
-        self.enter_text(self.EMAIL_INPUT, email)
-        self.enter_text(self.PASSWORD_INPUT, password)
+    def login(self, email, password, fill_mode=None):
+        self.fill_form({self.EMAIL_INPUT: email, self.PASSWORD_INPUT: password}, mode=fill_mode)
         self.click(self.SUBMIT_BUTTON)
 
     def logout(self):
         self.click(self.LOGOUT_MYACCOUNT)
         self.click(self.LOGOUT_LINK)
 
+    def has_active_session(self):
+        """Open the account page; a logged-out browser is redirected to /account/login."""
+        self.driver.get(get_base_url() + "/account")
+        return '/account/login' not in self.driver.current_url
+
+    def login_with_session_cache(self, login_data, cache=None):
+        """
+        Log in with the credentials row `login_data`, reusing a cached session when possible.
+
+        The UI login only runs when there is no cached session for the row or the
+        cached one is rejected by the site. Ends on the home page either way.
+        """
+        if not is_session_cache_enabled():
+            self.open_login()
+            self.login(login_data["email"], login_data["password"])
+            return
+
+        cache = cache or SessionCache()
+        home_url = get_base_url()
+        key = session_key(login_data, home_url)
+        if self._restore_cached_session(cache, key, home_url):
+            return
+
+        # One worker logs in per account; the others wait here and reuse its session
+        with cache.login_lock(key):
+            if self._restore_cached_session(cache, key, home_url):
+                return
+            self.open_login()
+            self.login(login_data["email"], login_data["password"])
+            if self.is_logged_in():
+                cache.put(key, capture_session(self.driver))
+
+    def _restore_cached_session(self, cache, key, home_url):
+        state = cache.get(key)
+        if not state:
+            return False
+        restore_session(self.driver, home_url, state)
+        if self.has_active_session():
+            self.driver.get(home_url + "/")
+            return True
+        cache.invalidate(key)
+        self.driver.delete_all_cookies()
+        self.driver.get(home_url + "/")
+        return False
+
     # Helper: return True when logout link is visible (user is logged in)
     def is_logged_in(self, timeout=3):
-        homepage_url = "https://market99.com"
+        homepage_url = get_base_url()
         try:
             # Wait until current_url becomes the homepage (strip trailing slashes)
-            WebDriverWait(self.driver, timeout).until(
+            self._make_wait(timeout).until(
                 lambda d: d.current_url.rstrip('/') == homepage_url.rstrip('/')
             )
             return True
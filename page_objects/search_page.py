@@ -15,8 +15,7 @@ Functions created in this module:
 from selenium.webdriver import Keys
 from selenium.webdriver.common.by import By
 from .base_page import BasePage
-import time
-import os
+from utils.wait_conditions import element_settled, page_ready, text_changed
 
 class SearchPage(BasePage):
     SEARCH_BUTTON =(By.XPATH, "//*[@id='NavStandard']/div[5]/search-popdown/details/summary")
@@ -30,71 +29,62 @@ class SearchPage(BasePage):
     RESULT_NAME = (By.XPATH, "//div[contains(@class, 'customer-name')]")
     ADD_TO_CART_BUTTON = (By.CSS_SELECTOR, "button[name='add']")
     VERIFY_CART_QUANTITY=(By.XPATH,"//*[@id='cart-drawer']/div[2]/h3/span")
+    # Header search is what every flow of this page starts from
+    READY_LOCATORS = (SEARCH_BUTTON,)
 
     def open_search(self):
-        # In CI, wait for page load before clicking
-        if os.environ.get('CI', 'false').lower() == 'true':
-            self.wait_for_page_load()
-            time.sleep(1)
+        self.wait_for_page_load()
         self.click(self.SEARCH_BUTTON)
-        if os.environ.get('CI', 'false').lower() == 'true':
-            time.sleep(0.5)
+        # Search popdown slides open; wait for the input to be in place
+        self.wait_until_settled(self.SEARCH_BOX)
 
     # Renamed from `search_product` to `search_customer` to match tests
     def search_product(self, query):
         self.enter_text(self.SEARCH_BOX, query)
-        if os.environ.get('CI', 'false').lower() == 'true':
-            time.sleep(0.5)
         # send RETURN to the specific search input element
         self.send_keys(Keys.RETURN, by_locator=self.SEARCH_BOX)
-        # In CI, wait for search results to load
-        if os.environ.get('CI', 'false').lower() == 'true':
-            time.sleep(2)
+        # Wait for the results page and its product list
+        self.wait_for_page_load()
+        self.wait.until(page_ready([self.PRODUCT_LOCATOR]))
 
     def get_result(self, query):
-        # In CI, wait for products to load and scroll into view
-        if os.environ.get('CI', 'false').lower() == 'true':
-            time.sleep(1)
-        products = self.find_elements(self.PRODUCT_LOCATOR)
-        for element in products:
-            if query in element.text.lower():
-                # In CI, scroll element into view before clicking
-                if os.environ.get('CI', 'false').lower() == 'true':
-                    self.driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", element)
-                    time.sleep(0.5)
+        # Titles of all products in one round trip
+        products = self.query_all(self.PRODUCT_LOCATOR, min_count=1)
+        for product in products:
+            element = product['element']
+            if query in product['text'].lower():
+                # Scroll element into view before clicking
+                self.driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", element)
+                self.settle_wait.until(element_settled(element))
                 element.click()
                 break
 
     def add_product_to_cart(self,quantity):
-        # In CI, wait for product page to load
-        if os.environ.get('CI', 'false').lower() == 'true':
-            self.wait_for_page_load()
-            time.sleep(1)
+        # Wait for product page to load; cart_dropdown waits for the quantity toggle itself
+        self.wait_for_page_load()
         quantity_locator = (By.XPATH, f"//a[@data-value='{quantity}']")
         self.cart_dropdown(self.QUANTITY_INPUT, quantity_locator)
-        if os.environ.get('CI', 'false').lower() == 'true':
-            time.sleep(0.5)
+        previous_count = self._cart_count()
         self.click(self.ADD_TO_CART_BUTTON)
-        # In CI, wait for cart to update
-        if os.environ.get('CI', 'false').lower() == 'true':
-            time.sleep(2)
+        # Wait for the cart drawer to show the new quantity
+        self.wait.until(text_changed(self.VERIFY_CART_QUANTITY, previous_count))
 
     def copy_code(self):
-        if os.environ.get('CI', 'false').lower() == 'true':
-            time.sleep(1)
         self.double_click(self.COUPON)
-        time.sleep(2)
+        self.wait_until_settled(self.COUPON_COPY_BUTTON)
         self.click(self.COUPON_COPY_BUTTON)
-        if os.environ.get('CI', 'false').lower() == 'true':
-            time.sleep(1)
 
     def paste_code(self):
         self.click(self.SEARCH_BUTTON)
-        time.sleep(2)
+        self.wait_until_settled(self.SEARCH_BOX)
         self.paste_text(self.SEARCH_BOX)
 
     def verify_cart(self):
-        if os.environ.get('CI', 'false').lower() == 'true':
-            time.sleep(1)
+        self.wait_until_settled(self.VERIFY_CART_QUANTITY)
         quantity = self.get_text(self.VERIFY_CART_QUANTITY)
         return quantity
+
+    def _cart_count(self):
+        """Current cart quantity text, or None while the cart drawer has not rendered it"""
+        elements = self.driver.find_elements(*self.VERIFY_CART_QUANTITY)
+        return elements[0].text if elements else None
@@ -0,0 +1,212 @@
+"""
+A fake WebDriver shared by the unit tests.
+
+Like selenium's WebDriver, every call goes through `execute(driver_command,
+params)`, so wrappers such as utils/command_metrics.py and utils/tab_runner.py
+see the same traffic they would with a real browser. Each command is recorded
+as `(command, window, params)` in `driver.commands`; `driver.sent(command)`
+returns the params of every call of one command.
+
+Tests describe the page instead of writing another fake:
+
+- `elements`: {(by, value): FakeElement} for find_element(s)
+- `scripts(script, args)`: answers execute_script/execute_async_script
+  (replies(...) answers successive calls from a list)
+- `cdp`: {cdp command: result} for execute_cdp_cmd
+- `logs`: {log type: [entries]} for get_log (each read empties the log)
+- `fail(command, params)`: an exception to raise for a command, or None
+- `clock`: a command with a `cost` param takes that many seconds on it
+
+A returned exception (from `scripts` or `fail`) is raised, as the browser would.
+"""
+import base64
+import itertools
+import threading
+
+from selenium.common.exceptions import NoSuchElementException, StaleElementReferenceException
+from selenium.webdriver.remote.command import Command
+from selenium.webdriver.remote.webelement import WebElement
+
+_ids = itertools.count(1)
+
+
+def replies(*values):
+    """A `scripts` responder that answers successive script calls with `values`, in order."""
+    queue = list(values)
+    return lambda script, args: queue.pop(0)
+
+
+class FakeElement(WebElement):
+    """A WebElement whose commands run through the fake driver; set `stale` to make them fail."""
+
+    def __init__(self, parent, name='', text='', tag_name='input', displayed=True, enabled=True):
+        super().__init__(parent, f"element-{next(_ids)}")
+        self.name = name
+        self._text = text
+        self._tag_name = tag_name
+        self.displayed = displayed
+        self.enabled = enabled
+        self.stale = False
+        parent.element_ids[self.id] = self
+
+    def _execute(self, command, **params):
+        self.parent.execute(command, dict(params, id=self.id))
+
+    @property
+    def text(self):
+        self._execute(Command.GET_ELEMENT_TEXT)
+        return self._text
+
+    @property
+    def tag_name(self):
+        self._execute(Command.GET_ELEMENT_TAG_NAME)
+        return self._tag_name
+
+    def is_displayed(self):
+        # selenium sends the isDisplayed atom as a script; a command of its own keeps it out of `scripts`
+        self._execute('isElementDisplayed')
+        return self.displayed
+
+    def is_enabled(self):
+        self._execute(Command.IS_ELEMENT_ENABLED)
+        return self.enabled
+
+    def click(self):
+        self._execute(Command.CLICK_ELEMENT)
+
+    def clear(self):
+        self._execute(Command.CLEAR_ELEMENT)
+
+    def send_keys(self, text):
+        self._execute(Command.SEND_KEYS_TO_ELEMENT, text=text)
+
+
+class _SwitchTo:
+    def __init__(self, driver):
+        self._driver = driver
+
+    def window(self, handle):
+        self._driver.execute(Command.SWITCH_TO_WINDOW, {'handle': handle})
+
+
+class FakeDriver:
+    def __init__(self, elements=None, scripts=None, cdp=None, logs=None, fail=None, clock=None):
+        self.elements = dict(elements or {})
+        self.scripts = scripts or (lambda script, args: None)
+        self.cdp = dict(cdp or {})
+        self.logs = {name: list(entries) for name, entries in (logs or {}).items()}
+        self.fail = fail or (lambda command, params: None)
+        self.clock = clock
+        self.page_title = ''
+        self.url = 'about:blank'
+        self.window_handles = ['main']
+        self.focus = 'main'
+        self.element_ids = {}
+        self.commands = []
+        self.switch_to = _SwitchTo(self)
+        self._lock = threading.RLock()
+
+    def add_element(self, locator, name='', **state):
+        """Put a new element on the page at `locator` (replacing any element there) and return it."""
+        element = FakeElement(self, name, **state)
+        self.elements[tuple(locator)] = element
+        return element
+
+    def sent(self, command):
+        """The params of every `command` sent so far, in order."""
+        return [params for sent, _, params in self.commands if sent == command]
+
+    def execute(self, driver_command, params=None):
+        params = dict(params or {})
+        with self._lock:
+            if self.clock is not None:
+                self.clock.now += params.pop('cost', 0.0)
+            self.commands.append((driver_command, self.focus, params))
+            value = self.fail(driver_command, params)
+            if value is None:
+                value = self._respond(driver_command, params)
+        if isinstance(value, Exception):
+            raise value
+        return {'value': value}
+
+    def _respond(self, command, params):
+        element = self.element_ids.get(params.get('id'))
+        if element is not None and element.stale:
+            return StaleElementReferenceException(f"{element.name or element.id} is no longer attached")
+        if command == Command.NEW_WINDOW:
+            handle = f"tab{len(self.window_handles)}"
+            self.window_handles.append(handle)
+            return {'handle': handle, 'type': 'tab'}
+        if command == Command.SWITCH_TO_WINDOW:
+            self.focus = params['handle']
+        elif command == Command.CLOSE:
+            self.window_handles.remove(self.focus)
+        elif command == Command.GET:
+            self.url = params['url']
+        elif command == Command.GET_CURRENT_URL:
+            return self.url
+        elif command == Command.GET_TITLE:
+            return self.page_title
+        elif command in (Command.W3C_EXECUTE_SCRIPT, Command.W3C_EXECUTE_SCRIPT_ASYNC):
+            return self.scripts(params['script'], params['args'])
+        elif command == Command.FIND_ELEMENT:
+            found = self.elements.get((params['using'], params['value']))
+            return found or NoSuchElementException(f"no element at {params['using']}={params['value']}")
+        elif command == Command.FIND_ELEMENTS:
+            found = self.elements.get((params['using'], params['value']))
+            return [found] if found else []
+        elif command == Command.SCREENSHOT:
+            return base64.b64encode(b'png of ' + self.focus.encode()).decode()
+        elif command == Command.GET_LOG:
+            return self.logs.pop(params['type'], [])
+        elif command == 'executeCdpCommand':
+            return self.cdp.get(params['cmd'])
+        return None
+
+    @property
+    def current_window_handle(self):
+        return self.focus
+
+    @property
+    def current_url(self):
+        return self.execute(Command.GET_CURRENT_URL)['value']
+
+    @property
+    def title(self):
+        return self.execute(Command.GET_TITLE)['value']
+
+    def get(self, url):
+        self.execute(Command.GET, {'url': url})
+
+    def close(self):
+        self.execute(Command.CLOSE)
+
+    def quit(self):
+        self.execute(Command.QUIT)
+
+    def delete_all_cookies(self):
+        self.execute(Command.DELETE_ALL_COOKIES)
+
+    def execute_script(self, script, *args):
+        return self.execute(Command.W3C_EXECUTE_SCRIPT, {'script': script, 'args': list(args)})['value']
+
+    def execute_async_script(self, script, *args):
+        return self.execute(Command.W3C_EXECUTE_SCRIPT_ASYNC, {'script': script, 'args': list(args)})['value']
+
+    def execute_cdp_cmd(self, cmd, cmd_args):
+        return self.execute('executeCdpCommand', {'cmd': cmd, 'params': cmd_args})['value']
+
+    def find_element(self, by, value):
+        return self.execute(Command.FIND_ELEMENT, {'using': by, 'value': value})['value']
+
+    def find_elements(self, by, value):
+        return self.execute(Command.FIND_ELEMENTS, {'using': by, 'value': value})['value']
+
+    def get_screenshot_as_base64(self):
+        return self.execute(Command.SCREENSHOT)['value']
+
+    def get_screenshot_as_png(self):
+        return base64.b64decode(self.get_screenshot_as_base64())
+
+    def get_log(self, log_type):
+        return self.execute(Command.GET_LOG, {'type': log_type})['value']
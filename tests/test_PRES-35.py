@@ -1,7 +1,6 @@
 import pytest
 from page_objects.add_address import AddressPage
 from page_objects.login_page import LoginPage
-from data.Complete_Test_Data.data_loader import get_data
 from utils.browser_config import get_browsers
 import allure
 import time
@@ -9,16 +8,23 @@ import time
 # Retrieve browser configurations for cross-browser testing
 browsers = get_browsers()
 
-@pytest.mark.parametrize("driver", browsers, indirect=True)
-@pytest.mark.parametrize("address_data", get_data("data/Complete_Test_Data/add_address.csv"))
-@pytest.mark.parametrize("login_data", get_data("data/Complete_Test_Data/login_data.csv"))
+# Every browser meets every address and every login at least once (pairwise), not the full product
+@pytest.mark.data_combinations(
+    driver=browsers,
+    address_data="data/Complete_Test_Data/add_address.csv",
+    login_data="data/Complete_Test_Data/login_data.csv",
+    indirect=["driver"],
+    shard=True,
+)
+@pytest.mark.tab_rows("address_data")
 @allure.feature("Add Address")
-def test_add_address(driver, address_data, login_data):
+def test_add_address(driver, base_url, address_data, login_data, leased_account):
     """
     Test to verify that a user can successfully add a new address after logging in.
     Steps:
     1. Start browser and navigate to https://market99.com/
-    2. Open Login form and login using credentials from login_data
+    2. Open Login form and login using credentials from login_data, or an account of its own from the
+       account pool with ACCOUNT_POOL=true (cached session is reused when valid)
     3. Navigate to Add Address page
     4. Verify required address fields are not empty
     5. Fill address form with address_data and submit
@@ -29,12 +35,11 @@ def test_add_address(driver, address_data, login_data):
     """
 
     # Step 1: Navigate to site
-    driver.get("https://market99.com/")
+    login_page = LoginPage(driver)
+    login_page.open(base_url + "/")
     
     # Step 2: Login
-    login_page = LoginPage(driver)
-    login_page.open_login()
-    login_page.login(login_data["email"], login_data["password"])
+    login_page.login_with_session_cache(leased_account or login_data)
     
     # Assertion: Verify page title after login
     assert "Market99" in driver.title, f"Unexpected page title after login: {driver.title}"
@@ -1,6 +1,7 @@
 import pytest
 from page_objects.Signup import AddCustomerPage
 from utils.browser_config import get_browsers
+from utils.account_pool import AccountPool, is_account_pool_enabled
 import allure
 import time
 from datetime import datetime
@@ -42,9 +43,9 @@ def generate_unique_email(prefix):
     return f"{prefix}.{timestamp}@example.com"
 
 @pytest.mark.parametrize("driver", browsers, indirect=True)
-@pytest.mark.parametrize("customer_data", customer_rows)
+@pytest.mark.tab_rows("customer_data", customer_rows)
 @allure.feature("Add Customer")
-def test_add_customer_registration(driver, customer_data):
+def test_add_customer_registration(driver, base_url, customer_data):
     """
     Test customer signup functionality on https://market99.com/.
     Steps:
@@ -55,8 +56,8 @@ def test_add_customer_registration(driver, customer_data):
     5. Wait for response.
     6. Assert registration success or failure as expected.
     """
-    driver.get("https://market99.com/")
     add_customer_page = AddCustomerPage(driver)
+    add_customer_page.open(base_url + "/")
     add_customer_page.open_registration()
 
     # Determine email to use based on expected result
@@ -84,9 +85,12 @@ def test_add_customer_registration(driver, customer_data):
             f"Expected registration to succeed for {customer_data} with email {email}, "
             f"but current_url={driver.current_url}"
         )
+        if is_account_pool_enabled():
+            # Registered accounts feed the pool the address tests lease from
+            AccountPool(base_url).add([{"email": email, "password": customer_data["password"]}])
     else:
         # Negative test: expect registration to fail (form still present or not redirected)
-        assert add_customer_page.is_registration_page_loaded() or driver.current_url.strip("/") != "https://market99.com", (
+        assert add_customer_page.is_registration_page_loaded() or driver.current_url.strip("/") != base_url, (
             f"Expected registration to fail for {customer_data} with email {email}, "
             f"but it appears to have succeeded (url={driver.current_url})"
         )
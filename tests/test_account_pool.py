@@ -0,0 +1,37 @@
+import pytest
+
+from utils.account_pool import AccountPool
+
+
+def make_pool(tmp_path, **kwargs):
+    kwargs.setdefault('wait_seconds', 0)
+    pool = AccountPool('https://shop.example', directory=str(tmp_path), poll=0.01, **kwargs)
+    pool.add([{'email': f'user{i}@example.com', 'password': 'pw'} for i in range(2)])
+    return pool
+
+
+def test_accounts_are_leased_exclusively_and_come_back_to_their_owner(tmp_path):
+    pool = make_pool(tmp_path)
+    first = pool.lease('gw0')
+    second = pool.lease('gw1')
+    assert first != second
+    with pytest.raises(TimeoutError):
+        pool.lease('gw2')
+
+    # only the holder can give a lease back
+    pool.release(first, owner='gw2')
+    with pytest.raises(TimeoutError):
+        pool.lease('gw2')
+    pool.release(first, owner='gw0')
+    pool.release(second, owner='gw1')
+    assert pool.lease('gw1') == second
+
+
+def test_expired_leases_are_reclaimed_and_empty_pools_fail_fast(tmp_path):
+    pool = make_pool(tmp_path, lease_seconds=-1)
+    pool.lease('crashed0')
+    pool.lease('crashed1')
+    assert pool.lease('gw0')['email'].startswith('user')
+
+    with pytest.raises(RuntimeError, match='account_provisioning'):
+        AccountPool('https://other.example', directory=str(tmp_path)).lease('gw0')
@@ -0,0 +1,57 @@
+import pytest
+from selenium.common.exceptions import InvalidSessionIdException, JavascriptException, TimeoutException
+from selenium.webdriver.common.by import By
+from selenium.webdriver.remote.command import Command
+from selenium.webdriver.support import expected_conditions as EC
+
+from tests.fakes import FakeDriver, replies
+from utils import browser_waits
+from utils.browser_waits import BrowserWait
+
+EMAIL = (By.ID, "Email")
+
+
+def waits(driver):
+    """The (condition args, timeout ms) of every in-browser wait call."""
+    return [tuple(params['args']) for params in driver.sent(Command.W3C_EXECUTE_SCRIPT_ASYNC)]
+
+
+def test_wait_returns_what_the_page_reports_in_one_round_trip():
+    driver = FakeDriver(scripts=replies('element'))
+    assert BrowserWait(driver, 10).until(browser_waits.element_to_be_clickable(EMAIL)) == 'element'
+    assert waits(driver) == [(['id', 'Email'], 5000)]
+
+
+def test_wait_retries_after_navigation_and_times_out():
+    driver = FakeDriver(scripts=replies(JavascriptException('document unloaded'), None, 'element'))
+    assert BrowserWait(driver, 10).until(browser_waits.visibility_of_element_located(EMAIL)) == 'element'
+    with pytest.raises(TimeoutException):
+        BrowserWait(FakeDriver(scripts=replies(*[JavascriptException('unloaded')] * 100)), 0.01).until(browser_waits.presence_of_element_located(EMAIL))
+
+
+def test_other_conditions_are_forwarded_and_polled_like_webdriverwait():
+    driver = FakeDriver()
+    driver.page_title = 'Market99'
+    assert browser_waits.title_is is EC.title_is
+    assert BrowserWait(driver, 1).until(browser_waits.title_is('Market99')) is True
+    with pytest.raises(TimeoutException):
+        BrowserWait(driver, 0.01, poll_frequency=0.005).until(browser_waits.title_is('Login'))
+
+
+def test_dead_session_is_not_retried_until_the_timeout():
+    driver = FakeDriver(scripts=replies(InvalidSessionIdException('session deleted')))
+    with pytest.raises(InvalidSessionIdException):
+        BrowserWait(driver, 10).until(browser_waits.presence_of_element_located(EMAIL))
+    assert len(waits(driver)) == 1
+
+
+def test_page_objects_build_their_waits_with_browser_waits(monkeypatch):
+    from page_objects.add_address import AddressPage
+    from page_objects.login_page import LoginPage
+    from page_objects.Signup import AddCustomerPage
+
+    monkeypatch.setenv('BROWSER_WAITS', 'true')
+    for page_class in (LoginPage, AddressPage, AddCustomerPage):
+        page = page_class(FakeDriver())
+        assert type(page.wait) is BrowserWait and page.ec is browser_waits
+        assert type(page._make_wait(3)) is BrowserWait
@@ -0,0 +1,76 @@
+from tests.fakes import FakeDriver
+from utils import command_metrics, wait_budget
+from utils.command_metrics import _percentile, get_recorder, instrument_driver, merge_summaries
+
+
+class Clock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+def instrumented(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(command_metrics.time, 'perf_counter', clock)
+    # each command takes params['cost'] seconds on the fake clock
+    driver = FakeDriver(clock=clock)
+    driver.add_element(('id', 'Email'))
+    driver.add_element(('css selector', '.cart'))
+    instrument_driver(driver)
+    return driver, clock
+
+
+def test_commands_are_counted_timed_and_split_by_waits(monkeypatch):
+    driver, clock = instrumented(monkeypatch)
+    assert instrument_driver(driver) is driver  # idempotent: no double wrapping
+
+    driver.execute('findElement', {'using': 'id', 'value': 'Email', 'cost': 0.0008})
+    driver.execute('findElement', {'using': 'css selector', 'value': '.cart', 'cost': 0.004})
+    with wait_budget.timed_wait(driver):
+        driver.execute('executeScript', {'cost': 0.090})
+        clock.now += 0.4  # polling sleep between round trips
+        driver.execute('executeScript', {'cost': 0.009})
+
+    summary = get_recorder(driver).summary()
+    assert summary['round_trips'] == 4
+    assert summary['by_command'] == {'findElement': {'count': 2, 'total_ms': 4.8},
+                                     'executeScript': {'count': 2, 'total_ms': 99.0}}
+    assert summary['command_seconds'] == 0.104
+    assert (summary['p50_ms'], summary['p95_ms'], summary['max_ms']) == (4.0, 90.0, 90.0)
+    assert summary['round_trips_in_waits'] == 2
+    assert (summary['wait_count'], summary['wait_seconds']) == (1, 0.499)
+    assert summary['slowest'][0] == {'command': 'executeScript', 'locator': '', 'ms': 90.0}
+    assert {'command': 'findElement', 'locator': 'id=Email', 'ms': 0.8} in summary['slowest']
+    # <= 1 ms, <= 5 ms, <= 10 ms and <= 100 ms buckets
+    assert summary['histogram'][:8] == [1, 0, 1, 1, 0, 0, 1, 0]
+
+    get_recorder(driver).reset()
+    assert get_recorder(driver).summary()['round_trips'] == 0
+
+
+def test_percentile_uses_nearest_rank():
+    values = [1.0, 2.0, 3.0, 4.0, 5.0, 6.0, 7.0, 8.0, 9.0, 10.0]
+    assert _percentile(values, 50) == 5.0
+    assert _percentile(values, 95) == 10.0
+    assert _percentile([7.0], 95) == 7.0
+    assert _percentile([], 50) == 0.0
+
+
+def test_summaries_from_several_workers_are_merged(monkeypatch):
+    summaries = {}
+    for nodeid, costs in (('test_a', [0.0008] * 9), ('test_b', [0.0008, 0.300])):
+        driver, _ = instrumented(monkeypatch)
+        for cost in costs:
+            driver.execute('click', {'cost': cost})
+        summaries[nodeid] = get_recorder(driver).summary()
+
+    merged = merge_summaries(summaries)
+    assert (merged['tests'], merged['round_trips']) == (2, 11)
+    assert merged['by_command'] == {'click': {'count': 11, 'total_ms': 308.0}}
+    assert merged['command_seconds'] == 0.308
+    # percentiles come from the merged histogram: upper bounds of the buckets
+    assert (merged['p50_ms_bucket'], merged['p95_ms_bucket']) == (1, 500)
+    assert sum(merged['histogram']) == 11
+    assert merged['per_test'] is summaries
@@ -0,0 +1,96 @@
+import os
+
+from openpyxl import Workbook
+
+from data.Complete_Test_Data import data_loader
+from data.Complete_Test_Data.data_loader import get_data
+
+
+def write_xlsx(path, rows):
+    wb = Workbook()
+    for row in rows:
+        wb.active.append(row)
+    wb.save(path)
+
+
+def test_excel_rows_are_strings_without_pandas(tmp_path):
+    path = tmp_path / 'data.xlsx'
+    write_xlsx(path, [['city', 'postal_code', 'note'], ['Bangalore', 560001, None], [None, None, None], ['Mumbai', 400053.0, 'x']])
+    assert get_data(str(path)) == [
+        {'city': 'Bangalore', 'postal_code': '560001', 'note': ''},
+        {'city': 'Mumbai', 'postal_code': '400053', 'note': 'x'},
+    ]
+
+
+def test_cache_is_invalidated_when_file_changes(tmp_path):
+    path = tmp_path / 'data.csv'
+    path.write_text('product\nbottle\n')
+    assert get_data(str(path)) == [{'product': 'bottle'}]
+    # returned rows are copies
+    get_data(str(path))[0]['product'] = 'changed'
+    assert get_data(str(path)) == [{'product': 'bottle'}]
+
+    path.write_text('product\nbottle\nsoap\n')
+    os.utime(path, ns=(0, os.stat(path).st_mtime_ns + 10**9))
+    assert get_data(str(path)) == [{'product': 'bottle'}, {'product': 'soap'}]
+
+
+def test_disk_cache_is_used(tmp_path, monkeypatch):
+    monkeypatch.setenv('DATA_CACHE_DIR', str(tmp_path / 'cache'))
+    path = tmp_path / 'data.xlsx'
+    write_xlsx(path, [['product'], ['bottle']])
+    assert get_data(str(path)) == [{'product': 'bottle'}]
+    assert len(os.listdir(tmp_path / 'cache')) == 1
+
+    data_loader.clear_cache()
+    monkeypatch.setattr(data_loader, '_read_excel', lambda p: [{'product': 'not from disk cache'}])
+    assert get_data(str(path)) == [{'product': 'bottle'}]
+
+
+def test_iter_data_projection_filter_slice_and_shard(tmp_path):
+    from data.Complete_Test_Data.data_loader import iter_data, parse_shard
+
+    path = tmp_path / 'rows.csv'
+    path.write_text('id,name,result\n' + ''.join(f'{i},n{i},{"failed" if i % 3 == 0 else "success"}\n' for i in range(10)))
+
+    assert next(iter_data(str(path), columns=['name'])) == {'name': 'n0'}
+    assert [r['id'] for r in iter_data(str(path), where={'result': 'failed'})] == ['0', '3', '6', '9']
+    assert [r['id'] for r in iter_data(str(path), start=2, stop=5)] == ['2', '3', '4']
+    assert [n for n, _ in iter_data(str(path), shard=parse_shard('1/4'), with_index=True)] == [1, 5, 9]
+
+
+def test_combine_covers_every_pair_with_fewer_tests(tmp_path):
+    from itertools import combinations
+    from data.Complete_Test_Data.data_loader import combine
+
+    path = tmp_path / 'addresses.csv'
+    path.write_text('city\n' + ''.join(f'c{i}\n' for i in range(6)))
+    sources = {'browser': ['chrome', 'edge', 'firefox'], 'address': str(path), 'login': range(4), 'coupon': range(3)}
+
+    combos = combine(sources)
+    assert len(combos) < 3 * 6 * 4 * 3
+    values = {'browser': ['chrome', 'edge', 'firefox'], 'address': [{'city': f'c{i}'} for i in range(6)],
+              'login': list(range(4)), 'coupon': list(range(3))}
+    for a, b in combinations(sources, 2):
+        seen = {(repr(c[a]), repr(c[b])) for c in combos}
+        assert seen == {(repr(x), repr(y)) for x in values[a] for y in values[b]}
+
+    assert combine(sources) == combos
+    assert len(combine(sources, strength=4)) == 3 * 6 * 4 * 3
+    index, first = combine(sources, with_index=True)[0]
+    assert first['address'] == {'city': f"c{index['address']}"}
+
+
+def test_pairwise_cover_is_optimal_for_an_orthogonal_array_shape():
+    import time
+    from itertools import combinations
+    from data.Complete_Test_Data.data_loader import _covering_tests
+
+    assert len(_covering_tests((5, 5, 5, 5), 2, 0)) == 25
+    start = time.perf_counter()
+    tests = _covering_tests((50, 40, 3), 2, 0)
+    assert time.perf_counter() - start < 1  # runs at collection time
+    assert len(tests) == 50 * 40
+    for i, j in combinations(range(3), 2):
+        assert len({(t[i], t[j]) for t in tests}) == (50, 40, 3)[i] * (50, 40, 3)[j]
+    assert _covering_tests((50, 40, 3), 2, 0) is tests  # cached per size tuple
@@ -0,0 +1,81 @@
+from selenium.webdriver.remote.command import Command
+
+from tests.fakes import FakeDriver
+from utils.driver_pool import DriverPool
+
+
+def make_pool(max_uses=2):
+    launched = []
+
+    def factory(browser, remote_url, caps):
+        driver = FakeDriver()
+        launched.append(driver)
+        return driver
+
+    return DriverPool(max_uses=max_uses, factory=factory), launched
+
+
+def test_driver_is_reused_and_reset():
+    pool, launched = make_pool()
+    first = pool.acquire('chrome')
+    pool.release(first)
+    assert first.sent(Command.GET)[-1] == {'url': 'about:blank'}
+    assert pool.acquire('chrome') is first
+    assert len(launched) == 1
+
+
+def test_driver_recycled_after_max_uses_and_failure():
+    pool, launched = make_pool(max_uses=2)
+    d = pool.acquire('chrome')
+    pool.release(d)
+    d = pool.acquire('chrome')
+    pool.release(d)
+    assert d.sent(Command.QUIT) and pool.idle_count() == 0
+
+    d = pool.acquire('chrome')
+    pool.release(d, discard=True)
+    assert d.sent(Command.QUIT)
+    assert len(launched) == 2
+
+
+def test_pool_is_keyed_by_browser():
+    pool, launched = make_pool()
+    chrome = pool.acquire('chrome')
+    pool.release(chrome)
+    edge = pool.acquire('edge')
+    assert edge is not chrome
+    pool.close()
+    assert chrome.sent(Command.QUIT)
+
+
+def test_prewarmed_driver_is_handed_to_first_test():
+    import threading
+    release = threading.Event()
+    launched = []
+
+    def slow_factory(browser, remote_url, caps):
+        release.wait(5)
+        driver = FakeDriver()
+        launched.append(driver)
+        return driver
+
+    pool = DriverPool(factory=slow_factory)
+    pool.prewarm(['chrome'])
+    threading.Timer(0.05, release.set).start()
+    # waits for the in-flight launch instead of starting a second browser
+    assert pool.acquire('chrome') is launched[0]
+    assert len(launched) == 1
+
+
+def test_pool_is_keyed_by_capability_overrides():
+    pool, launched = make_pool()
+    plain = pool.acquire('chrome')
+    pool.release(plain)
+    traced = pool.acquire('chrome', capabilities_overrides={'goog:loggingPrefs': {'performance': 'ALL'}})
+    assert traced is not plain
+    pool.release(traced)
+    # the same overrides reuse the same browser
+    again = pool.acquire('chrome', capabilities_overrides={'goog:loggingPrefs': {'performance': 'ALL'}})
+    assert again is traced
+    assert pool.acquire('chrome') is plain
+    assert len(launched) == 2
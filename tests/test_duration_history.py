@@ -0,0 +1,30 @@
+from utils.duration_history import (estimate, is_duration_recording_enabled, load_history, longest_first,
+                                     update_history)
+
+
+def test_unknown_tests_are_estimated_from_their_file_then_the_median():
+    history = {'tests/a.py::t1': 10.0, 'tests/a.py::t2': 20.0, 'tests/b.py::t1': 1.0}
+    assert estimate(['tests/a.py::t1', 'tests/a.py::new', 'tests/c.py::new'], history) == [10.0, 15.0, 10.0]
+
+
+def test_longest_first_keeps_collection_order_for_ties():
+    history = {'t::slow': 30.0, 't::fast': 1.0}
+    nodeids = ['t::fast', 'x::unknown1', 't::slow', 'x::unknown2']
+    # unknown tests get the median (15.5)
+    assert longest_first(nodeids, history) == [2, 1, 3, 0]
+
+
+def test_history_is_smoothed_across_runs(tmp_path):
+    path = str(tmp_path / 'durations.json')
+    update_history({'t::a': 10.0}, path)
+    update_history({'t::a': 20.0, 't::b': 2.0}, path)
+    assert load_history(path) == {'t::a': 15.0, 't::b': 2.0}
+
+
+def test_history_is_only_recorded_for_parallel_runs(monkeypatch):
+    monkeypatch.delenv('RECORD_DURATIONS', raising=False)
+    assert not is_duration_recording_enabled(None)
+    assert not is_duration_recording_enabled(0)
+    assert is_duration_recording_enabled(4)
+    monkeypatch.setenv('RECORD_DURATIONS', 'true')
+    assert is_duration_recording_enabled(None)
@@ -0,0 +1,67 @@
+import os
+
+from selenium.webdriver.remote.command import Command
+
+from tests.fakes import FakeDriver
+from utils import edge_profiles
+
+
+def test_template_is_built_once_and_copied_without_lock_files(tmp_path):
+    builds = []
+
+    def initialise(path):
+        builds.append(path)
+        with open(os.path.join(path, 'Local State'), 'w') as f:
+            f.write('{}')
+        with open(os.path.join(path, 'SingletonLock'), 'w') as f:
+            f.write('')
+
+    template = str(tmp_path / 'template')
+    assert edge_profiles.ensure_template(initialise, template) == template
+    assert edge_profiles.ensure_template(initialise, template) == template
+    assert len(builds) == 1
+
+    profile = edge_profiles.new_profile(template)
+    try:
+        assert sorted(os.listdir(profile)) == ['Local State']
+    finally:
+        edge_profiles.remove_profile(profile)
+
+
+def test_profile_is_removed_when_driver_quits():
+    profile = edge_profiles.new_profile()
+    driver = edge_profiles.remove_profile_on_quit(FakeDriver(), profile)
+    driver.quit()
+    assert len(driver.sent(Command.QUIT)) == 1
+    assert not os.path.exists(profile)
+
+
+def test_debug_port_is_read_from_the_profile(tmp_path):
+    assert edge_profiles.debug_port(str(tmp_path)) is None
+    (tmp_path / 'DevToolsActivePort').write_text('53117\n/devtools/browser/3f2c\n')
+    assert edge_profiles.debug_port(str(tmp_path)) == 53117
+
+
+def test_failed_template_build_is_not_retried_in_the_same_run(tmp_path, monkeypatch):
+    attempts = []
+
+    def initialise(path):
+        attempts.append(path)
+        raise RuntimeError('msedge failed to start')
+
+    monkeypatch.setenv('PYTEST_XDIST_TESTRUNUID', 'run-1')
+    template = str(tmp_path / 'template')
+    assert edge_profiles.ensure_template(initialise, template) is None
+    assert edge_profiles.ensure_template(initialise, template) is None
+    assert len(attempts) == 1
+
+    # another xdist worker of the same run sees the failure marker
+    monkeypatch.setattr(edge_profiles, '_failed_templates', set())
+    assert edge_profiles.ensure_template(initialise, template) is None
+    assert len(attempts) == 1
+
+    # the next run tries again
+    monkeypatch.setattr(edge_profiles, '_failed_templates', set())
+    monkeypatch.setenv('PYTEST_XDIST_TESTRUNUID', 'run-2')
+    assert edge_profiles.ensure_template(initialise, template) is None
+    assert len(attempts) == 2
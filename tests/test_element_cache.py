@@ -0,0 +1,43 @@
+from selenium.webdriver.common.by import By
+from selenium.webdriver.remote.command import Command
+
+from page_objects.base_page import BasePage
+from tests.fakes import FakeDriver
+
+CHECKBOX = (By.NAME, "address[default]")
+
+
+def make_driver():
+    driver = FakeDriver()
+    driver.add_element(CHECKBOX, 'checkbox')
+    return driver
+
+
+def test_repeated_click_reuses_the_element():
+    driver = make_driver()
+    page = BasePage(driver, element_cache=True)
+    page.click(CHECKBOX)
+    first = len(driver.commands)
+    page.click(CHECKBOX)
+    assert len(driver.sent(Command.CLICK_ELEMENT)) == 2 and len(driver.sent(Command.FIND_ELEMENT)) == 1
+    assert len(driver.commands) - first == 1
+
+
+def test_stale_element_is_looked_up_again():
+    driver = make_driver()
+    page = BasePage(driver, element_cache=True)
+    page.click(CHECKBOX)
+    # the page re-rendered the checkbox
+    driver.elements[CHECKBOX].stale = True
+    fresh = driver.add_element(CHECKBOX, 'checkbox')
+    page.click(CHECKBOX)
+    assert [p['id'] for p in driver.sent(Command.CLICK_ELEMENT)][-1] == fresh.id
+    assert len(driver.sent(Command.FIND_ELEMENT)) == 2
+
+
+def test_cache_is_off_by_default():
+    driver = make_driver()
+    page = BasePage(driver)
+    page.click(CHECKBOX)
+    page.click(CHECKBOX)
+    assert len(driver.sent(Command.FIND_ELEMENT)) == 2
@@ -0,0 +1,49 @@
+import gzip
+import json
+
+from tests.fakes import FakeDriver
+from utils.failure_artifacts import FailureArtifacts
+
+
+def failed_page():
+    """The same cart page, with a console error, every time."""
+    return FakeDriver(scripts=lambda script, args: ['http://shop.test/cart', '<html><body>' + 'x' * 5000 + '</body></html>'],
+                      logs={'browser': [{'level': 'SEVERE', 'message': 'cart.js 500'}]})
+
+def _names(attachments):
+    return [name for name, _, _ in attachments]
+
+
+def test_identical_screenshots_are_attached_once():
+    artifacts = FailureArtifacts(budget_bytes=10 ** 6)
+    first = artifacts.capture(failed_page(), 'test_a').result()
+    second = artifacts.capture(failed_page(), 'test_b').result()
+    artifacts.shutdown()
+    assert _names(first) == ['failure context', 'screenshot', 'dom.html.gz', 'browser console']
+    assert 'screenshot' not in _names(second)
+    context = json.loads(second[0][1])
+    assert context['screenshot'] == 'identical to the screenshot of test_a'
+    assert context['url'] == 'http://shop.test/cart'
+    dom = dict((name, body) for name, body, _ in first)['dom.html.gz']
+    assert gzip.decompress(dom).startswith(b'<html>')
+
+
+def test_budget_keeps_only_small_context():
+    artifacts = FailureArtifacts(budget_bytes=10)
+    attachments = artifacts.capture(failed_page(), 'test_a').result()
+    artifacts.shutdown()
+    assert _names(attachments) == ['failure context', 'browser console']
+    context = json.loads(attachments[0][1])
+    assert context['dom'] == context['screenshot'] == 'skipped: artifact budget exhausted'
+
+
+def test_screenshot_dropped_by_the_budget_is_not_referenced_later():
+    artifacts = FailureArtifacts(budget_bytes=10)
+    dropped = artifacts.capture(failed_page(), 'test_a').result()
+    artifacts.budget_bytes = 10 ** 6
+    second = artifacts.capture(failed_page(), 'test_b').result()
+    third = artifacts.capture(failed_page(), 'test_c').result()
+    artifacts.shutdown()
+    assert 'screenshot' not in _names(dropped)
+    assert 'screenshot' in _names(second)
+    assert json.loads(third[0][1])['screenshot'] == 'identical to the screenshot of test_b'
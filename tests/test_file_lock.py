@@ -0,0 +1,100 @@
+import os
+import socket
+import subprocess
+import sys
+import threading
+import time
+
+import pytest
+
+from utils import file_lock as file_lock_module
+from utils.file_lock import file_lock
+
+
+def test_second_holder_waits_and_times_out(tmp_path):
+    path = str(tmp_path / 'store.json')
+    taken, release = threading.Event(), threading.Event()
+
+    def hold():
+        with file_lock(path):
+            taken.set()
+            release.wait(5)
+
+    holder = threading.Thread(target=hold)
+    holder.start()
+    taken.wait(5)
+    with pytest.raises(TimeoutError):
+        with file_lock(path, timeout=0.1):
+            pass
+    release.set()
+    holder.join()
+    with file_lock(path, timeout=1):
+        assert os.path.exists(path + '.lock')
+    assert not os.path.exists(path + '.lock')
+
+
+def test_long_holder_keeps_its_lock_until_it_is_stale(tmp_path):
+    path = str(tmp_path / 'store.json')
+    lock = path + '.lock'
+    with open(lock, 'w') as f:
+        f.write(f"{socket.gethostname()}:{os.getpid()}")
+    # older than the waiter's timeout, but the owner is alive: not taken over
+    past = time.time() - 60
+    os.utime(lock, (past, past))
+    with pytest.raises(TimeoutError):
+        with file_lock(path, timeout=0.1):
+            pass
+    with file_lock(path, timeout=0.1, stale_after=30):
+        pass
+
+
+@pytest.mark.skipif(os.name == 'nt', reason="owner check is POSIX only")
+def test_lock_of_a_dead_process_is_taken_over(tmp_path):
+    path = str(tmp_path / 'store.json')
+    dead = subprocess.Popen([sys.executable, '-c', 'pass'])
+    dead.wait()
+    with open(path + '.lock', 'w') as f:
+        f.write(f"{socket.gethostname()}:{dead.pid}")
+    with file_lock(path, timeout=0.5):
+        pass
+
+
+def test_only_one_of_two_waiters_takes_over_a_stale_lock(tmp_path, monkeypatch):
+    path = str(tmp_path / 'store.json')
+    lock = path + '.lock'
+    checks = threading.local()
+    both_checked = threading.Barrier(2)
+
+    def owner_is_gone(lock_path):
+        with open(lock_path) as f:
+            gone = f.read() == 'crashed:1'
+        if not getattr(checks, 'done', False):
+            # both waiters find the crashed owner's lock at the same moment;
+            # the second acts on it only after the first has taken the lock
+            checks.done = True
+            if both_checked.wait(5) == 0:
+                time.sleep(0.05)
+        return gone
+
+    monkeypatch.setattr(file_lock_module, '_owner_is_gone', owner_is_gone)
+    inside, overlaps = [], []
+
+    def contend():
+        with file_lock(path, timeout=5):
+            inside.append(1)
+            if len(inside) > 1:
+                overlaps.append(1)
+            time.sleep(0.1)
+            inside.pop()
+
+    for _ in range(5):
+        with open(lock, 'w') as f:
+            f.write('crashed:1')
+        both_checked.reset()
+        threads = [threading.Thread(target=contend) for _ in range(2)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        assert overlaps == []
+        assert not os.path.exists(lock) and not os.path.exists(lock + '.break')
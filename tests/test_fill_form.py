@@ -0,0 +1,66 @@
+from selenium.webdriver.common.by import By
+from selenium.webdriver.remote.command import Command
+
+from page_objects.base_page import BasePage
+from tests.fakes import FakeDriver
+
+EMAIL = (By.ID, "Email")
+PASSWORD = (By.ID, "Password")
+
+
+def form_scripts(driver):
+    def respond(script, args):
+        if 'scrollIntoView' in script:
+            return None
+        if 'requestAnimationFrame' in script:
+            return True  # element_settled: the field is not moving
+        # _FIND_FIELDS_SCRIPT: every locator's element, in order
+        return [driver.elements[tuple(locator)] for locator in args[0]]
+    return respond
+
+
+def steps(driver):
+    """What happened to the fields, in order: scrolls, settle waits and typing."""
+    names = {element.id: element.name for element in driver.elements.values()}
+    log = []
+    for command, _, params in driver.commands:
+        if command == Command.W3C_EXECUTE_SCRIPT and 'scrollIntoView' in params['script']:
+            log.append(('scroll', params['args'][0].name))
+        elif command == Command.W3C_EXECUTE_SCRIPT_ASYNC:
+            log.append(('settle',))
+        elif command == Command.CLEAR_ELEMENT:
+            log.append(('clear', names[params['id']]))
+        elif command == Command.SEND_KEYS_TO_ELEMENT:
+            log.append(('send_keys', names[params['id']], params['text']))
+    return log
+
+
+def make_page(monkeypatch, ci):
+    monkeypatch.delenv('BROWSER_WAITS', raising=False)
+    monkeypatch.setenv('CI', 'true' if ci else 'false')
+    driver = FakeDriver()
+    driver.scripts = form_scripts(driver)
+    driver.add_element(EMAIL, 'Email')
+    driver.add_element(PASSWORD, 'Password')
+    return BasePage(driver, element_cache=False), driver
+
+
+def test_faithful_fill_types_like_enter_text_in_ci(monkeypatch):
+    page, driver = make_page(monkeypatch, ci=True)
+    page.enter_text(EMAIL, 'a@b.c')
+    page.enter_text(PASSWORD, 'secret')
+    per_field = steps(driver)
+
+    page, driver = make_page(monkeypatch, ci=True)
+    page.fill_form({EMAIL: 'a@b.c', PASSWORD: 'secret'}, mode='faithful')
+
+    assert steps(driver) == per_field
+    assert per_field[:4] == [('scroll', 'Email'), ('settle',), ('clear', 'Email'), ('send_keys', 'Email', 'a@b.c')]
+
+
+def test_faithful_fill_does_not_scroll_outside_ci(monkeypatch):
+    page, driver = make_page(monkeypatch, ci=False)
+    page.fill_form({EMAIL: 'a@b.c', PASSWORD: None}, mode='faithful')
+
+    assert steps(driver) == [('clear', 'Email'), ('send_keys', 'Email', 'a@b.c'),
+                             ('clear', 'Password'), ('send_keys', 'Password', '')]
@@ -0,0 +1,52 @@
+from utils.impact_selection import affected_tests
+
+
+def _write(root, path, text=''):
+    target = root / path
+    target.parent.mkdir(parents=True, exist_ok=True)
+    target.write_text(text)
+
+
+def _repo(tmp_path):
+    _write(tmp_path, 'conftest.py', 'import utils.driver_utils\n')
+    _write(tmp_path, 'utils/__init__.py')
+    _write(tmp_path, 'utils/driver_utils.py')
+    _write(tmp_path, 'page_objects/__init__.py')
+    _write(tmp_path, 'page_objects/base_page.py')
+    _write(tmp_path, 'page_objects/login_page.py', 'from .base_page import BasePage\n')
+    _write(tmp_path, 'page_objects/search_page.py', 'from page_objects.base_page import BasePage\n')
+    _write(tmp_path, 'data/login.csv', 'email\n')
+    _write(tmp_path, 'tests/test_login.py',
+           'from page_objects.login_page import LoginPage\nDATA = "data/login.csv"\n')
+    _write(tmp_path, 'tests/test_search.py', 'from page_objects import search_page\n')
+    return tmp_path
+
+
+def test_changes_select_only_dependent_tests(tmp_path):
+    root = str(_repo(tmp_path))
+    assert list(affected_tests(['page_objects/login_page.py'], root)) == ['tests/test_login.py']
+    assert list(affected_tests(['data/login.csv'], root)) == ['tests/test_login.py']
+    assert list(affected_tests(['page_objects/base_page.py'], root)) == ['tests/test_login.py', 'tests/test_search.py']
+    assert affected_tests(['README.md'], root) == {}
+
+
+def test_conftest_and_requirements_select_everything(tmp_path):
+    root = str(_repo(tmp_path))
+    assert len(affected_tests(['utils/driver_utils.py'], root)) == 2
+    assert len(affected_tests(['requirements.txt'], root)) == 2
+
+
+def test_conftest_does_not_pull_page_objects_into_every_test():
+    # conftest.py applies to every test; importing a page object from it (even
+    # inside a function) would make every page object change select the whole suite
+    selected = affected_tests(['page_objects/base_page.py'])
+    assert 'tests/test_PRES-35.py' in selected
+    assert 'tests/test_data_loader.py' not in selected
+    assert 'tests/test_account_pool.py' not in selected
+
+
+def test_runtime_imports_of_page_objects_are_dependencies():
+    # collect_locators() imports every page object through importlib
+    selected = affected_tests(['page_objects/delete_address.py'])
+    assert 'tests/test_locator_profiler.py' in selected
+    assert 'tests/test_data_loader.py' not in selected
@@ -0,0 +1,62 @@
+import pytest
+from selenium.webdriver.common.by import By
+
+from tests.fakes import FakeDriver
+from utils.keyword_engine import KeywordPlan, KeywordPlanError, compile_keywords, load_plan
+
+CSV = """action,locator_type,locator,value
+open_url,,,http://127.0.0.1/
+enter_text,id,searchInput-desktop,bottle
+sleep,,,0.5
+"""
+
+
+def test_compile_resolves_locators_and_types():
+    plan = compile_keywords([
+        {'action': 'click', 'locator_type': 'CSS', 'locator': 'button[name=add]', 'value': ''},
+        {'action': 'sleep', 'locator_type': '', 'locator': '', 'value': '2'},
+    ])
+    assert plan.steps[0].by == By.CSS_SELECTOR
+    assert plan.steps[1].value == 2.0
+
+
+def test_compile_reports_all_errors_up_front():
+    with pytest.raises(KeywordPlanError) as excinfo:
+        compile_keywords([
+            {'action': 'hover', 'locator_type': 'id', 'locator': 'x', 'value': ''},
+            {'action': 'click', 'locator_type': 'id', 'locator': 'ok', 'value': ''},
+            {'action': 'click', 'locator_type': 'tag', 'locator': 'p', 'value': ''},
+            {'action': 'sleep', 'locator_type': '', 'locator': '', 'value': 'soon'},
+        ])
+    errors = excinfo.value.errors
+    assert [e.split(':')[0] for e in errors] == ['line 2', 'line 4', 'line 5']
+
+
+def test_load_plan_is_cached_by_content(tmp_path):
+    csv_path = tmp_path / 'steps.csv'
+    csv_path.write_text(CSV)
+    cache_dir = tmp_path / 'cache'
+    plan = load_plan(str(csv_path), cache_dir=str(cache_dir))
+    assert isinstance(plan, KeywordPlan)
+    assert (cache_dir / f"{plan.source_hash}.json").exists()
+    assert load_plan(str(csv_path), cache_dir=str(cache_dir)) == plan
+
+
+def test_run_suites_isolates_failures_and_keeps_order():
+    from utils.driver_pool import DriverPool
+    from utils.keyword_runner import KeywordSuite, format_timing_table, run_suites
+
+    def suite(name, url):
+        return KeywordSuite(name, compile_keywords([{'action': 'open_url', 'value': url}]))
+
+    def navigation_fails(command, params):
+        if 'broken' in params.get('url', ''):
+            return RuntimeError('navigation failed')
+
+    pool = DriverPool(factory=lambda browser, remote_url, caps: FakeDriver(fail=navigation_fails))
+    suites = [suite('a', 'http://a/'), suite('b', 'http://broken/'), suite('c', 'http://c/')]
+    results = run_suites(suites, concurrency=2, pool=pool)
+    assert [r.name for r in results] == ['a', 'b', 'c']
+    assert [r.passed for r in results] == [True, False, True]
+    assert 'navigation failed' in results[1].error
+    assert '2/3 suites passed' in format_timing_table(results)
@@ -0,0 +1,78 @@
+import http.cookiejar
+import json
+import urllib.error
+import urllib.parse
+import urllib.request
+
+import pytest
+
+from utils.local_site import LocalSite
+
+
+@pytest.fixture
+def site():
+    site = LocalSite().start()
+    yield site
+    site.stop()
+
+
+def make_client():
+    jar = http.cookiejar.CookieJar()
+    return urllib.request.build_opener(urllib.request.HTTPCookieProcessor(jar))
+
+
+def post(client, url, data):
+    body = urllib.parse.urlencode(data).encode()
+    try:
+        return client.open(url, data=body)
+    except urllib.error.HTTPError as e:
+        return e
+
+
+def test_account_requires_login_and_login_redirects_home(site):
+    client = make_client()
+    assert client.open(site.url + '/account').geturl().endswith('/account/login')
+
+    bad = post(client, site.url + '/account/login',
+               {'customer[email]': 'prat.jai1@example.com', 'customer[password]': 'wrong'})
+    assert bad.geturl().endswith('/account/login')
+
+    ok = post(client, site.url + '/account/login',
+              {'customer[email]': 'prat.jai1@example.com', 'customer[password]': 'Pass@1234'})
+    assert ok.geturl().rstrip('/') == site.url
+    assert 'Log out' in client.open(site.url + '/account').read().decode()
+
+
+def test_address_add_and_delete(site):
+    client = make_client()
+    post(client, site.url + '/account/login',
+         {'customer[email]': 'prat.jai1@example.com', 'customer[password]': 'Pass@1234'})
+    page = post(client, site.url + '/account/addresses',
+                {'address[first_name]': 'Aditi', 'address[last_name]': 'Sharma',
+                 'address[province]': 'Maharashtra'}).read().decode()
+    assert 'id="address_form_new"' in page
+    assert 'Aditi Sharma' in page
+
+    address_id = site.state.addresses['prat.jai1@example.com'][0]['id']
+    page = post(client, site.url + f'/account/addresses/{address_id}', {'_method': 'delete'}).read().decode()
+    assert 'Aditi Sharma' not in page
+
+
+def test_duplicate_registration_fails(site):
+    client = make_client()
+    dup = post(client, site.url + '/account/register',
+               {'customer[email]': 'Prat.Jai.test@example.com', 'customer[password]': 'Pass@1234'})
+    assert dup.geturl().endswith('/account/register')
+    new = post(client, site.url + '/account/register',
+               {'customer[email]': 'new.user@example.com', 'customer[password]': 'Pass@1234'})
+    assert new.geturl().rstrip('/') == site.url
+
+
+def test_search_product_and_cart(site):
+    client = make_client()
+    results = client.open(site.url + '/search?q=bottle').read().decode()
+    assert results.count('class="product-title"') == 2
+    product = client.open(site.url + '/products/steel-water-bottle').read().decode()
+    assert "data-value='6'" in product or 'data-value="6"' in product
+    cart = json.load(post(client, site.url + '/cart/add.js', {'handle': 'steel-water-bottle', 'quantity': '6'}))
+    assert cart['item_count'] == 6
@@ -0,0 +1,57 @@
+import gzip
+import os
+
+import pytest
+from selenium.common.exceptions import WebDriverException
+from selenium.webdriver.common.by import By
+from selenium.webdriver.remote.command import Command
+
+from tests.fakes import FakeDriver
+from utils import driver_utils, locator_profiler
+from utils.locator_profiler import collect_locators, format_report, merge_results, rank
+
+NAV_ACCOUNT = (By.XPATH, "//*[@id='NavStandard']/div[5]/div[1]/a")
+
+
+def test_locators_are_collected_from_page_objects():
+    locators = collect_locators()
+    assert 'login_page.LoginPage.LOGOUT_MYACCOUNT' in locators[NAV_ACCOUNT]
+    assert 'add_address.AddressPage.MY_ACCOUNT_ICON' in locators[NAV_ACCOUNT]
+    assert (By.ID, 'FirstName') in locators
+
+
+def test_report_ranks_slow_ambiguous_and_unmatched():
+    locators = {NAV_ACCOUNT: ['LoginPage.LOGOUT_MYACCOUNT'],
+                (By.CSS_SELECTOR, 'div.product-title'): ['SearchPage.PRODUCT_LOCATOR'],
+                (By.ID, 'missing'): ['X.MISSING']}
+    suggestion = {'by': 'css selector', 'value': "a[href=\"/account\"]", 'ms': 0.01}
+    pages = [
+        ('home', [{'count': 0, 'ms': 0.2}, {'count': 0, 'ms': 0.01}, {'count': 0, 'ms': 0.01}]),
+        ('search', [{'count': 1, 'ms': 0.2, 'suggestions': [suggestion]},
+                    {'count': 24, 'ms': 0.05, 'suggestions': []},
+                    {'count': 0, 'ms': 0.01}]),
+    ]
+    slowest, ambiguous, unmatched = rank(merge_results(locators, pages))
+    assert [r['value'] for r in slowest] == [NAV_ACCOUNT[1], 'div.product-title']
+    assert slowest[0]['positional'] and slowest[0]['slow'] and slowest[0]['source'] == 'search'
+    assert [r['count'] for r in ambiguous] == [24]
+    assert [r['value'] for r in unmatched] == ['missing']
+    assert "-> ('css selector', 'a[href=\"/account\"]')" in format_report(slowest, ambiguous, unmatched)
+
+
+def test_decompressed_snapshots_are_deleted(tmp_path, monkeypatch):
+    snapshot = tmp_path / 'page.html.gz'
+    with gzip.open(snapshot, 'wb') as f:
+        f.write(b'<html><body></body></html>')
+    temp_files = []
+
+    def browser_went_away(command, params):
+        if command == Command.GET:
+            temp_files.append(params['url'])
+            assert os.path.exists(params['url'][len('file://'):])
+            return WebDriverException('browser went away')
+
+    monkeypatch.setattr(driver_utils, 'get_driver', lambda browser: FakeDriver(fail=browser_went_away))
+    with pytest.raises(WebDriverException):
+        locator_profiler.main(['--snapshot', str(snapshot)])
+    assert len(temp_files) == 1 and not os.path.exists(temp_files[0][len('file://'):])
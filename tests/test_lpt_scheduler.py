@@ -0,0 +1,90 @@
+from utils import lpt_scheduler
+from utils.lpt_scheduler import DurationScheduling
+
+
+class FakeConfig:
+    def __init__(self, workers):
+        self.workers = workers
+
+    def getvalue(self, name):
+        return [f"{self.workers}*popen"]
+
+    def getoption(self, name):
+        return None
+
+
+class FakeNode:
+    def __init__(self, name):
+        self.gateway = type('Gateway', (), {'id': name})()
+        self.shutting_down = False
+        self.sent = []
+
+    def send_runtest_some(self, indices):
+        self.sent.extend(indices)
+
+    def shutdown(self):
+        self.shutting_down = True
+
+
+def start(collection, history, workers=2):
+    scheduler = DurationScheduling(FakeConfig(workers), history=history)
+    nodes = [FakeNode(f"gw{i}") for i in range(workers)]
+    for node in nodes:
+        scheduler.add_node(node)
+        scheduler.add_node_collection(node, collection)
+    scheduler.schedule()
+    return scheduler, nodes
+
+
+def run_to_completion(scheduler, nodes):
+    """Let the workers finish their running test in turn until everything is done."""
+    order = []
+    while scheduler.has_pending:
+        for node in nodes:
+            if scheduler.node2pending[node]:
+                index = scheduler.node2pending[node][0]
+                order.append(index)
+                scheduler.mark_test_complete(node, index)
+    return order
+
+
+COLLECTION = ['t::a', 't::b', 't::c', 't::d', 't::e', 't::f', 't::g']
+HISTORY = {'t::a': 1.0, 't::b': 7.0, 't::c': 3.0, 't::d': 6.0, 't::e': 2.0, 't::f': 5.0, 't::g': 4.0}
+
+
+def test_longest_tests_start_first_on_different_workers():
+    scheduler, nodes = start(COLLECTION, HISTORY)
+
+    # round-robin deal of the longest first: b and d start on the two workers, f and g queue behind
+    assert [node.sent for node in nodes] == [[1, 5], [3, 6]]
+    assert len(scheduler.node2pending[nodes[0]]) == lpt_scheduler._QUEUE_PER_WORKER
+    assert [COLLECTION[i] for i in scheduler.pending] == ['t::c', 't::e', 't::a']
+
+
+def test_queue_is_refilled_one_test_at_a_time_and_nothing_is_lost():
+    scheduler, nodes = start(COLLECTION, HISTORY)
+
+    scheduler.mark_test_complete(nodes[0], 1)
+    assert nodes[0].sent == [1, 5, 2]  # topped up to two with the longest remaining (c)
+    assert scheduler.node2pending[nodes[0]] == [5, 2]
+
+    run_to_completion(scheduler, nodes)
+    sent = nodes[0].sent + nodes[1].sent
+    assert sorted(sent) == list(range(len(COLLECTION)))  # every test sent exactly once
+    assert all(node.shutting_down for node in nodes)
+
+
+def test_tests_without_history_keep_collection_order():
+    scheduler, nodes = start(COLLECTION, history={})
+
+    assert [node.sent for node in nodes] == [[0, 2], [1, 3]]
+    run_to_completion(scheduler, nodes)
+    assert sorted(nodes[0].sent + nodes[1].sent) == list(range(len(COLLECTION)))
+
+
+def test_fewer_tests_than_queue_slots():
+    scheduler, nodes = start(['t::a', 't::b', 't::c'], HISTORY, workers=2)
+
+    assert sorted(nodes[0].sent + nodes[1].sent) == [0, 1, 2]
+    assert scheduler.pending == []
+    assert all(node.shutting_down for node in nodes)
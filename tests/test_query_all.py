@@ -0,0 +1,71 @@
+from selenium.webdriver.common.by import By
+from selenium.webdriver.remote.command import Command
+from selenium.webdriver.support.ui import WebDriverWait
+
+from page_objects.base_page import BasePage
+from tests.fakes import FakeDriver
+
+ADDRESSES = (By.CSS_SELECTOR, "div.address")
+
+
+def address_list(rows, ready_after=0):
+    """A page answering the query_all script with canned rows; it fills up after `ready_after` calls."""
+    calls = []
+
+    def respond(script, args):
+        by, value, attributes, styles, child_selector = args
+        calls.append(args)
+        if len(calls) <= ready_after:
+            return []
+        return [{'element': f"el{i}", 'text': row.get('text', ''),
+                 'attributes': {name: row.get(name) for name in attributes},
+                 'styles': {name: row.get(name) for name in styles}}
+                for i, row in enumerate(rows)]
+    return FakeDriver(scripts=respond)
+
+
+def calls(driver):
+    return [tuple(params['args']) for params in driver.sent(Command.W3C_EXECUTE_SCRIPT)]
+
+
+def make_page(driver, monkeypatch):
+    monkeypatch.delenv('BROWSER_WAITS', raising=False)
+    page = BasePage(driver)
+    page.wait = WebDriverWait(driver, 2, poll_frequency=0.01)
+    return page
+
+
+ROWS = [{'text': 'Ann Lee', 'data-id': '1', 'color': 'rgb(0, 0, 0)'},
+        {'text': 'Bob Ray', 'data-id': '2', 'color': 'rgb(255, 0, 0)'}]
+
+
+def test_query_all_reads_every_match_in_one_call(monkeypatch):
+    driver = address_list(ROWS)
+    page = make_page(driver, monkeypatch)
+
+    rows = page.query_all(ADDRESSES, attributes=('data-id',), styles=('color',), child_selector='p')
+
+    assert len(calls(driver)) == 1
+    assert calls(driver)[0] == ('css selector', 'div.address', ['data-id'], ['color'], 'p')
+    assert [(r['element'], r['text'], r['attributes'], r['styles']) for r in rows] == [
+        ('el0', 'Ann Lee', {'data-id': '1'}, {'color': 'rgb(0, 0, 0)'}),
+        ('el1', 'Bob Ray', {'data-id': '2'}, {'color': 'rgb(255, 0, 0)'})]
+
+
+def test_min_count_polls_until_enough_rows_match(monkeypatch):
+    driver = address_list(ROWS, ready_after=2)
+    page = make_page(driver, monkeypatch)
+
+    assert page.get_texts(ADDRESSES, child_selector='p', min_count=1) == ['Ann Lee', 'Bob Ray']
+    assert len(calls(driver)) == 3
+    assert page.query_all(ADDRESSES) != []  # without min_count: a single call, no waiting
+    assert len(calls(driver)) == 4
+
+
+def test_attribute_and_css_helpers(monkeypatch):
+    driver = address_list(ROWS)
+    page = make_page(driver, monkeypatch)
+
+    assert page.get_attributes(ADDRESSES, 'data-id') == ['1', '2']
+    assert page.get_css_values(ADDRESSES, 'color') == ['rgb(0, 0, 0)', 'rgb(255, 0, 0)']
+    assert [call[2:4] for call in calls(driver)] == [(['data-id'], []), ([], ['color'])]
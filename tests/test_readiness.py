@@ -0,0 +1,69 @@
+import pytest
+from selenium.webdriver.support.ui import WebDriverWait
+
+from page_objects.base_page import BasePage
+from tests.fakes import FakeDriver
+from utils.driver_utils import page_load_strategy
+from utils.wait_conditions import page_ready, text_changed
+
+
+def reporting(state, elements=()):
+    """A page whose readiness script reports `state`, with an element at each of `elements`."""
+    driver = FakeDriver(scripts=lambda script, args: state)
+    for locator in elements:
+        driver.add_element(locator)
+    return driver
+
+
+READY = {'parsed': True, 'requestsIdle': True, 'domQuiet': True}
+
+
+def test_page_ready_needs_quiet_page_and_key_elements():
+    key = ('id', 'FirstName')
+    assert page_ready([key])(reporting(READY, [key]))
+    assert not page_ready([key])(reporting(READY))
+    assert not page_ready([key])(reporting(dict(READY, requestsIdle=False), [key]))
+    assert not page_ready()(reporting(dict(READY, parsed=False)))
+    # script failed mid-navigation
+    assert not page_ready()(reporting(None))
+
+
+def test_page_load_strategy_is_validated(monkeypatch):
+    assert page_load_strategy() == 'normal'
+    monkeypatch.setenv('PAGE_LOAD_STRATEGY', 'Eager')
+    assert page_load_strategy() == 'eager'
+    monkeypatch.setenv('PAGE_LOAD_STRATEGY', 'fast')
+    with pytest.raises(ValueError):
+        page_load_strategy()
+
+
+def test_text_changed_counts_a_change_to_empty_text():
+    counter = ('css selector', '.cart-count')
+    driver = FakeDriver()
+    for text, changed in (('', True), ('2', True), ('1', False)):
+        driver.add_element(counter, text=text)
+        assert text_changed(counter, '1')(driver) is changed
+
+
+def test_network_idle_wait_is_best_effort():
+    # a tracker keeps finishing requests: the page never goes quiet
+    driver = reporting(False)
+    page = BasePage(driver)
+    page.settle_wait = WebDriverWait(driver, 0.05, poll_frequency=0.01)
+    assert page.wait_for_network_idle() is False
+    driver.scripts = lambda script, args: True
+    assert page.wait_for_network_idle() is True
+
+
+def test_remote_sessions_get_the_page_load_strategy(monkeypatch):
+    from utils import driver_utils
+    sessions = []
+    monkeypatch.setattr(driver_utils.webdriver, 'Remote', lambda **kwargs: sessions.append(kwargs))
+    monkeypatch.setenv('PAGE_LOAD_STRATEGY', 'eager')
+
+    driver_utils._remote_driver('firefox', 'http://grid:4444/wd/hub', {'se:name': 'PRES-35'})
+
+    [session] = sessions
+    assert session['command_executor'] == 'http://grid:4444/wd/hub'
+    caps = session['options'].to_capabilities()
+    assert (caps['browserName'], caps['pageLoadStrategy'], caps['se:name']) == ('firefox', 'eager', 'PRES-35')
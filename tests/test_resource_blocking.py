@@ -0,0 +1,39 @@
+import json
+
+from tests.fakes import FakeDriver
+from utils.resource_blocking import DEFAULT_DENY, install_blocker, resolve_patterns
+
+
+def _event(method, **params):
+    return {'message': json.dumps({'message': {'method': method, 'params': params}})}
+
+
+def test_allow_patterns_remove_matching_deny_patterns(monkeypatch):
+    monkeypatch.setenv('BLOCKED_URL_PATTERNS', '*widget.example*')
+    monkeypatch.setenv('ALLOWED_URL_PATTERNS', '*.svg*')
+    patterns = resolve_patterns(allow=['*hotjar*'])
+    assert '*widget.example*' in patterns
+    assert '*.svg*' not in patterns and '*hotjar.com*' not in patterns
+    assert resolve_patterns(deny=['*/slow/*']) == ['*/slow/*']
+    monkeypatch.delenv('BLOCKED_URL_PATTERNS')
+    monkeypatch.delenv('ALLOWED_URL_PATTERNS')
+    assert resolve_patterns() == list(DEFAULT_DENY)
+
+
+def test_blocked_requests_are_counted_by_host_and_pattern():
+    driver = FakeDriver(logs={'performance': [
+        _event('Network.requestWillBeSent', requestId='1', request={'url': 'https://cdn.shop.com/a.png?v=1'}),
+        _event('Network.requestWillBeSent', requestId='2', request={'url': 'https://www.google-analytics.com/g.js'}),
+        _event('Network.requestWillBeSent', requestId='3', request={'url': 'https://market99.com/'}),
+        _event('Network.loadingFailed', requestId='1', blockedReason='inspector'),
+        _event('Network.loadingFailed', requestId='2', blockedReason='inspector'),
+        _event('Network.loadingFailed', requestId='3', errorText='net::ERR_ABORTED'),
+    ]})
+    install_blocker(driver)
+    assert driver.sent('executeCdpCommand')[-1] == {'cmd': 'Network.setBlockedURLs', 'params': {'urls': list(DEFAULT_DENY)}}
+    stats = driver.resource_blocker.stats()
+    assert stats['blocked'] == 2
+    assert stats['by_host'] == {'cdn.shop.com': 1, 'www.google-analytics.com': 1}
+    assert stats['by_pattern'] == {'*.png*': 1, '*google-analytics.com*': 1}
+    driver.resource_blocker.reset_counters()
+    assert driver.resource_blocker.stats()['blocked'] == 0
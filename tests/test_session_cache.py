@@ -0,0 +1,37 @@
+import os
+import time
+
+from utils.session_cache import SessionCache, session_key
+
+STATE = {'cookies': [{'name': 'session', 'value': 'abc'}], 'local_storage': {}}
+
+
+def test_entries_expire_and_can_be_invalidated(tmp_path):
+    cache = SessionCache(directory=str(tmp_path), ttl=60)
+    key = session_key({'email': 'a@example.com', 'password': 'pw'}, 'https://shop.example')
+    assert cache.get(key) is None
+    cache.put(key, STATE)
+    assert cache.get(key) == STATE
+
+    cache.invalidate(key)
+    assert cache.get(key) is None
+
+    cache.put(key, STATE)
+    cache.ttl = -1
+    assert cache.get(key) is None
+    assert not os.path.exists(os.path.join(str(tmp_path), f"{key}.json"))
+
+
+def test_keys_ignore_column_order_but_not_the_site():
+    row = {'email': 'a@example.com', 'password': 'pw'}
+    assert session_key(row, 'https://a') == session_key(dict(reversed(list(row.items()))), 'https://a')
+    assert session_key(row, 'https://a') != session_key(row, 'https://b')
+
+
+def test_login_lock_is_per_key(tmp_path):
+    cache = SessionCache(directory=str(tmp_path))
+    start = time.monotonic()
+    with cache.login_lock('one'):
+        with cache.login_lock('two', timeout=0.1):
+            pass
+    assert time.monotonic() - start < 1
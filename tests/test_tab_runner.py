@@ -0,0 +1,80 @@
+import time
+
+import pytest
+from selenium.webdriver.remote.command import Command
+
+from tests.fakes import FakeDriver
+from utils import browser_waits
+from utils.tab_runner import TabRunner, raise_for_failures, settings_warnings
+
+
+def test_each_row_runs_in_its_own_tab():
+    driver = FakeDriver()
+
+    def row(url):
+        driver.get(url)
+        time.sleep(0.01)  # let the other rows take the browser in between
+        driver.get(url + '/next')
+
+    results = TabRunner(driver, max_tabs=3).run([('a', 'https://a'), ('b', 'https://b'), ('c', 'https://c')], row)
+
+    assert [r.passed for r in results] == [True, True, True]
+    tab_of = {}
+    for command, focus, params in driver.commands:
+        if command == Command.GET:
+            tab_of.setdefault(params['url'].split('/')[2], set()).add(focus)
+    assert all(len(tabs) == 1 for tabs in tab_of.values())
+    assert len(set.union(*tab_of.values())) == 3
+    assert driver.window_handles == ['main'] and driver.focus == 'main'
+    assert 'execute' not in vars(driver)
+
+
+def test_a_failing_row_does_not_stop_the_others():
+    driver = FakeDriver()
+
+    def row(value):
+        driver.get('https://site')
+        assert value != 'bad', 'row rejected'
+
+    results = TabRunner(driver, max_tabs=2).run([('row0', 'ok'), ('row1', 'bad'), ('row2', 'ok')], row)
+
+    assert [r.passed for r in results] == [True, False, True]
+    assert results[1].screenshot.startswith(b'png of tab')
+    with pytest.raises(AssertionError, match=r"1 of 3 rows failed: row1"):
+        raise_for_failures(results)
+
+
+def test_skipped_rows_are_not_failures():
+    driver = FakeDriver()
+
+    def row(value):
+        if value == 'skip':
+            pytest.skip('not on this site')
+
+    results = TabRunner(driver, max_tabs=2).run([('row0', 'ok'), ('row1', 'skip')], row)
+    assert results[1].passed and results[1].skipped == 'not on this site'
+    raise_for_failures(results)
+
+    only_skips = TabRunner(driver).run([('row0', 'skip')], row)
+    with pytest.raises(pytest.skip.Exception, match='row0: not on this site'):
+        raise_for_failures(only_skips)
+
+
+def test_in_browser_waits_use_short_slices_while_rows_run():
+    driver = FakeDriver()
+    slices = []
+
+    TabRunner(driver, max_tabs=2).run([('row0', 0), ('row1', 1)], lambda row: slices.append(browser_waits._slice_seconds))
+
+    assert slices == [browser_waits.TAB_SLICE_SECONDS] * 2
+    assert browser_waits._slice_seconds == browser_waits._SLICE_SECONDS
+
+
+def test_settings_that_serialise_rows_are_flagged(monkeypatch):
+    monkeypatch.setenv('PAGE_LOAD_STRATEGY', 'eager')
+    monkeypatch.setenv('BROWSER_WAITS', 'false')
+    assert settings_warnings() == []
+    monkeypatch.setenv('PAGE_LOAD_STRATEGY', 'normal')
+    monkeypatch.setenv('BROWSER_WAITS', 'true')
+    assert [w.split(':')[0] for w in settings_warnings()] == [
+        'TAB_ROWS with PAGE_LOAD_STRATEGY=normal', 'TAB_ROWS with BROWSER_WAITS=true']
@@ -0,0 +1,104 @@
+import time
+
+from selenium.common.exceptions import TimeoutException
+from selenium.webdriver.support.wait import WebDriverWait
+
+from utils import wait_budget
+
+
+class Clock:
+    """perf_counter/monotonic that only move when the code under test sleeps."""
+
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+def unhooked(monkeypatch):
+    """Start from selenium's own WebDriverWait (other tests may have installed the hooks)."""
+    monkeypatch.setattr(wait_budget, '_wait_listeners', [])
+    monkeypatch.setattr(wait_budget, '_hooks_installed', False)
+    monkeypatch.setattr(WebDriverWait, 'until', wait_budget._original_until)
+    monkeypatch.setattr(WebDriverWait, 'until_not', wait_budget._original_until_not)
+
+
+def fake_clock(monkeypatch):
+    unhooked(monkeypatch)
+    clock = Clock()
+    monkeypatch.setattr(time, 'perf_counter', clock)
+    monkeypatch.setattr(time, 'monotonic', clock)
+    monkeypatch.setattr(wait_budget, '_original_sleep', clock.sleep)
+    return clock
+
+
+def test_start_and_stop_restore_the_originals(monkeypatch):
+    unhooked(monkeypatch)
+    sleep, until, until_not = time.sleep, WebDriverWait.until, WebDriverWait.until_not
+
+    wait_budget.start()
+    assert time.sleep is not sleep and WebDriverWait.until is not until
+    wait_budget.stop()
+
+    assert time.sleep is sleep
+    assert (WebDriverWait.until, WebDriverWait.until_not) == (until, until_not)
+
+
+def test_sleeps_inside_waits_count_as_wait_time(monkeypatch):
+    clock = fake_clock(monkeypatch)
+    polls = []
+
+    def ready_on_third_poll(driver):
+        polls.append(clock.now)
+        return len(polls) == 3
+
+    wait_budget.start()
+    try:
+        time.sleep(1.5)
+        WebDriverWait(object(), 10, poll_frequency=0.5).until(ready_on_third_poll)
+        try:
+            WebDriverWait(object(), 1, poll_frequency=0.25).until_not(lambda driver: True)
+        except TimeoutException:
+            pass
+        time.sleep(0.25)
+    finally:
+        budget = wait_budget.stop()
+
+    # the polling sleeps of both waits are wait time, not sleep time
+    assert budget.as_dict() == {'sleep_seconds': 1.75, 'sleep_count': 2, 'wait_seconds': 2.25, 'wait_count': 2}
+
+
+def test_nested_waits_count_once(monkeypatch):
+    clock = fake_clock(monkeypatch)
+    seen = []
+    monkeypatch.setattr(wait_budget, '_wait_listeners', [lambda driver, seconds: seen.append((driver, seconds))])
+
+    wait_budget.start()
+    try:
+        with wait_budget.timed_wait('driver'):
+            time.sleep(0.5)
+            with wait_budget.timed_wait('driver'):
+                assert wait_budget.in_wait()
+                time.sleep(0.25)
+        assert not wait_budget.in_wait()
+    finally:
+        budget = wait_budget.stop()
+
+    assert (budget.wait_count, budget.wait_seconds, budget.sleep_count) == (1, 0.75, 0)
+    assert seen == [('driver', 0.75)]
+    assert clock.now == 100.75
+
+
+def test_report_totals_add_up():
+    rows = [('test_a', {'sleep_seconds': 1.25, 'sleep_count': 2, 'wait_seconds': 0.5, 'wait_count': 1}),
+            ('test_b', {'sleep_seconds': 4.0, 'sleep_count': 1, 'wait_seconds': 2.25, 'wait_count': 3})]
+
+    lines = wait_budget.format_report(rows)
+
+    assert lines[0] == "total sleep 5.25s, total wait 2.75s over 2 tests"
+    assert [line.split()[-1] for line in lines[1:]] == ['test_b', 'test_a']
+    assert lines[1].split()[0] == '4.00s'
@@ -0,0 +1,197 @@
+"""
+Leased test-account pool.
+
+The address tests all log in with the one account in login_data.csv, so
+parallel workers edit the same address book at the same time. With
+ACCOUNT_POOL=true each test leases an account of its own instead:
+
+- Accounts live in ACCOUNT_POOL_DIR (default `.account_pool`), one JSON file
+  per site, guarded by `utils.file_lock.file_lock` so every xdist worker and
+  every agent sharing the directory sees the same leases.
+- The `leased_account` fixture takes an account nobody else holds and gives it
+  back on teardown. A worker gets back the account it used last when it is
+  free, so cached sessions (utils/session_cache.py) keep being reused.
+- Leases not returned within ACCOUNT_LEASE_SECONDS (default 1800, e.g. after a
+  crashed worker) are taken back automatically. When every account is leased,
+  a test waits up to ACCOUNT_LEASE_WAIT seconds (default 300) for one.
+- Accounts are created once, not per run: `test_add_customer_registration`
+  adds the accounts it registers, and utils/account_provisioning.py signs up
+  more in one go:
+
+    python -m utils.account_provisioning 8
+    python -m utils.account_pool --add someone@example.com:Pass@1234
+    python -m utils.account_pool --list
+"""
+import argparse
+import hashlib
+import json
+import os
+import sys
+import time
+
+from utils.file_lock import file_lock
+from utils.site_config import get_base_url
+
+DEFAULT_LEASE_SECONDS = 1800
+DEFAULT_WAIT_SECONDS = 300
+
+
+def is_account_pool_enabled():
+    return os.environ.get('ACCOUNT_POOL', 'false').lower() == 'true'
+
+
+def _float_from_env(name, default):
+    try:
+        return float(os.environ.get(name, default))
+    except ValueError:
+        return default
+
+
+def default_owner():
+    """Lease owner for the current process (the xdist worker id when running under xdist)."""
+    return f"{os.environ.get('PYTEST_XDIST_WORKER', 'main')}:{os.getpid()}"
+
+
+class AccountPool:
+    """File-backed pool of site accounts leased exclusively to one test at a time."""
+
+    def __init__(self, base_url=None, directory=None, lease_seconds=None, wait_seconds=None, poll=0.5):
+        self.base_url = (base_url or get_base_url()).rstrip('/')
+        self.directory = directory or os.environ.get('ACCOUNT_POOL_DIR', '.account_pool')
+        if lease_seconds is None:
+            lease_seconds = _float_from_env('ACCOUNT_LEASE_SECONDS', DEFAULT_LEASE_SECONDS)
+        if wait_seconds is None:
+            wait_seconds = _float_from_env('ACCOUNT_LEASE_WAIT', DEFAULT_WAIT_SECONDS)
+        self.lease_seconds = lease_seconds
+        self.wait_seconds = wait_seconds
+        self.poll = poll
+        digest = hashlib.sha256(self.base_url.encode('utf-8')).hexdigest()[:16]
+        self.path = os.path.join(self.directory, f"{digest}.json")
+
+    def _load(self):
+        try:
+            with open(self.path, encoding='utf-8') as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            state = {}
+        state.setdefault('site', self.base_url)
+        state.setdefault('accounts', [])
+        return state
+
+    def _save(self, state):
+        os.makedirs(self.directory, exist_ok=True)
+        tmp = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(state, f, indent=2)
+        os.replace(tmp, self.path)
+
+    def add(self, accounts):
+        """Add {'email', 'password'} accounts (already registered on the site); known emails are updated."""
+        with file_lock(self.path):
+            state = self._load()
+            by_email = {a['email']: a for a in state['accounts']}
+            for account in accounts:
+                entry = by_email.get(account['email'])
+                if entry is None:
+                    entry = {'email': account['email'], 'lease': None, 'last_owner': None, 'released': 0}
+                    state['accounts'].append(entry)
+                    by_email[account['email']] = entry
+                entry['password'] = account['password']
+            self._save(state)
+
+    def remove(self, email):
+        with file_lock(self.path):
+            state = self._load()
+            state['accounts'] = [a for a in state['accounts'] if a['email'] != email]
+            self._save(state)
+
+    def accounts(self):
+        with file_lock(self.path):
+            return self._load()['accounts']
+
+    def _try_lease(self, owner):
+        with file_lock(self.path):
+            state = self._load()
+            if not state['accounts']:
+                raise RuntimeError(
+                    f"Account pool for {self.base_url} is empty; "
+                    "add accounts with `python -m utils.account_provisioning N`"
+                )
+            now = time.time()
+            free = [a for a in state['accounts'] if not a['lease'] or a['lease']['expires'] < now]
+            if not free:
+                return None
+            # The owner's previous account first (its session is likely cached), then least recently used
+            account = min(free, key=lambda a: (a['last_owner'] != owner, a['released']))
+            account['lease'] = {'owner': owner, 'since': now, 'expires': now + self.lease_seconds}
+            account['last_owner'] = owner
+            self._save(state)
+            return {'email': account['email'], 'password': account['password']}
+
+    def lease(self, owner=None):
+        """
+        Lease a free account to `owner`; returns {'email', 'password'}.
+
+        Waits up to `wait_seconds` while every account is leased, then raises
+        TimeoutError. Raises RuntimeError if the pool has no accounts at all.
+        """
+        owner = owner or default_owner()
+        deadline = time.monotonic() + self.wait_seconds
+        while True:
+            account = self._try_lease(owner)
+            if account is not None:
+                return account
+            if time.monotonic() > deadline:
+                raise TimeoutError(f"No free account in the pool for {self.base_url} within {self.wait_seconds}s")
+            time.sleep(self.poll)
+
+    def release(self, account, owner=None):
+        """Give back an account leased to `owner`; a lease that expired and went to someone else is left alone."""
+        owner = owner or default_owner()
+        with file_lock(self.path):
+            state = self._load()
+            for entry in state['accounts']:
+                if entry['email'] == account['email'] and entry['lease'] and entry['lease']['owner'] == owner:
+                    entry['lease'] = None
+                    entry['released'] = time.time()
+            self._save(state)
+
+    def release_all(self):
+        """Drop every lease, e.g. after an aborted run."""
+        with file_lock(self.path):
+            state = self._load()
+            for entry in state['accounts']:
+                entry['lease'] = None
+            self._save(state)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Manage the leased test-account pool.")
+    parser.add_argument('--base-url', default=None, help="site the accounts belong to (default: BASE_URL)")
+    parser.add_argument('--add', action='append', default=[], metavar='EMAIL:PASSWORD', help="add an existing account")
+    parser.add_argument('--release-all', action='store_true', help="drop every lease")
+    parser.add_argument('--list', action='store_true')
+    args = parser.parse_args(argv)
+
+    pool = AccountPool(args.base_url)
+    if args.add:
+        accounts = []
+        for spec in args.add:
+            email, sep, password = spec.partition(':')
+            if not sep:
+                parser.error(f"expected EMAIL:PASSWORD, got {spec!r}")
+            accounts.append({'email': email, 'password': password})
+        pool.add(accounts)
+    if args.release_all:
+        pool.release_all()
+    if args.list or not (args.add or args.release_all):
+        now = time.time()
+        for account in pool.accounts():
+            lease = account['lease']
+            held = f"leased to {lease['owner']}" if lease and lease['expires'] >= now else 'free'
+            print(f"{account['email']:<45} {held}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
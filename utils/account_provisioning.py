@@ -0,0 +1,60 @@
+"""
+Sign up accounts for the leased account pool (utils/account_pool.py).
+
+Kept apart from account_pool because it drives the registration page:
+conftest.py imports account_pool, and an import of page_objects from there
+would make every test depend on every page object for impact selection
+(utils/impact_selection.py).
+
+CLI:
+    python -m utils.account_provisioning 8
+    python -m utils.account_provisioning 4 --browser edge --base-url http://127.0.0.1:8000
+"""
+import argparse
+import os
+import sys
+import uuid
+
+from page_objects.Signup import AddCustomerPage
+from utils.account_pool import AccountPool
+
+
+def provision(pool, driver, count, password='Pass@1234', prefix='pool'):
+    """Sign up `count` new accounts through the registration page and add them to `pool`."""
+    created = []
+    for _ in range(count):
+        email = f"{prefix}.{uuid.uuid4().hex[:12]}@example.com"
+        driver.delete_all_cookies()
+        page = AddCustomerPage(driver)
+        page.open(pool.base_url + "/")
+        page.open_registration()
+        page.add_customer("Pool", "Account", email, password)
+        page.wait_for_page_load()
+        if page.is_registration_successful(pool.base_url):
+            created.append({'email': email, 'password': password})
+    pool.add(created)
+    return created
+
+
+def main(argv=None):
+    from utils.driver_utils import get_driver
+
+    parser = argparse.ArgumentParser(description="Sign up new accounts for the leased account pool.")
+    parser.add_argument('count', type=int, help="number of accounts to sign up")
+    parser.add_argument('--base-url', default=None, help="site to sign up on (default: BASE_URL)")
+    parser.add_argument('--browser', default='chrome')
+    args = parser.parse_args(argv)
+
+    pool = AccountPool(args.base_url)
+    os.environ.setdefault('HEADLESS', 'true')
+    driver = get_driver(args.browser)
+    try:
+        created = provision(pool, driver, args.count)
+    finally:
+        driver.quit()
+    print(f"created {len(created)} of {args.count} accounts")
+    return 0 if len(created) == args.count else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,211 @@
+"""
+In-browser waits.
+
+WebDriverWait asks the browser over HTTP every 0.5 s, so a wait costs up to
+half a second of latency plus one or two round trips per poll. BrowserWait
+sends the condition into the page with execute_async_script instead: it is
+checked immediately, then again on every DOM mutation (MutationObserver,
+batched per animation frame) and on a short timer for style-only changes,
+and the script returns the moment it holds. A typical wait is one round trip.
+
+The conditions below mirror selenium's `expected_conditions` (same names,
+arguments and return values) and also work as ordinary one-shot conditions in
+a plain WebDriverWait. Any other name is forwarded to expected_conditions, and
+BrowserWait.until falls back to normal polling for conditions without an
+in-browser version, so the module can stand in for `EC`:
+
+    from utils import browser_waits as EC
+    BrowserWait(driver, 10).until(EC.element_to_be_clickable((By.ID, "Email")))
+
+BasePage uses it for its own waits when BROWSER_WAITS=true. Inside
+short_slices() (used by utils/tab_runner.py) each call is cut to a fraction of
+a second so a wait does not hold a shared session.
+"""
+import os
+import time
+from contextlib import contextmanager
+
+from selenium.common.exceptions import JavascriptException, TimeoutException
+from selenium.webdriver.remote.webelement import WebElement
+from selenium.webdriver.support import expected_conditions as _selenium_ec
+from selenium.webdriver.support.wait import WebDriverWait
+
+from utils.dom_scripts import FIND_ALL_JS
+from utils.wait_budget import timed_wait
+
+# Longest single execute_async_script call; stays below the default 30 s script
+# timeout and lets a wait survive a navigation (the script is re-sent to the new page)
+_SLICE_SECONDS = 5
+
+# Slice used inside short_slices(): a session runs one command at a time, so while
+# several tabs share it (utils/tab_runner.py) a long slice would stall the other rows
+TAB_SLICE_SECONDS = 0.25
+
+_slice_seconds = _SLICE_SECONDS
+
+# Errors that mean "not yet" rather than "never": the document unloaded under the script, or
+# the slice ran into the session's script timeout (selenium raises TimeoutException for it)
+_RETRY_ERRORS = (JavascriptException, TimeoutException)
+
+_RESOLVE_JS = """
+function resolve(a, b) { return typeof a === 'string' ? findAll(a, b) : (a ? [a] : []); }
+function clickable(el) { return isShown(el) && !el.disabled; }
+"""
+
+_WAIT_SCRIPT = FIND_ALL_JS + _RESOLVE_JS + """
+var args = arguments[0], timeoutMs = arguments[1], done = arguments[arguments.length - 1];
+var check = __CHECK__;
+function attempt() {
+  try { return check.apply(null, args); } catch (e) { return null; }
+}
+var first = attempt();
+if (first) { done(first); return; }
+var finished = false, scheduled = false, observer, poll, timer;
+function finish(value) {
+  if (finished) { return; }
+  finished = true;
+  observer.disconnect();
+  clearInterval(poll);
+  clearTimeout(timer);
+  done(value);
+}
+function recheck() {
+  scheduled = false;
+  var result = attempt();
+  if (result) { finish(result); }
+}
+function schedule() {
+  if (scheduled || finished) { return; }
+  scheduled = true;
+  requestAnimationFrame(recheck);
+}
+observer = new MutationObserver(schedule);
+observer.observe(document, {childList: true, subtree: true, attributes: true, characterData: true});
+// Visibility can also change through CSS alone (transitions, media queries), and
+// animation frames are paused in background tabs
+poll = setInterval(recheck, 50);
+timer = setTimeout(function () { finish(null); }, timeoutMs);
+"""
+
+_CHECK_ONCE_SCRIPT = FIND_ALL_JS + _RESOLVE_JS + """
+try { return (__CHECK__).apply(null, arguments[0]); } catch (e) { return null; }
+"""
+
+
+def is_browser_waits_enabled():
+    return os.environ.get('BROWSER_WAITS', 'false').lower() == 'true'
+
+
+class _BrowserCondition:
+    """An expected condition with an in-browser JS predicate `check(a, b, ...)`."""
+
+    check = 'function () { return null; }'
+
+    def __init__(self, *args):
+        self.args = list(args)
+
+    @staticmethod
+    def _target(mark):
+        # (By, value) locator or an already located WebElement
+        return [mark] if isinstance(mark, WebElement) else list(mark)
+
+    @property
+    def browser_script(self):
+        return _WAIT_SCRIPT.replace('__CHECK__', self.check)
+
+    def __call__(self, driver):
+        try:
+            return driver.execute_script(_CHECK_ONCE_SCRIPT.replace('__CHECK__', self.check), self.args) or False
+        except _RETRY_ERRORS:
+            return False
+
+
+class presence_of_element_located(_BrowserCondition):
+    check = 'function (by, value) { return resolve(by, value)[0] || null; }'
+
+    def __init__(self, locator):
+        super().__init__(*self._target(locator))
+
+
+class presence_of_all_elements_located(_BrowserCondition):
+    check = 'function (by, value) { var found = resolve(by, value); return found.length ? found : null; }'
+
+    def __init__(self, locator):
+        super().__init__(*self._target(locator))
+
+
+class visibility_of_element_located(_BrowserCondition):
+    check = 'function (by, value) { var el = resolve(by, value)[0]; return el && isShown(el) ? el : null; }'
+
+    def __init__(self, locator):
+        super().__init__(*self._target(locator))
+
+
+class visibility_of_all_elements_located(_BrowserCondition):
+    check = ('function (by, value) { var found = resolve(by, value);'
+             ' return found.length && found.every(isShown) ? found : null; }')
+
+    def __init__(self, locator):
+        super().__init__(*self._target(locator))
+
+
+class element_to_be_clickable(_BrowserCondition):
+    check = 'function (by, value) { var el = resolve(by, value)[0]; return el && clickable(el) ? el : null; }'
+
+    def __init__(self, mark):
+        super().__init__(*self._target(mark))
+
+
+class invisibility_of_element_located(_BrowserCondition):
+    check = 'function (by, value) { var el = resolve(by, value)[0]; return !el || !isShown(el); }'
+
+    def __init__(self, locator):
+        super().__init__(*self._target(locator))
+
+
+class text_to_be_present_in_element(_BrowserCondition):
+    check = ('function (by, value, text) { var el = resolve(by, value)[0];'
+             ' return !!el && (el.innerText || el.textContent).indexOf(text) !== -1; }')
+
+    def __init__(self, locator, text_):
+        super().__init__(*self._target(locator), text_)
+
+
+def __getattr__(name):
+    # Everything without an in-browser version behaves exactly like selenium's
+    return getattr(_selenium_ec, name)
+
+
+@contextmanager
+def short_slices(seconds=TAB_SLICE_SECONDS):
+    """Cap every in-browser wait call at `seconds` inside the block (all threads)."""
+    global _slice_seconds
+    previous, _slice_seconds = _slice_seconds, seconds
+    try:
+        yield
+    finally:
+        _slice_seconds = previous
+
+
+class BrowserWait(WebDriverWait):
+    """WebDriverWait that evaluates in-browser conditions inside the page."""
+
+    def until(self, method, message=""):
+        script = getattr(method, 'browser_script', None)
+        if script is None:
+            return super().until(method, message)
+        with timed_wait(self._driver):
+            end = time.monotonic() + self._timeout
+            while True:
+                remaining_ms = int(max(0.0, min(end - time.monotonic(), _slice_seconds)) * 1000)
+                try:
+                    result = self._driver.execute_async_script(script, method.args, remaining_ms)
+                except _RETRY_ERRORS:
+                    # page navigated away mid-wait or the slice hit the script timeout; retry on the
+                    # current page. Anything else (dead session, closed window, stale element) propagates
+                    result = None
+                    time.sleep(min(self._poll, max(0.0, end - time.monotonic())))
+                if result:
+                    return result
+                if time.monotonic() >= end:
+                    raise TimeoutException(message)
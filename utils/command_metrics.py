@@ -0,0 +1,179 @@
+"""
+WebDriver command latency instrumentation.
+
+instrument_driver() wraps `driver.execute`, the single entry point every
+WebDriver and WebElement command goes through, and records per command:
+name, locator (for find commands), duration and whether it ran inside a
+WebDriverWait. Time spent in waits is collected through
+utils.wait_budget.add_wait_listener.
+
+- get_driver applies it unless COMMAND_METRICS=false.
+- conftest.py resets the recorder per test, attaches the summary to Allure
+  and writes a session-wide aggregate to COMMAND_METRICS_FILE
+  (default reports/command_metrics.json).
+"""
+import math
+import os
+import threading
+import time
+
+from utils import wait_budget
+
+# Upper bounds (ms) of the latency histogram buckets; mergeable across tests/workers
+HISTOGRAM_BOUNDS_MS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000, math.inf)
+
+
+def is_command_metrics_enabled():
+    return os.environ.get('COMMAND_METRICS', 'true').lower() == 'true'
+
+
+def _percentile(sorted_values, pct):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, math.ceil(pct / 100 * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+def _histogram(durations_ms):
+    counts = [0] * len(HISTOGRAM_BOUNDS_MS)
+    for value in durations_ms:
+        for i, bound in enumerate(HISTOGRAM_BOUNDS_MS):
+            if value <= bound:
+                counts[i] += 1
+                break
+    return counts
+
+
+def _histogram_percentile(counts, pct):
+    """Upper bound of the bucket holding the pct-th percentile (None for the open-ended bucket)."""
+    total = sum(counts)
+    if not total:
+        return 0.0
+    threshold = pct / 100 * total
+    running = 0
+    for bound, count in zip(HISTOGRAM_BOUNDS_MS, counts):
+        running += count
+        if running >= threshold:
+            return bound if math.isfinite(bound) else None
+    return None
+
+
+class CommandRecorder:
+    """Collects the commands sent by one driver since the last reset()."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.records = []
+            self.wait_seconds = 0.0
+            self.wait_count = 0
+
+    def record(self, command, locator, seconds, in_wait):
+        with self._lock:
+            self.records.append((command, locator, seconds, in_wait))
+
+    def add_wait(self, seconds):
+        with self._lock:
+            self.wait_seconds += seconds
+            self.wait_count += 1
+
+    def summary(self):
+        with self._lock:
+            records = list(self.records)
+            wait_seconds, wait_count = self.wait_seconds, self.wait_count
+        durations = sorted(r[2] * 1000 for r in records)
+        by_command = {}
+        for command, _, seconds, _ in records:
+            entry = by_command.setdefault(command, {'count': 0, 'total_ms': 0.0})
+            entry['count'] += 1
+            entry['total_ms'] += seconds * 1000
+        for entry in by_command.values():
+            entry['total_ms'] = round(entry['total_ms'], 2)
+        slowest = sorted(records, key=lambda r: r[2], reverse=True)[:5]
+        return {
+            'round_trips': len(records),
+            'command_seconds': round(sum(durations) / 1000, 3),
+            'p50_ms': round(_percentile(durations, 50), 2),
+            'p95_ms': round(_percentile(durations, 95), 2),
+            'max_ms': round(durations[-1], 2) if durations else 0.0,
+            'round_trips_in_waits': sum(1 for r in records if r[3]),
+            'wait_seconds': round(wait_seconds, 3),
+            'wait_count': wait_count,
+            'by_command': by_command,
+            'slowest': [{'command': c, 'locator': l, 'ms': round(s * 1000, 2)} for c, l, s, _ in slowest],
+            'histogram': _histogram(durations),
+        }
+
+
+def _on_wait(driver, seconds):
+    recorder = get_recorder(driver)
+    if recorder is not None:
+        recorder.add_wait(seconds)
+
+
+_listener_registered = False
+_register_lock = threading.Lock()
+
+
+def instrument_driver(driver):
+    """Record every command `driver` sends. Returns the same driver (idempotent)."""
+    global _listener_registered
+    if get_recorder(driver) is not None:
+        return driver
+    with _register_lock:
+        if not _listener_registered:
+            wait_budget.add_wait_listener(_on_wait)
+            _listener_registered = True
+
+    recorder = CommandRecorder()
+    execute = driver.execute
+
+    def timed_execute(driver_command, params=None):
+        start = time.perf_counter()
+        try:
+            return execute(driver_command, params)
+        finally:
+            locator = ''
+            if params and 'using' in params:
+                locator = f"{params['using']}={params.get('value')}"
+            recorder.record(driver_command, locator, time.perf_counter() - start, wait_budget.in_wait())
+
+    driver.execute = timed_execute
+    driver.command_recorder = recorder
+    return driver
+
+
+def get_recorder(driver):
+    return getattr(driver, 'command_recorder', None) if driver is not None else None
+
+
+def merge_summaries(tests):
+    """
+    Aggregate {nodeid: summary} into one session report.
+
+    Session percentiles come from the merged histograms, so they are bucket
+    upper bounds rather than exact values.
+    """
+    histogram = [0] * len(HISTOGRAM_BOUNDS_MS)
+    by_command = {}
+    for summary in tests.values():
+        histogram = [a + b for a, b in zip(histogram, summary['histogram'])]
+        for command, entry in summary['by_command'].items():
+            total = by_command.setdefault(command, {'count': 0, 'total_ms': 0.0})
+            total['count'] += entry['count']
+            total['total_ms'] = round(total['total_ms'] + entry['total_ms'], 2)
+    return {
+        'tests': len(tests),
+        'round_trips': sum(s['round_trips'] for s in tests.values()),
+        'command_seconds': round(sum(s['command_seconds'] for s in tests.values()), 3),
+        'wait_seconds': round(sum(s['wait_seconds'] for s in tests.values()), 3),
+        'p50_ms_bucket': _histogram_percentile(histogram, 50),
+        'p95_ms_bucket': _histogram_percentile(histogram, 95),
+        'histogram_bounds_ms': [str(b) for b in HISTOGRAM_BOUNDS_MS],
+        'histogram': histogram,
+        'by_command': by_command,
+        'per_test': tests,
+    }
@@ -0,0 +1,35 @@
+"""
+JavaScript shared by the scripts that run inside the page.
+
+FIND_ALL_JS defines findAll(by, value), which resolves a selenium (By, value)
+locator in the page, and isShown(el), a cheap visibility check. Scripts that
+work on located elements prepend it, so they need no find_element round trip
+per locator (BasePage.query_all/fill_form, utils.browser_waits,
+utils.locator_profiler).
+"""
+
+FIND_ALL_JS = """
+function findAll(by, value) {
+  switch (by) {
+    case 'css selector': return Array.from(document.querySelectorAll(value));
+    case 'id': return Array.from(document.querySelectorAll('#' + CSS.escape(value)));
+    case 'name': return Array.from(document.querySelectorAll('[name="' + CSS.escape(value) + '"]'));
+    case 'class name': return Array.from(document.querySelectorAll('.' + CSS.escape(value)));
+    case 'tag name': return Array.from(document.getElementsByTagName(value));
+    case 'link text':
+      return Array.from(document.querySelectorAll('a')).filter(function (a) { return a.innerText.trim() === value; });
+    case 'partial link text':
+      return Array.from(document.querySelectorAll('a')).filter(function (a) { return a.innerText.indexOf(value) !== -1; });
+    case 'xpath':
+      var snap = document.evaluate(value, document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+      var out = [];
+      for (var i = 0; i < snap.snapshotLength; i++) { out.push(snap.snapshotItem(i)); }
+      return out;
+  }
+  throw new Error('Unsupported locator strategy: ' + by);
+}
+function isShown(el) {
+  return !!(el.offsetWidth || el.offsetHeight || el.getClientRects().length) &&
+    window.getComputedStyle(el).visibility !== 'hidden';
+}
+"""
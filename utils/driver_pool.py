@@ -0,0 +1,196 @@
+"""
+Warm WebDriver pool.
+
+Launching Chrome/Edge is the most expensive part of a short UI test. The pool
+keeps finished drivers alive and hands them to the next test that asks for the
+same browser, after wiping cookies, storage and extra windows.
+
+- One pool lives per pytest process, so every xdist worker keeps its own
+  warm browser per (browser, remote_url, capabilities_overrides).
+- A driver is recycled (quit and replaced) after DRIVER_POOL_MAX_USES tests,
+  after a failed test, or when the state reset itself fails.
+- prewarm() launches browsers on background threads so they are ready by the
+  time the first test asks for one (PREWARM_BROWSERS=true in conftest.py).
+"""
+import hashlib
+import json
+import os
+import threading
+
+from utils.driver_utils import get_driver
+
+DEFAULT_MAX_USES = 50
+
+
+def is_prewarm_enabled():
+    """PREWARM_BROWSERS=true starts the configured browsers while pytest is still collecting."""
+    return os.environ.get('PREWARM_BROWSERS', 'false').lower() == 'true'
+
+
+def is_pool_enabled():
+    """Return True unless pooling is switched off with DRIVER_POOL=false."""
+    return os.environ.get('DRIVER_POOL', 'true').lower() == 'true'
+
+
+def _max_uses_from_env():
+    try:
+        return int(os.environ.get('DRIVER_POOL_MAX_USES', DEFAULT_MAX_USES))
+    except ValueError:
+        return DEFAULT_MAX_USES
+
+
+def reset_driver_state(driver):
+    """
+    Bring a used driver back to a blank state.
+
+    Closes every window but the first, clears cookies, localStorage and
+    sessionStorage and navigates to about:blank. Raises if the browser is no
+    longer usable so the caller can discard it.
+    """
+    handles = driver.window_handles
+    for handle in handles[1:]:
+        driver.switch_to.window(handle)
+        driver.close()
+    driver.switch_to.window(handles[0])
+
+    # Storage is per origin, so clear it before leaving the current page
+    try:
+        driver.execute_script("window.localStorage.clear(); window.sessionStorage.clear();")
+    except Exception:
+        # about:blank / data: pages have no storage
+        pass
+    driver.delete_all_cookies()
+    # delete_all_cookies only covers the current domain; Chromium can wipe all of them
+    if hasattr(driver, 'execute_cdp_cmd'):
+        try:
+            driver.execute_cdp_cmd('Network.clearBrowserCookies', {})
+        except Exception:
+            pass
+    driver.get('about:blank')
+
+
+def _pool_key(browser, remote_url, capabilities_overrides):
+    """Drivers are only shared between requests for the same browser configuration."""
+    caps = None
+    if capabilities_overrides:
+        caps = hashlib.sha256(json.dumps(capabilities_overrides, sort_keys=True, default=repr).encode()).hexdigest()
+    return browser, remote_url, caps
+
+
+class DriverPool:
+    """Thread-safe pool of idle drivers keyed by (browser, remote_url, capabilities_overrides)."""
+
+    def __init__(self, max_uses=None, factory=get_driver):
+        self.max_uses = max_uses if max_uses is not None else _max_uses_from_env()
+        self._factory = factory
+        # Condition so acquire() can wait for a browser that is being pre-warmed
+        self._lock = threading.Condition()
+        self._idle = {}
+        self._uses = {}
+        self._keys = {}
+        self._pending = {}
+
+    def prewarm(self, browsers, remote_url=None, capabilities_overrides=None):
+        """
+        Launch one driver per browser in `browsers` on background threads.
+
+        Returns immediately. A test that asks for a browser still being launched
+        waits for it instead of starting a second one. Launch failures are
+        ignored; acquire() then launches the browser itself and surfaces the error.
+        """
+        threads = []
+        for browser in browsers:
+            key = _pool_key(browser, remote_url, capabilities_overrides)
+            with self._lock:
+                self._pending[key] = self._pending.get(key, 0) + 1
+            thread = threading.Thread(target=self._launch_idle, args=(key, capabilities_overrides),
+                                      name=f"prewarm-{browser}", daemon=True)
+            thread.start()
+            threads.append(thread)
+        return threads
+
+    def _launch_idle(self, key, capabilities_overrides):
+        try:
+            driver = self._factory(key[0], key[1], capabilities_overrides)
+        except Exception:
+            driver = None
+        with self._lock:
+            self._pending[key] -= 1
+            if driver is not None:
+                self._uses[id(driver)] = 0
+                self._keys[id(driver)] = key
+                self._idle.setdefault(key, []).append(driver)
+            self._lock.notify_all()
+
+    def acquire(self, browser="chrome", remote_url=None, capabilities_overrides=None):
+        """Return a warm driver for `browser` (and the same overrides), launching one if none is idle."""
+        key = _pool_key(browser, remote_url, capabilities_overrides)
+        with self._lock:
+            while not self._idle.get(key) and self._pending.get(key):
+                self._lock.wait()
+            idle = self._idle.get(key)
+            driver = idle.pop() if idle else None
+        if driver is None:
+            driver = self._factory(browser, remote_url, capabilities_overrides)
+            with self._lock:
+                self._uses[id(driver)] = 0
+                self._keys[id(driver)] = key
+        with self._lock:
+            self._uses[id(driver)] += 1
+        return driver
+
+    def release(self, driver, discard=False):
+        """
+        Return a driver to the pool.
+
+        The driver is quit instead of reused when `discard` is set (e.g. the
+        test failed), when it reached `max_uses` or when its reset fails.
+        """
+        with self._lock:
+            key = self._keys.get(id(driver))
+            uses = self._uses.get(id(driver), 0)
+        if key is None:
+            # Not ours; just close it
+            self._quit(driver)
+            return
+        if discard or (self.max_uses and uses >= self.max_uses):
+            self._forget_and_quit(driver)
+            return
+        try:
+            reset_driver_state(driver)
+        except Exception:
+            self._forget_and_quit(driver)
+            return
+        with self._lock:
+            self._idle.setdefault(key, []).append(driver)
+
+    def idle_count(self, browser=None):
+        with self._lock:
+            if browser is None:
+                return sum(len(v) for v in self._idle.values())
+            return sum(len(v) for k, v in self._idle.items() if k[0] == browser)
+
+    def close(self, timeout=60):
+        """Quit every idle driver. Call once at the end of the session."""
+        with self._lock:
+            # Let in-flight pre-warm launches finish so their browsers are not leaked
+            self._lock.wait_for(lambda: not any(self._pending.values()), timeout)
+            drivers = [d for idle in self._idle.values() for d in idle]
+            self._idle.clear()
+            self._uses.clear()
+            self._keys.clear()
+        for driver in drivers:
+            self._quit(driver)
+
+    def _forget_and_quit(self, driver):
+        with self._lock:
+            self._uses.pop(id(driver), None)
+            self._keys.pop(id(driver), None)
+        self._quit(driver)
+
+    @staticmethod
+    def _quit(driver):
+        try:
+            driver.quit()
+        except Exception:
+            pass
@@ -4,18 +4,34 @@ from selenium.webdriver.chrome.options import Options as ChromeOptions
 from selenium.webdriver.firefox.options import Options as FirefoxOptions
 from selenium.webdriver.edge.options import Options as EdgeOptions
 from selenium.webdriver.edge.service import Service as EdgeService
-from selenium.webdriver.common.desired_capabilities import DesiredCapabilities
+
+from utils.command_metrics import instrument_driver, is_command_metrics_enabled
+from utils import edge_profiles
+from utils.resource_blocking import get_blocker, install_blocker, is_resource_blocking_enabled, logging_capability
+from utils.wait_conditions import READINESS_TRACKER_SCRIPT
+
+PAGE_LOAD_STRATEGIES = ('normal', 'eager', 'none')
+
+
+def page_load_strategy():
+    """PAGE_LOAD_STRATEGY=eager|none makes driver.get return before images/trackers finish (default normal)."""
+    strategy = os.environ.get('PAGE_LOAD_STRATEGY', 'normal').lower()
+    if strategy not in PAGE_LOAD_STRATEGIES:
+        raise ValueError(f"Unsupported PAGE_LOAD_STRATEGY: {strategy} (use one of {', '.join(PAGE_LOAD_STRATEGIES)})")
+    return strategy
 
 
 def _local_driver(browser_name):
     # Check if running in CI environment (GitHub Actions sets CI=true)
     # On local Windows, this will be False, so browser runs normally
     is_ci = os.environ.get('CI', 'false').lower() == 'true'
+    # HEADLESS=true gives the CI browser setup outside CI (e.g. local benchmarks)
+    is_headless = is_ci or os.environ.get('HEADLESS', 'false').lower() == 'true'
 
     if browser_name == "chrome":
         options = ChromeOptions()
         # Only apply headless and CI-specific options when running in CI
-        if is_ci:
+        if is_headless:
             options.add_argument('--headless=new')
             options.add_argument('--no-sandbox')
             options.add_argument('--disable-dev-shm-usage')
@@ -23,78 +39,126 @@ def _local_driver(browser_name):
             options.add_argument('--window-size=1920,1080')
             options.add_argument('--disable-extensions')
             options.add_argument('--disable-setuid-sandbox')
+        if is_resource_blocking_enabled():
+            options.set_capability(*logging_capability('chrome'))
+        options.page_load_strategy = page_load_strategy()
         return webdriver.Chrome(options=options)
     elif browser_name == "firefox":
         options = FirefoxOptions()
-        if is_ci:
+        if is_headless:
             options.add_argument('--headless')
+        options.page_load_strategy = page_load_strategy()
         return webdriver.Firefox(options=options)
     elif browser_name == "edge":
-        options = EdgeOptions()
-
-        # Critical flags for Jenkins/Windows service context
-        # These prevent Edge from crashing when run as a service
-        options.add_argument('--no-sandbox')
-        options.add_argument('--disable-dev-shm-usage')
-        options.add_argument('--disable-gpu')
-        options.add_argument('--disable-extensions')
-        options.add_argument('--disable-software-rasterizer')
-        options.add_argument('--disable-background-networking')
-        options.add_argument('--disable-default-apps')
-        options.add_argument('--disable-sync')
-        options.add_argument('--disable-translate')
-        options.add_argument('--metrics-recording-only')
-        options.add_argument('--mute-audio')
-        options.add_argument('--no-first-run')
-        options.add_argument('--safebrowsing-disable-auto-update')
-        options.add_argument('--disable-blink-features=AutomationControlled')
-
-        # Fix for DevToolsActivePort error in Windows service context
-        options.add_argument('--remote-debugging-port=9222')
-        options.add_argument('--disable-features=msSmartScreenProtection')
-
-        # Create a temp user data directory to avoid profile access issues
-        import tempfile
-        temp_dir = tempfile.mkdtemp(prefix='edge_profile_')
-        options.add_argument(f'--user-data-dir={temp_dir}')
-        options.add_argument('--profile-directory=Default')
-
-        if is_ci:
-            options.add_argument('--headless=new')
-            options.add_argument('--window-size=1920,1080')
-        else:
-            # For local runs, maximize window for better visibility
-            options.add_argument('--start-maximized')
-
-        # Check if EDGE_DRIVER_PATH is set in the environment
-        edge_driver_path = os.environ.get("EDGE_DRIVER_PATH")
-        if edge_driver_path:
-            # Use the specified driver path
-            service = EdgeService(executable_path=edge_driver_path)
-            return webdriver.Edge(service=service, options=options)
-        else:
-            # Let Selenium Manager handle the driver
-            return webdriver.Edge(options=options)
+        return _local_edge(is_headless)
     else:
         raise ValueError(f"Unsupported local browser: {browser_name}")
 
 
+def _edge_options(is_headless, user_data_dir):
+    options = EdgeOptions()
+
+    # Critical flags for Jenkins/Windows service context
+    # These prevent Edge from crashing when run as a service
+    options.add_argument('--no-sandbox')
+    options.add_argument('--disable-dev-shm-usage')
+    options.add_argument('--disable-gpu')
+    options.add_argument('--disable-extensions')
+    options.add_argument('--disable-software-rasterizer')
+    options.add_argument('--disable-background-networking')
+    options.add_argument('--disable-default-apps')
+    options.add_argument('--disable-sync')
+    options.add_argument('--disable-translate')
+    options.add_argument('--metrics-recording-only')
+    options.add_argument('--mute-audio')
+    options.add_argument('--no-first-run')
+    options.add_argument('--safebrowsing-disable-auto-update')
+    options.add_argument('--disable-blink-features=AutomationControlled')
+
+    # Fix for DevToolsActivePort error in Windows service context.
+    # Port 0: Edge binds a free port itself, so parallel sessions cannot collide
+    options.add_argument('--remote-debugging-port=0')
+    options.add_argument('--disable-features=msSmartScreenProtection')
+
+    # Private user data directory per session to avoid profile access issues
+    options.add_argument(f'--user-data-dir={user_data_dir}')
+    options.add_argument('--profile-directory=Default')
+
+    if is_headless:
+        options.add_argument('--headless=new')
+        options.add_argument('--window-size=1920,1080')
+    else:
+        # For local runs, maximize window for better visibility
+        options.add_argument('--start-maximized')
+    if is_resource_blocking_enabled():
+        options.set_capability(*logging_capability('edge'))
+    options.page_load_strategy = page_load_strategy()
+    return options
+
+
+def _start_edge(options):
+    # Check if EDGE_DRIVER_PATH is set in the environment
+    edge_driver_path = os.environ.get("EDGE_DRIVER_PATH")
+    if edge_driver_path:
+        # Use the specified driver path
+        service = EdgeService(executable_path=edge_driver_path)
+        return webdriver.Edge(service=service, options=options)
+    # Let Selenium Manager handle the driver
+    return webdriver.Edge(options=options)
+
+
+def _initialise_edge_template(path):
+    # One headless launch does Edge's first-run work; later sessions copy the result
+    options = _edge_options(True, path)
+    _start_edge(options).quit()
+
+
+def _local_edge(is_headless):
+    template = None
+    if edge_profiles.is_profile_template_enabled():
+        template = edge_profiles.ensure_template(_initialise_edge_template)
+    profile = edge_profiles.new_profile(template)
+    try:
+        driver = _start_edge(_edge_options(is_headless, profile))
+    except Exception:
+        edge_profiles.remove_profile(profile)
+        raise
+    # for DevTools clients that attach to this browser
+    driver.debug_port = edge_profiles.debug_port(profile)
+    return edge_profiles.remove_profile_on_quit(driver, profile)
+
+
 def _remote_driver(browser_name, remote_url, capabilities_overrides=None):
-    caps = None
     if browser_name == "chrome":
-        caps = DesiredCapabilities.CHROME.copy()
+        options = ChromeOptions()
     elif browser_name == "firefox":
-        caps = DesiredCapabilities.FIREFOX.copy()
+        options = FirefoxOptions()
     elif browser_name == "edge":
-        caps = DesiredCapabilities.EDGE.copy()
+        options = EdgeOptions()
     else:
         raise ValueError(f"Unsupported remote browser: {browser_name}")
 
-    if capabilities_overrides:
-        caps.update(capabilities_overrides)
+    # Selenium 4 takes capabilities through options only (a dict as the second
+    # positional argument would be `keep_alive`, and the grid would never see it)
+    options.page_load_strategy = page_load_strategy()
+    for name, value in (capabilities_overrides or {}).items():
+        options.set_capability(name, value)
+
+    return webdriver.Remote(command_executor=remote_url, options=options)
 
-    # Use positional args for Remote to avoid static analysis warning about keyword names
-    return webdriver.Remote(remote_url, caps)
+
+def _install_readiness_tracker(driver):
+    if page_load_strategy() != 'normal' and hasattr(driver, 'execute_cdp_cmd'):
+        # Count fetch/XHR from the first request of every page for the readiness detector
+        driver.execute_cdp_cmd('Page.addScriptToEvaluateOnNewDocument', {'source': READINESS_TRACKER_SCRIPT})
+
+
+def prepare_tab(driver):
+    """Repeat the per-tab DevTools setup of get_driver (block list, readiness tracker) in the current tab."""
+    blocker = get_blocker(driver)
+    if blocker is not None:
+        blocker.apply(blocker.patterns)
+    _install_readiness_tracker(driver)
 
 
 def get_driver(browser: str = "chrome", remote_url: str | None = None, capabilities_overrides: dict | None = None):
@@ -104,6 +168,13 @@ def get_driver(browser: str = "chrome", remote_url: str | None = None, capabilit
     - If `remote_url` is provided (or environment variable SELENIUM_REMOTE_URL is set), a Remote WebDriver is created.
     - Otherwise a local WebDriver is created.
 
+    - Every command the driver sends is timed (see utils/command_metrics.py) unless
+      COMMAND_METRICS=false.
+    - PAGE_LOAD_STRATEGY=eager|none returns from driver.get before subresources finish;
+      BasePage.wait_for_page_load then waits for the page object's readiness detector.
+    - With BLOCK_RESOURCES=true, local Chrome/Edge drivers block images, trackers and
+      chat widgets (see utils/resource_blocking.py).
+
     Args:
         browser: "chrome" | "firefox" | "edge"
         remote_url: selenium hub/grid URL (optional)
@@ -115,6 +186,12 @@ def get_driver(browser: str = "chrome", remote_url: str | None = None, capabilit
         remote_url = env_remote
 
     if remote_url:
-        return _remote_driver(browser, remote_url, capabilities_overrides)
+        driver = _remote_driver(browser, remote_url, capabilities_overrides)
     else:
-        return _local_driver(browser)
+        driver = _local_driver(browser)
+        if is_resource_blocking_enabled() and hasattr(driver, 'execute_cdp_cmd'):
+            install_blocker(driver)
+        _install_readiness_tracker(driver)
+    if is_command_metrics_enabled():
+        instrument_driver(driver)
+    return driver
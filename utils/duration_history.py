@@ -0,0 +1,91 @@
+"""
+Per-test duration history.
+
+conftest.py sums the setup/call/teardown time of every test and merges it
+into DURATION_HISTORY_FILE (default .test_durations.json) at the end of `-n N`
+runs (or any run with RECORD_DURATIONS=true). utils/lpt_scheduler.py reads it to hand the longest tests out first.
+
+- Known tests use a smoothed average of their past durations.
+- Tests never seen before are estimated from the other tests of the same
+  file, then from the median of all known tests, then DEFAULT_ESTIMATE.
+"""
+import json
+import os
+import statistics
+
+from utils.file_lock import file_lock
+
+DEFAULT_PATH = '.test_durations.json'
+DEFAULT_ESTIMATE = 1.0
+
+# Weight of the newest measurement; smooths out one-off slow runs
+SMOOTHING = 0.5
+
+
+def is_duration_scheduling_enabled():
+    """DURATION_SCHEDULING=false keeps xdist's stock `--dist load` scheduler."""
+    return os.environ.get('DURATION_SCHEDULING', 'true').lower() == 'true'
+
+
+def is_duration_recording_enabled(numprocesses=None):
+    """
+    Write the history only for parallel runs (`-n N`) or with RECORD_DURATIONS=true,
+    so local and unit-test runs leave .test_durations.json alone.
+    """
+    return bool(numprocesses) or os.environ.get('RECORD_DURATIONS', 'false').lower() == 'true'
+
+
+def history_path():
+    return os.environ.get('DURATION_HISTORY_FILE', DEFAULT_PATH)
+
+
+def load_history(path=None):
+    """Return {nodeid: seconds}; empty when there is no (readable) history yet."""
+    path = path or history_path()
+    try:
+        with open(path, encoding='utf-8') as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return {k: float(v) for k, v in data.items() if isinstance(v, (int, float))}
+
+
+def update_history(measured, path=None):
+    """Merge {nodeid: seconds} from this run into the history file."""
+    if not measured:
+        return
+    path = path or history_path()
+    with file_lock(path):
+        history = load_history(path)
+        for nodeid, seconds in measured.items():
+            previous = history.get(nodeid)
+            history[nodeid] = seconds if previous is None else SMOOTHING * seconds + (1 - SMOOTHING) * previous
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump({k: round(v, 3) for k, v in sorted(history.items())}, f, indent=2)
+        os.replace(tmp, path)
+
+
+def estimate(nodeids, history):
+    """Return the expected duration in seconds of each of `nodeids`."""
+    by_file = {}
+    for nodeid, seconds in history.items():
+        by_file.setdefault(nodeid.split('::', 1)[0], []).append(seconds)
+    fallback = statistics.median(history.values()) if history else DEFAULT_ESTIMATE
+    estimates = []
+    for nodeid in nodeids:
+        if nodeid in history:
+            estimates.append(history[nodeid])
+            continue
+        same_file = by_file.get(nodeid.split('::', 1)[0])
+        estimates.append(statistics.fmean(same_file) if same_file else fallback)
+    return estimates
+
+
+def longest_first(nodeids, history):
+    """Indices of `nodeids` ordered by expected duration, longest first (ties keep collection order)."""
+    estimates = estimate(nodeids, history)
+    return sorted(range(len(nodeids)), key=lambda i: -estimates[i])
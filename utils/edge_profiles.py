@@ -0,0 +1,148 @@
+"""
+Parallel-safe Edge profiles and debugging ports.
+
+Edge used to be launched with a fixed --remote-debugging-port=9222 and a new,
+never-deleted tempfile.mkdtemp() profile, so concurrent sessions under
+`pytest -n auto` fought over the port and long-running agents filled up.
+
+- Edge is started with --remote-debugging-port=0 and picks a free port
+  itself (no window for another process to take it between choosing and
+  binding); debug_port() reads it back from the profile's DevToolsActivePort.
+- A profile template is initialised once per machine (first-run work done by
+  a throw-away Edge launch) under EDGE_PROFILE_TEMPLATE_DIR; xdist workers
+  share it through a file lock. Each session gets its own copy of it.
+  A failed build is not retried for the rest of the test run (this process,
+  and the other xdist workers of the same run).
+- Per-session copies are deleted when the driver quits, and any left over
+  are removed at interpreter exit.
+- EDGE_PROFILE_TEMPLATE=false skips the template and starts from an empty profile.
+"""
+import atexit
+import os
+import shutil
+import tempfile
+import threading
+
+from utils.file_lock import file_lock
+
+PROFILE_PREFIX = 'edge_profile_'
+
+# Written into the template once it has been initialised; bump to rebuild old templates
+_TEMPLATE_MARKER = '.template_ready_v1'
+
+# Files Edge holds open or that pin a profile to the process that created it
+_SKIP_ON_COPY = ('SingletonLock', 'SingletonSocket', 'SingletonCookie', 'lockfile', 'DevToolsActivePort',
+                 'Cache', 'Code Cache', 'GPUCache', 'Crashpad')
+
+_live_profiles = set()
+_live_lock = threading.Lock()
+
+# Template paths whose build failed in this process
+_failed_templates = set()
+
+
+def is_profile_template_enabled():
+    return os.environ.get('EDGE_PROFILE_TEMPLATE', 'true').lower() == 'true'
+
+
+def template_dir():
+    return os.environ.get('EDGE_PROFILE_TEMPLATE_DIR') or os.path.join(tempfile.gettempdir(), 'edge_profile_template')
+
+
+def _run_id():
+    # Shared by the xdist workers of one run; a plain run only has this process
+    return os.environ.get('PYTEST_XDIST_TESTRUNUID') or f"pid-{os.getpid()}"
+
+
+def _failed_this_run(path):
+    if path in _failed_templates:
+        return True
+    try:
+        with open(f"{path}.failed", encoding='utf-8') as f:
+            return f.read() == _run_id()
+    except OSError:
+        return False
+
+
+def debug_port(profile):
+    """Remote-debugging port Edge chose for `profile` (launched with port 0), or None if unknown."""
+    try:
+        with open(os.path.join(profile, 'DevToolsActivePort'), encoding='utf-8') as f:
+            return int(f.readline().strip())
+    except (OSError, ValueError):
+        return None
+
+
+def ensure_template(initialise, path=None, timeout=120):
+    """
+    Return the template profile directory, creating it with `initialise(path)` if needed.
+
+    `initialise` must launch Edge on the directory and quit it, leaving the
+    first-run state behind. Only one process builds the template; the others
+    wait on the lock and reuse the result. Returns None if building fails, and
+    keeps returning None for the rest of the run instead of building again.
+    """
+    path = path or template_dir()
+    marker = os.path.join(path, _TEMPLATE_MARKER)
+    if os.path.exists(marker):
+        return path
+    if _failed_this_run(path):
+        return None
+    with file_lock(path, timeout=timeout):
+        if os.path.exists(marker):
+            return path
+        if _failed_this_run(path):
+            return None
+        shutil.rmtree(path, ignore_errors=True)
+        os.makedirs(path, exist_ok=True)
+        try:
+            initialise(path)
+        except Exception:
+            shutil.rmtree(path, ignore_errors=True)
+            _failed_templates.add(path)
+            with open(f"{path}.failed", 'w', encoding='utf-8') as f:
+                f.write(_run_id())
+            return None
+        with open(marker, 'w') as f:
+            f.write(str(os.getpid()))
+    return path
+
+
+def new_profile(template=None):
+    """Create a private profile directory, copied from `template` when given."""
+    profile = tempfile.mkdtemp(prefix=PROFILE_PREFIX)
+    if template:
+        shutil.copytree(template, profile, dirs_exist_ok=True,
+                        ignore=shutil.ignore_patterns(_TEMPLATE_MARKER, *_SKIP_ON_COPY))
+    with _live_lock:
+        _live_profiles.add(profile)
+    return profile
+
+
+def remove_profile(profile):
+    with _live_lock:
+        _live_profiles.discard(profile)
+    shutil.rmtree(profile, ignore_errors=True)
+
+
+def remove_profile_on_quit(driver, profile):
+    """Make `driver.quit()` also delete `profile` once the browser has exited."""
+    quit_driver = driver.quit
+
+    def quit_and_clean():
+        try:
+            quit_driver()
+        finally:
+            remove_profile(profile)
+
+    driver.quit = quit_and_clean
+    return driver
+
+
+@atexit.register
+def cleanup_profiles():
+    """Delete every profile this process created that is still on disk."""
+    with _live_lock:
+        profiles = list(_live_profiles)
+    for profile in profiles:
+        remove_profile(profile)
@@ -0,0 +1,145 @@
+"""
+Failure evidence captured off the test's hot path.
+
+On a failed test conftest.py calls FailureArtifacts.capture(), which only
+does the WebDriver round trips: screenshot, DOM + URL in one script, and the
+browser console (Chromium). Decoding, hashing, re-encoding and gzip run on a
+background thread while the driver fixture tears down; the results are
+attached to Allure at the end of the test's teardown.
+
+- Identical screenshots (e.g. every test hitting the same outage page) are
+  attached once; later tests get a reference to the first one.
+- Screenshots are re-encoded as JPEG when Pillow is installed (PNG otherwise),
+  the DOM is attached gzipped.
+- FAILURE_ARTIFACT_BUDGET_MB (default 200, per pytest process) caps the
+  attached bytes; past it only the URL, console log and hashes are kept.
+- FAILURE_ARTIFACTS=false restores the old synchronous PNG screenshot.
+"""
+import base64
+import gzip
+import hashlib
+import io
+import json
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+DEFAULT_BUDGET_MB = 200
+JPEG_QUALITY = 60
+
+# Keep the tail of long console logs; the last messages explain the failure
+MAX_CONSOLE_ENTRIES = 200
+
+_DOM_AND_URL_SCRIPT = "return [location.href, document.documentElement ? document.documentElement.outerHTML : ''];"
+
+
+def is_failure_artifacts_enabled():
+    return os.environ.get('FAILURE_ARTIFACTS', 'true').lower() == 'true'
+
+
+def _budget_from_env():
+    try:
+        return int(float(os.environ.get('FAILURE_ARTIFACT_BUDGET_MB', DEFAULT_BUDGET_MB)) * 1024 * 1024)
+    except ValueError:
+        return DEFAULT_BUDGET_MB * 1024 * 1024
+
+
+def _to_jpeg(png):
+    try:
+        from PIL import Image
+    except ImportError:
+        return None
+    try:
+        with Image.open(io.BytesIO(png)) as image:
+            out = io.BytesIO()
+            image.convert('RGB').save(out, format='JPEG', quality=JPEG_QUALITY, optimize=True)
+            return out.getvalue()
+    except Exception:
+        return None
+
+
+def grab(driver):
+    """The WebDriver round trips; everything else happens on the background thread."""
+    raw = {'url': '', 'screenshot': None, 'dom': None, 'console': None}
+    try:
+        raw['screenshot'] = driver.get_screenshot_as_base64()
+    except Exception:
+        pass
+    try:
+        raw['url'], raw['dom'] = driver.execute_script(_DOM_AND_URL_SCRIPT)
+    except Exception:
+        try:
+            raw['url'] = driver.current_url
+        except Exception:
+            pass
+    try:
+        raw['console'] = driver.get_log('browser')
+    except Exception:
+        # Firefox and some remote drivers have no log endpoint
+        pass
+    return raw
+
+
+class FailureArtifacts:
+    """Encodes captured failure evidence on one background thread, within a byte budget."""
+
+    def __init__(self, budget_bytes=None):
+        self.budget_bytes = _budget_from_env() if budget_bytes is None else budget_bytes
+        self.used_bytes = 0
+        self._screenshots = {}
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='failure-artifacts')
+
+    def capture(self, driver, nodeid):
+        """Grab evidence from `driver` now; returns a Future of [(name, body, extension)]."""
+        raw = grab(driver)
+        return self._executor.submit(self.encode, nodeid, raw)
+
+    def _reserve(self, size):
+        with self._lock:
+            if self.used_bytes + size > self.budget_bytes:
+                return False
+            self.used_bytes += size
+            return True
+
+    def encode(self, nodeid, raw):
+        attachments = []
+        summary = {'url': raw.get('url', '')}
+
+        if raw.get('screenshot'):
+            png = base64.b64decode(raw['screenshot'])
+            digest = hashlib.sha256(png).hexdigest()
+            summary['screenshot_sha256'] = digest
+            with self._lock:
+                first = self._screenshots.get(digest)
+            if first is not None:
+                summary['screenshot'] = f"identical to the screenshot of {first}"
+            else:
+                jpeg = _to_jpeg(png)
+                body, extension = (jpeg, 'jpg') if jpeg and len(jpeg) < len(png) else (png, 'png')
+                if self._reserve(len(body)):
+                    # only a screenshot that was attached can stand in for later identical ones
+                    with self._lock:
+                        self._screenshots.setdefault(digest, nodeid)
+                    attachments.append(('screenshot', body, extension))
+                else:
+                    summary['screenshot'] = 'skipped: artifact budget exhausted'
+
+        if raw.get('dom'):
+            dom = gzip.compress(raw['dom'].encode('utf-8'), compresslevel=6)
+            summary['dom_bytes'] = len(raw['dom'])
+            if self._reserve(len(dom)):
+                attachments.append(('dom.html.gz', dom, 'html.gz'))
+            else:
+                summary['dom'] = 'skipped: artifact budget exhausted'
+
+        if raw.get('console'):
+            console = [f"{e.get('level', '')} {e.get('message', '')}" for e in raw['console'][-MAX_CONSOLE_ENTRIES:]]
+            attachments.append(('browser console', '\n'.join(console).encode('utf-8'), 'txt'))
+
+        summary['budget_used_bytes'] = self.used_bytes
+        attachments.insert(0, ('failure context', json.dumps(summary, indent=2).encode('utf-8'), 'json'))
+        return attachments
+
+    def shutdown(self):
+        self._executor.shutdown(wait=True)
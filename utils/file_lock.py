@@ -0,0 +1,118 @@
+"""
+Cross-process file lock.
+
+Used by the on-disk stores that several pytest-xdist workers share (session
+cache, account pool, ...). Works on Windows and Linux without extra packages:
+the lock is a sidecar `<path>.lock` file created with O_EXCL, holding the
+`host:pid` of its owner.
+"""
+import os
+import socket
+import time
+from contextlib import contextmanager
+
+# A lock older than this is assumed to be left behind by a crashed process
+DEFAULT_STALE_AFTER = 600
+
+# A takeover guard is held for two stat calls and a remove; older ones were left by a crash
+_BREAK_GUARD_STALE = 10
+
+
+def _owner_is_gone(lock_path):
+    """True when the lock was taken by a process on this machine that no longer exists."""
+    if os.name == 'nt':
+        # os.kill(pid, 0) terminates the process on Windows; rely on the lock's age there
+        return False
+    try:
+        with open(lock_path, encoding='utf-8') as f:
+            host, pid = f.read().rsplit(':', 1)
+        pid = int(pid)
+    except (OSError, ValueError):
+        # not written yet, or written by an older version
+        return False
+    if host != socket.gethostname():
+        return False
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return True
+    except OSError:
+        # exists but belongs to another user
+        return False
+    return False
+
+
+def _is_stale(lock_path, stale_after):
+    return time.time() - os.path.getmtime(lock_path) > stale_after or _owner_is_gone(lock_path)
+
+
+def _break_stale_lock(lock_path, stale_after):
+    """
+    Remove `lock_path` if it is (still) stale. Returns True if the caller should retry at once.
+
+    Checking and removing are two steps, so two waiters could both find the lock
+    stale and the slower one would then delete the lock the faster one had just
+    created. Takeovers are therefore serialised on a `<lock>.break` guard and the
+    lock is checked again while holding it.
+    """
+    guard = f"{lock_path}.break"
+    try:
+        fd = os.open(guard, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+    except FileExistsError:
+        try:
+            if time.time() - os.path.getmtime(guard) > _BREAK_GUARD_STALE:
+                os.remove(guard)
+        except OSError:
+            pass
+        return False
+    try:
+        if _is_stale(lock_path, stale_after):
+            os.remove(lock_path)
+        return True
+    except OSError:
+        # released in the meantime
+        return True
+    finally:
+        os.close(fd)
+        os.remove(guard)
+
+
+@contextmanager
+def file_lock(path, timeout=30, poll=0.05, stale_after=DEFAULT_STALE_AFTER):
+    """
+    Hold an exclusive lock on `path` for the duration of the `with` block.
+
+    Raises TimeoutError if the lock cannot be taken within `timeout` seconds.
+    A lock is only taken over when its owner process is gone (same machine) or
+    it is older than `stale_after` seconds, so a holder that works longer than
+    other processes' `timeout` keeps its lock. Of several waiters that find
+    the same stale lock, only one takes it over.
+    """
+    lock_path = f"{path}.lock"
+    directory = os.path.dirname(lock_path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            fd = os.open(lock_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+            break
+        except FileExistsError:
+            try:
+                if _is_stale(lock_path, stale_after) and _break_stale_lock(lock_path, stale_after):
+                    continue
+            except OSError:
+                # Lock released between the checks; retry immediately
+                continue
+            if time.monotonic() > deadline:
+                raise TimeoutError(f"Could not acquire lock on {path} within {timeout}s")
+            time.sleep(poll)
+    try:
+        os.write(fd, f"{socket.gethostname()}:{os.getpid()}".encode())
+        yield
+    finally:
+        os.close(fd)
+        try:
+            os.remove(lock_path)
+        except OSError:
+            pass
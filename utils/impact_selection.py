@@ -0,0 +1,203 @@
+"""
+Test impact selection.
+
+Builds the dependency graph of the repository from the source alone (no
+imports are executed, so it runs before `pip install`):
+
+- Python imports between tests/, page_objects/, utils/, data/ and conftest.py
+- data files referenced as string literals, e.g. get_data("data/...csv")
+  paths, data_rows and data_combinations markers
+- every conftest.py applies to the tests below it
+- DYNAMIC_IMPORTS: modules that import a whole package at runtime
+  (importlib), which the import statements alone do not show
+
+Given the files changed in a git diff it returns the test files that
+(transitively) depend on any of them. A change to requirements.txt or
+pytest.ini, or to a Python file that no longer exists, selects every test.
+
+CLI (prints one test path per line, nothing when no test is affected):
+    python -m utils.impact_selection --base origin/main
+    python -m utils.impact_selection --base HEAD~1 --explain
+    python -m utils.impact_selection --files page_objects/base_page.py
+"""
+import argparse
+import ast
+import os
+import subprocess
+import sys
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+DATA_EXTENSIONS = ('.csv', '.xlsx', '.xls', '.json')
+
+# Changes to these run the whole suite
+RUN_ALL_FILES = ('requirements.txt', 'pytest.ini', 'setup.cfg', 'tox.ini', 'pyproject.toml')
+
+# file -> packages whose every module it imports at runtime
+DYNAMIC_IMPORTS = {
+    'utils/locator_profiler.py': ('page_objects',),  # collect_locators()
+}
+
+_SKIP_DIRS = {'.git', '__pycache__', '.venv', 'venv', '.pytest_cache', 'reports', '.session_cache', '.keyword_cache'}
+
+
+def _rel(path, root):
+    return os.path.relpath(path, root).replace(os.sep, '/')
+
+
+def _python_files(root):
+    for directory, dirs, files in os.walk(root):
+        dirs[:] = [d for d in dirs if d not in _SKIP_DIRS and not d.startswith('.')]
+        for name in files:
+            if name.endswith('.py'):
+                yield _rel(os.path.join(directory, name), root)
+
+
+def is_test_file(path):
+    name = path.rsplit('/', 1)[-1]
+    return path.startswith('tests/') and name.endswith('.py') and (name.startswith('test_') or name.endswith('_test.py'))
+
+
+def _module_file(module, root):
+    """Repo-relative file for dotted `module`, or None if it is not part of the repo."""
+    base = module.replace('.', '/')
+    for candidate in (f"{base}.py", f"{base}/__init__.py"):
+        if os.path.isfile(os.path.join(root, candidate)):
+            return candidate
+    return None
+
+
+def _package_inits(module, root):
+    """__init__.py of every package on the way to `module` (importing a.b runs a/__init__.py)."""
+    parts = module.split('.')
+    inits = []
+    for i in range(1, len(parts)):
+        init = '/'.join(parts[:i]) + '/__init__.py'
+        if os.path.isfile(os.path.join(root, init)):
+            inits.append(init)
+    return inits
+
+
+def _imported_modules(tree, path):
+    package = path.rsplit('/', 1)[0].replace('/', '.') if '/' in path else ''
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            for alias in node.names:
+                yield alias.name
+        elif isinstance(node, ast.ImportFrom):
+            if node.level:
+                parts = package.split('.') if package else []
+                parts = parts[:len(parts) - (node.level - 1)]
+                base = '.'.join(parts + ([node.module] if node.module else []))
+            else:
+                base = node.module or ''
+            if base:
+                yield base
+            for alias in node.names:
+                # `from pkg import module` imports a submodule, not just a name
+                yield f"{base}.{alias.name}" if base else alias.name
+
+
+def _data_references(tree, path, root):
+    directory = os.path.dirname(os.path.join(root, path))
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Constant) and isinstance(node.value, str) \
+                and node.value.lower().endswith(DATA_EXTENSIONS) and '\n' not in node.value:
+            for base in (root, directory):
+                candidate = os.path.normpath(os.path.join(base, node.value))
+                if os.path.isfile(candidate):
+                    yield _rel(candidate, root)
+                    break
+
+
+def build_graph(root=REPO_ROOT):
+    """Return {file: set(files it depends on directly)} for every Python file in the repo."""
+    graph = {}
+    for path in _python_files(root):
+        deps = set()
+        try:
+            with open(os.path.join(root, path), encoding='utf-8') as f:
+                tree = ast.parse(f.read(), filename=path)
+        except (OSError, SyntaxError, ValueError):
+            graph[path] = deps
+            continue
+        for module in _imported_modules(tree, path):
+            target = _module_file(module, root)
+            if target:
+                deps.add(target)
+                deps.update(_package_inits(module, root))
+        deps.update(_data_references(tree, path, root))
+        for package in DYNAMIC_IMPORTS.get(path, ()):
+            deps.update(f"{package}/{p}" for p in _python_files(os.path.join(root, package)))
+        if is_test_file(path):
+            # conftest.py files from the repo root down to the test's directory
+            parts = path.split('/')[:-1]
+            for i in range(len(parts) + 1):
+                conftest = '/'.join(parts[:i] + ['conftest.py'])
+                if os.path.isfile(os.path.join(root, conftest)):
+                    deps.add(conftest)
+        deps.discard(path)
+        graph[path] = deps
+    return graph
+
+
+def _closure(path, graph, memo):
+    if path in memo:
+        return memo[path]
+    memo[path] = set()  # breaks import cycles
+    seen = set(graph.get(path, ()))
+    for dep in list(seen):
+        seen |= _closure(dep, graph, memo)
+    memo[path] = seen
+    return seen
+
+
+def affected_tests(changed, root=REPO_ROOT, graph=None):
+    """
+    Return {test file: sorted changed files that reach it} for the changed paths.
+
+    Paths are repo-relative with forward slashes, as printed by `git diff --name-only`.
+    """
+    graph = build_graph(root) if graph is None else graph
+    tests = sorted(p for p in graph if is_test_file(p))
+    changed = {c.replace('\\', '/') for c in changed}
+    run_all = {c for c in changed if c.rsplit('/', 1)[-1] in RUN_ALL_FILES}
+    # A deleted module breaks whoever imported it; we can no longer tell who that was
+    run_all |= {c for c in changed if c.endswith('.py') and not os.path.exists(os.path.join(root, c))
+                and not is_test_file(c)}
+    memo = {}
+    selected = {}
+    for test in tests:
+        reasons = set(run_all)
+        if test in changed:
+            reasons.add(test)
+        reasons |= changed & _closure(test, graph, memo)
+        if reasons:
+            selected[test] = sorted(reasons)
+    return selected
+
+
+def changed_files(base, head='HEAD', root=REPO_ROOT):
+    """Files changed between `base` and `head` (merge-base diff, like a pull request)."""
+    output = subprocess.run(['git', 'diff', '--name-only', f"{base}...{head}"], cwd=root,
+                            check=True, capture_output=True, text=True).stdout
+    return [line.strip() for line in output.splitlines() if line.strip()]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Print the test files affected by a change.")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument('--base', help="git revision to diff against (e.g. origin/main, HEAD~1)")
+    source.add_argument('--files', nargs='+', help="changed files, instead of asking git")
+    parser.add_argument('--head', default='HEAD')
+    parser.add_argument('--explain', action='store_true', help="also show which changed files select each test")
+    args = parser.parse_args(argv)
+
+    changed = args.files if args.files else changed_files(args.base, args.head)
+    for test, reasons in sorted(affected_tests(changed).items()):
+        print(f"{test}  <- {', '.join(reasons)}" if args.explain else test)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,12 +1,18 @@
 import csv
+import hashlib
+import json
+import os
 import time
-from typing import List, Dict
+from typing import List, Dict, NamedTuple, Optional, Tuple, Union
 
 from selenium.webdriver.common.by import By
 
 # Minimal keyword-driven runner. Steps CSV should contain columns:
 # action, locator_type, locator, value
 # Supported actions: open_url, click, enter_text, assert_text, sleep
+#
+# Steps are compiled into an immutable KeywordPlan before anything runs, so a
+# typo in row 500 is reported before the browser starts, not after it.
 
 LOCATOR_MAP = {
     'id': By.ID,
@@ -17,6 +23,33 @@ LOCATOR_MAP = {
     'name': By.NAME,
 }
 
+LOCATOR_ACTIONS = ('click', 'enter_text', 'assert_text')
+SUPPORTED_ACTIONS = ('open_url', 'sleep') + LOCATOR_ACTIONS
+
+# Bump when the on-disk plan format changes so stale cache entries are ignored
+PLAN_CACHE_VERSION = 1
+
+
+class KeywordStep(NamedTuple):
+    line: int
+    action: str
+    by: Optional[str]
+    locator: Optional[str]
+    value: Union[str, float]
+
+
+class KeywordPlan(NamedTuple):
+    steps: Tuple[KeywordStep, ...]
+    source_hash: str = ''
+
+
+class KeywordPlanError(ValueError):
+    """Raised by compile_keywords with every problem found in the steps."""
+
+    def __init__(self, errors: List[str]):
+        self.errors = errors
+        super().__init__("Invalid keyword steps:\n" + "\n".join(errors))
+
 
 def load_keywords(path: str) -> List[Dict[str, str]]:
     with open(path, newline='') as csvfile:
@@ -24,32 +57,104 @@ def load_keywords(path: str) -> List[Dict[str, str]]:
         return [row for row in reader]
 
 
-def run_keywords(driver, steps: List[Dict[str, str]]):
-    for step in steps:
-        action = (step.get('action') or '').strip()
-        locator_type = (step.get('locator_type') or '').strip()
-        locator = (step.get('locator') or '').strip()
-        value = step.get('value') or ''
-
-        if action == 'open_url':
-            driver.get(value)
-        elif action == 'sleep':
-            time.sleep(float(value) if value else 1)
-        elif action in ('click', 'enter_text', 'assert_text'):
-            if not locator_type or not locator:
-                raise ValueError(f"Missing locator for action {action}: {step}")
-            by = LOCATOR_MAP.get(locator_type.lower())
-            if not by:
-                raise ValueError(f"Unsupported locator type: {locator_type}")
-            if action == 'click':
-                driver.find_element(by, locator).click()
-            elif action == 'enter_text':
-                elem = driver.find_element(by, locator)
-                elem.clear()
-                elem.send_keys(value)
-            elif action == 'assert_text':
-                elem = driver.find_element(by, locator)
-                assert value in elem.text, f"Expected '{value}' in element text '{elem.text}'"
-        else:
-            raise ValueError(f"Unsupported action: {action}")
+def _compile_step(line: int, step: Dict[str, str]) -> KeywordStep:
+    action = (step.get('action') or '').strip()
+    locator_type = (step.get('locator_type') or '').strip()
+    locator = (step.get('locator') or '').strip()
+    value = step.get('value') or ''
+
+    if action == 'open_url':
+        if not value.strip():
+            raise ValueError(f"Missing URL for action {action}: {step}")
+        return KeywordStep(line, action, None, None, value.strip())
+    if action == 'sleep':
+        try:
+            seconds = float(value) if value else 1.0
+        except ValueError:
+            raise ValueError(f"Invalid sleep seconds '{value}': {step}")
+        return KeywordStep(line, action, None, None, seconds)
+    if action in LOCATOR_ACTIONS:
+        if not locator_type or not locator:
+            raise ValueError(f"Missing locator for action {action}: {step}")
+        by = LOCATOR_MAP.get(locator_type.lower())
+        if not by:
+            raise ValueError(f"Unsupported locator type: {locator_type}")
+        return KeywordStep(line, action, by, locator, value)
+    raise ValueError(f"Unsupported action: {action}")
+
+
+def compile_keywords(steps: List[Dict[str, str]], source_hash: str = '') -> KeywordPlan:
+    """
+    Validate raw step rows and turn them into a KeywordPlan.
+
+    All rows are checked; a KeywordPlanError listing every bad row (by CSV
+    line number) is raised if any of them is invalid.
+    """
+    compiled = []
+    errors = []
+    # line 1 of the CSV is the header
+    for line, step in enumerate(steps, start=2):
+        try:
+            compiled.append(_compile_step(line, step))
+        except ValueError as e:
+            errors.append(f"line {line}: {e}")
+    if errors:
+        raise KeywordPlanError(errors)
+    return KeywordPlan(tuple(compiled), source_hash)
+
+
+def load_plan(path: str, cache_dir: Optional[str] = None) -> KeywordPlan:
+    """
+    Load and compile a keyword CSV, reusing a compiled plan cached on disk.
+
+    Plans are cached by the SHA-256 of the CSV content in `cache_dir`
+    (default: KEYWORD_PLAN_CACHE env var or `.keyword_cache`). Pass
+    cache_dir='' to disable the cache.
+    """
+    with open(path, 'rb') as f:
+        source_hash = hashlib.sha256(f.read()).hexdigest()
+    if cache_dir is None:
+        cache_dir = os.environ.get('KEYWORD_PLAN_CACHE', '.keyword_cache')
+    cache_path = os.path.join(cache_dir, f"{source_hash}.json") if cache_dir else None
+
+    if cache_path and os.path.exists(cache_path):
+        try:
+            with open(cache_path, encoding='utf-8') as f:
+                cached = json.load(f)
+            if cached.get('version') == PLAN_CACHE_VERSION:
+                return KeywordPlan(tuple(KeywordStep(*s) for s in cached['steps']), source_hash)
+        except (OSError, ValueError, TypeError, KeyError):
+            # Corrupt entry: fall through and rebuild it
+            pass
+
+    plan = compile_keywords(load_keywords(path), source_hash)
+    if cache_path:
+        os.makedirs(cache_dir, exist_ok=True)
+        tmp = f"{cache_path}.{os.getpid()}.tmp"
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump({'version': PLAN_CACHE_VERSION, 'steps': [list(s) for s in plan.steps]}, f)
+        os.replace(tmp, cache_path)
+    return plan
+
+
+def run_step(driver, step: KeywordStep):
+    if step.action == 'open_url':
+        driver.get(step.value)
+    elif step.action == 'sleep':
+        time.sleep(step.value)
+    elif step.action == 'click':
+        driver.find_element(step.by, step.locator).click()
+    elif step.action == 'enter_text':
+        elem = driver.find_element(step.by, step.locator)
+        elem.clear()
+        elem.send_keys(step.value)
+    elif step.action == 'assert_text':
+        elem = driver.find_element(step.by, step.locator)
+        assert step.value in elem.text, f"Expected '{step.value}' in element text '{elem.text}'"
+
 
+def run_keywords(driver, steps: Union[KeywordPlan, List[Dict[str, str]]]):
+    """Run a compiled plan, or raw step rows (compiled first, so bad rows fail before any browser work)."""
+    plan = steps if isinstance(steps, KeywordPlan) else compile_keywords(steps)
+    for step in plan.steps:
+        run_step(driver, step)
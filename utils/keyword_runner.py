@@ -0,0 +1,166 @@
+"""
+Parallel keyword-suite runner.
+
+Runs many keyword plans (one per CSV file, or one per data row of a
+parametrised CSV) concurrently on a bounded pool of browsers.
+
+- Each suite gets a driver from utils.driver_pool.DriverPool; the browser is
+  reset between suites and replaced after a failing one.
+- Results come back in input order with a timing per step.
+- Data-driven suites: `${column}` placeholders in the locator/value columns
+  are filled from each row of a data file loaded with get_data.
+
+CLI:
+    python -m utils.keyword_runner data/a.csv data/b.csv -n 4 --browser chrome
+    python -m utils.keyword_runner data/login_steps.csv --data data/Complete_Test_Data/login_data.csv -n 8
+"""
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from string import Template
+from typing import List, NamedTuple, Optional, Tuple
+
+from data.Complete_Test_Data.data_loader import get_data
+from utils.driver_pool import DriverPool
+from utils.keyword_engine import KeywordPlan, KeywordPlanError, load_plan, run_step
+
+
+class KeywordSuite(NamedTuple):
+    name: str
+    plan: KeywordPlan
+
+
+class StepTiming(NamedTuple):
+    line: int
+    action: str
+    seconds: float
+    passed: bool
+
+
+class SuiteResult(NamedTuple):
+    name: str
+    passed: bool
+    error: Optional[str]
+    duration: float
+    steps: Tuple[StepTiming, ...]
+
+
+def suites_from_files(paths: List[str]) -> List[KeywordSuite]:
+    """One suite per keyword CSV. All files are compiled before anything runs."""
+    suites = []
+    errors = []
+    for path in paths:
+        try:
+            suites.append(KeywordSuite(os.path.basename(path), load_plan(path)))
+        except KeywordPlanError as e:
+            errors.extend(f"{path} {err}" for err in e.errors)
+    if errors:
+        raise KeywordPlanError(errors)
+    return suites
+
+
+def suites_from_data(path: str, data_path: str) -> List[KeywordSuite]:
+    """One suite per row of `data_path`, with `${column}` placeholders in `path` filled from the row."""
+    plan = load_plan(path)
+    suites = []
+    for index, row in enumerate(get_data(data_path), start=1):
+        steps = tuple(
+            step._replace(
+                locator=Template(step.locator).safe_substitute(row) if step.locator else step.locator,
+                value=Template(step.value).safe_substitute(row) if isinstance(step.value, str) else step.value,
+            )
+            for step in plan.steps
+        )
+        suites.append(KeywordSuite(f"{os.path.basename(path)}[{index}]", KeywordPlan(steps, plan.source_hash)))
+    return suites
+
+
+def _run_suite(pool: DriverPool, suite: KeywordSuite, browser: str, remote_url: Optional[str]) -> SuiteResult:
+    start = time.perf_counter()
+    timings = []
+    error = None
+    driver = None
+    try:
+        driver = pool.acquire(browser, remote_url)
+        for step in suite.plan.steps:
+            step_start = time.perf_counter()
+            try:
+                run_step(driver, step)
+            except Exception as e:
+                timings.append(StepTiming(step.line, step.action, time.perf_counter() - step_start, False))
+                error = f"line {step.line} ({step.action}): {type(e).__name__}: {e}"
+                break
+            timings.append(StepTiming(step.line, step.action, time.perf_counter() - step_start, True))
+    except Exception as e:
+        # Browser could not be started
+        error = f"{type(e).__name__}: {e}"
+    finally:
+        if driver is not None:
+            pool.release(driver, discard=error is not None)
+    return SuiteResult(suite.name, error is None, error, time.perf_counter() - start, tuple(timings))
+
+
+def run_suites(suites: List[KeywordSuite], browser: str = "chrome", concurrency: int = 4,
+               remote_url: Optional[str] = None, pool: Optional[DriverPool] = None) -> List[SuiteResult]:
+    """
+    Run `suites` on at most `concurrency` browsers at once.
+
+    Results are returned in the same order as `suites`. A pool passed in by
+    the caller is left open; otherwise one is created and closed here.
+    """
+    own_pool = pool is None
+    pool = pool or DriverPool()
+    try:
+        with ThreadPoolExecutor(max_workers=max(1, concurrency), thread_name_prefix='keyword-suite') as executor:
+            futures = [executor.submit(_run_suite, pool, suite, browser, remote_url) for suite in suites]
+            return [f.result() for f in futures]
+    finally:
+        if own_pool:
+            pool.close()
+
+
+def format_timing_table(results: List[SuiteResult]) -> str:
+    """Per-step timing table followed by one summary line per suite."""
+    lines = [f"{'suite':<40} {'line':>5} {'action':<12} {'seconds':>9}  status"]
+    for result in results:
+        for step in result.steps:
+            status = 'ok' if step.passed else 'FAILED'
+            lines.append(f"{result.name:<40} {step.line:>5} {step.action:<12} {step.seconds:>9.3f}  {status}")
+    lines.append('')
+    for result in results:
+        status = 'PASSED' if result.passed else f"FAILED - {result.error}"
+        lines.append(f"{result.name:<40} {result.duration:>8.2f}s  {status}")
+    passed = sum(1 for r in results if r.passed)
+    lines.append(f"{passed}/{len(results)} suites passed")
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run keyword CSV suites in parallel browsers.")
+    parser.add_argument('paths', nargs='+', help="keyword CSV files")
+    parser.add_argument('--data', help="data file; runs the (single) keyword CSV once per row")
+    parser.add_argument('-n', '--concurrency', type=int, default=int(os.environ.get('KEYWORD_CONCURRENCY', 4)))
+    parser.add_argument('--browser', default=os.environ.get('BROWSER', 'chrome'))
+    parser.add_argument('--remote-url', default=os.environ.get('SELENIUM_REMOTE_URL'))
+    args = parser.parse_args(argv)
+
+    try:
+        if args.data:
+            if len(args.paths) != 1:
+                parser.error("--data takes exactly one keyword CSV")
+            suites = suites_from_data(args.paths[0], args.data)
+        else:
+            suites = suites_from_files(args.paths)
+    except KeywordPlanError as e:
+        print(e, file=sys.stderr)
+        return 2
+
+    results = run_suites(suites, args.browser, args.concurrency, args.remote_url)
+    print(format_timing_table(results))
+    return 0 if all(r.passed for r in results) else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
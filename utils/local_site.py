@@ -0,0 +1,512 @@
+"""
+Local stand-in for market99.com.
+
+A small in-process HTTP server that serves the pages the page objects use,
+with the same ids, classes and XPaths as the live store:
+
+- header nav (#NavStandard: account icon, search popdown, cart drawer)
+- /account/login, /account/register, /account, /account/logout
+- /account/addresses (list, add form #address_form_new, delete with confirm())
+- /search?q=..., /products/<handle> (quantity popout, add to cart, coupon)
+
+All state (customers, sessions, addresses, carts) is kept in memory, so every
+run starts from the same seed data and pages load at loopback speed. Started
+by the `base_url` fixture in conftest.py when LOCAL_SITE=true.
+"""
+import html
+import itertools
+import json
+import secrets
+import threading
+from http.cookies import SimpleCookie
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+SESSION_COOKIE = '_m99_session'
+CART_COOKIE = '_m99_cart'
+
+SEED_CUSTOMERS = {
+    # login_data.csv account
+    'prat.jai1@example.com': {'first_name': 'Prat', 'last_name': 'Jai', 'password': 'Pass@1234'},
+    # already registered: the duplicate-signup row in test_PRES-36 must fail
+    'prat.jai.test@example.com': {'first_name': 'Prat', 'last_name': 'Jai', 'password': 'Pass@1234'},
+}
+
+PRODUCTS = [
+    {'handle': 'steel-water-bottle', 'title': 'Steel Water Bottle 1L', 'price': '299'},
+    {'handle': 'insulated-bottle', 'title': 'Insulated Flask Bottle 500ml', 'price': '449'},
+    {'handle': 'herbal-soap-pack', 'title': 'Herbal Soap Pack of 4', 'price': '199'},
+    {'handle': 'glycerin-soap', 'title': 'Glycerin Soap Bar', 'price': '79'},
+    {'handle': 'storage-box', 'title': 'Plastic Storage Box', 'price': '249'},
+]
+
+PROVINCES = [
+    'Andhra Pradesh', 'Delhi', 'Gujarat', 'Karnataka', 'Kerala', 'Maharashtra',
+    'Rajasthan', 'Tamil Nadu', 'Telangana', 'Uttar Pradesh', 'West Bengal',
+]
+
+COUPON_CODE = 'M99SAVE10'
+
+ADDRESS_FIELDS = [
+    ('first_name', 'AddressFirstNameNew', 'First name'),
+    ('last_name', 'AddressLastNameNew', 'Last name'),
+    ('company', 'AddressCompanyNew', 'Company'),
+    ('address1', 'AddressAddress1New', 'Address'),
+    ('address2', 'AddressAddress2New', 'Apartment, suite, etc.'),
+    ('city', 'AddressCityNew', 'City'),
+    ('zip', 'AddressZipNew', 'Postal/Zip code'),
+    ('phone', 'AddressPhoneNew', 'Phone'),
+]
+
+_LAYOUT = """<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="utf-8">
+<title>{title} | Market99</title>
+<style>
+  body {{ font-family: sans-serif; margin: 0; }}
+  #NavStandard {{ display: flex; gap: 16px; align-items: center; padding: 12px; border-bottom: 1px solid #ddd; }}
+  .btn {{ padding: 8px 16px; background: #e31e24; color: #fff; border: 0; cursor: pointer; }}
+  .btn:hover {{ background: #b3161b; }}
+  .select-popout__list {{ display: none; list-style: none; padding: 0; }}
+  .select-popout__list.is-open {{ display: block; }}
+  #cart-drawer {{ display: none; position: fixed; right: 0; top: 0; width: 320px; background: #fff; border-left: 1px solid #ddd; padding: 12px; }}
+  #cart-drawer.is-open {{ display: block; }}
+  main {{ padding: 16px; }}
+</style>
+</head>
+<body>
+<div id="NavStandard">
+  <div class="header__logo"><a href="/">Market99</a></div>
+  <div class="header__menu"><a href="/search?q=">Shop</a></div>
+  <div class="header__offers"><a href="/search?q=bottle">Offers</a></div>
+  <div class="header__stores"><a href="/search?q=soap">Stores</a></div>
+  <div class="header__icons">
+    <div class="header__icon--account"><a href="/account">Account</a></div>
+    <search-popdown>
+      <details>
+        <summary>Search</summary>
+        <form action="/search" method="get">
+          <input id="searchInput-desktop" type="search" name="q" autocomplete="off">
+        </form>
+      </details>
+    </search-popdown>
+    <div class="header__icon--cart"><a href="/cart">Cart (<span class="cart-count">{cart_count}</span>)</a></div>
+  </div>
+</div>
+<div id="cart-drawer" class="drawer">
+  <div class="drawer__header">Your cart</div>
+  <div class="drawer__contents"><h3>Items in cart: <span>{cart_count}</span></h3></div>
+</div>
+<main>
+{body}
+</main>
+</body>
+</html>
+"""
+
+
+def _esc(value):
+    return html.escape(str(value), quote=True)
+
+
+class SiteState:
+    """In-memory store data shared by all request handler threads."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.customers = {email: dict(data) for email, data in SEED_CUSTOMERS.items()}
+        self.sessions = {}
+        self.addresses = {email: [] for email in self.customers}
+        self.carts = {}
+        self._address_ids = itertools.count(1)
+
+    def next_address_id(self):
+        return next(self._address_ids)
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server_version = 'Market99Local/1.0'
+
+    # -- plumbing ------------------------------------------------------------
+    @property
+    def state(self):
+        return self.server.state
+
+    def log_message(self, format, *args):
+        # Keep pytest output clean
+        pass
+
+    def _cookies(self):
+        cookie = SimpleCookie(self.headers.get('Cookie', ''))
+        return {key: morsel.value for key, morsel in cookie.items()}
+
+    def _customer_email(self):
+        token = self._cookies().get(SESSION_COOKIE)
+        with self.state.lock:
+            return self.state.sessions.get(token)
+
+    def _cart_token(self):
+        return self._cookies().get(CART_COOKIE)
+
+    def _cart_count(self):
+        with self.state.lock:
+            return sum(self.state.carts.get(self._cart_token(), {}).values())
+
+    def _form(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        raw = self.rfile.read(length).decode('utf-8') if length else ''
+        return {key: values[-1] for key, values in parse_qs(raw, keep_blank_values=True).items()}
+
+    def _send(self, status, body, content_type='text/html; charset=utf-8', cookies=None):
+        payload = body.encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(payload)))
+        self._send_cookies(cookies)
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def _send_cookies(self, cookies):
+        cookies = dict(cookies or {})
+        if CART_COOKIE not in self._cookies() and CART_COOKIE not in cookies:
+            cookies[CART_COOKIE] = secrets.token_hex(8)
+        for name, value in cookies.items():
+            if value is None:
+                self.send_header('Set-Cookie', f"{name}=; Path=/; Max-Age=0")
+            else:
+                self.send_header('Set-Cookie', f"{name}={value}; Path=/; HttpOnly")
+
+    def _redirect(self, location, cookies=None):
+        self.send_response(303)
+        self.send_header('Location', location)
+        self.send_header('Content-Length', '0')
+        self._send_cookies(cookies)
+        self.end_headers()
+
+    def _page(self, title, body, status=200, cookies=None):
+        self._send(status, _LAYOUT.format(title=_esc(title), body=body, cart_count=self._cart_count()),
+                   cookies=cookies)
+
+    # -- routing -------------------------------------------------------------
+    def do_GET(self):
+        parts = urlsplit(self.path)
+        path = parts.path.rstrip('/') or '/'
+        query = {key: values[-1] for key, values in parse_qs(parts.query, keep_blank_values=True).items()}
+        routes = {
+            '/': self._home,
+            '/account': self._account,
+            '/account/login': self._login_page,
+            '/account/register': self._register_page,
+            '/account/logout': self._logout,
+            '/account/addresses': self._addresses_page,
+            '/cart': self._cart_page,
+            '/cart.js': self._cart_json,
+        }
+        if path in routes:
+            return routes[path]()
+        if path == '/search':
+            return self._search(query.get('q', ''))
+        if path.startswith('/products/'):
+            return self._product(path[len('/products/'):])
+        self._page('Page not found', '<h1>404 Page Not Found</h1>', status=404)
+
+    def do_POST(self):
+        path = urlsplit(self.path).path.rstrip('/')
+        form = self._form()
+        if path == '/account/login':
+            return self._login(form)
+        if path == '/account/register':
+            return self._register(form)
+        if path == '/account/addresses':
+            return self._add_address(form)
+        if path.startswith('/account/addresses/'):
+            return self._delete_address(path.rsplit('/', 1)[-1], form)
+        if path == '/cart/add.js':
+            return self._cart_add(form)
+        self._send(404, 'Not found', content_type='text/plain')
+
+    # -- pages ---------------------------------------------------------------
+    def _home(self):
+        items = ''.join(
+            f'<li><a href="/products/{p["handle"]}">{_esc(p["title"])}</a></li>' for p in PRODUCTS
+        )
+        self._page('Home', f'<h1>Welcome to Market99</h1><ul class="featured">{items}</ul>')
+
+    def _account(self):
+        email = self._customer_email()
+        if not email:
+            return self._redirect('/account/login')
+        with self.state.lock:
+            customer = self.state.customers[email]
+        self._page('Account', f"""
+<h1>My account</h1>
+<p class="customer-name">{_esc(customer['first_name'])} {_esc(customer['last_name'])}</p>
+<p class="customer-email">{_esc(email)}</p>
+<a href="/account/addresses">View addresses</a>
+<a href="/account/logout">Log out</a>
+""")
+
+    def _login_page(self, error=''):
+        if self._customer_email():
+            return self._redirect('/account')
+        display = 'block' if error else 'none'
+        error_html = f'<div class="errors">{_esc(error)}</div>' if error else ''
+        self._page('Account', f"""
+<h1>Login</h1>
+<button id="loginWithEmailButton" type="button"
+        onclick="document.getElementById('customer_login').style.display='block'">Login with Email</button>
+<form id="customer_login" method="post" action="/account/login" style="display:{display}">
+  {error_html}
+  <label for="CustomerEmail">Email</label>
+  <input id="CustomerEmail" type="email" name="customer[email]">
+  <label for="CustomerPassword">Password</label>
+  <input id="CustomerPassword" type="password" name="customer[password]">
+  <button type="submit" class="btn">Sign In</button>
+</form>
+<p><a href="/account/register">Sign up</a></p>
+""", status=422 if error else 200)
+
+    def _login(self, form):
+        email = form.get('customer[email]', '').strip().lower()
+        password = form.get('customer[password]', '')
+        with self.state.lock:
+            customer = self.state.customers.get(email)
+            if customer and customer['password'] == password:
+                token = secrets.token_hex(16)
+                self.state.sessions[token] = email
+            else:
+                token = None
+        if not token:
+            return self._login_page(error='Incorrect email or password.')
+        self._redirect('/', cookies={SESSION_COOKIE: token})
+
+    def _logout(self):
+        token = self._cookies().get(SESSION_COOKIE)
+        with self.state.lock:
+            self.state.sessions.pop(token, None)
+        self._redirect('/', cookies={SESSION_COOKIE: None})
+
+    def _register_page(self, error=''):
+        error_html = f'<div class="errors">{_esc(error)}</div>' if error else ''
+        self._page('Create Account', f"""
+<h1>Create Account</h1>
+<form id="create_customer" method="post" action="/account/register">
+  {error_html}
+  <input id="FirstName" type="text" name="customer[first_name]" placeholder="First Name">
+  <input id="LastName" type="text" name="customer[last_name]" placeholder="Last Name">
+  <input id="Email" type="email" name="customer[email]" placeholder="Email">
+  <input id="CreatePassword" type="password" name="customer[password]" placeholder="Password">
+  <button type="submit" class="btn">Create</button>
+</form>
+""", status=422 if error else 200)
+
+    def _register(self, form):
+        email = form.get('customer[email]', '').strip().lower()
+        password = form.get('customer[password]', '')
+        if not email or '@' not in email or len(password) < 5:
+            return self._register_page(error='Please enter a valid email and password.')
+        with self.state.lock:
+            if email in self.state.customers:
+                token = None
+            else:
+                self.state.customers[email] = {
+                    'first_name': form.get('customer[first_name]', ''),
+                    'last_name': form.get('customer[last_name]', ''),
+                    'password': password,
+                }
+                self.state.addresses[email] = []
+                token = secrets.token_hex(16)
+                self.state.sessions[token] = email
+        if not token:
+            return self._register_page(error='This email address is already associated with an account.')
+        self._redirect('/', cookies={SESSION_COOKIE: token})
+
+    def _addresses_page(self):
+        email = self._customer_email()
+        if not email:
+            return self._redirect('/account/login')
+        with self.state.lock:
+            addresses = list(self.state.addresses.get(email, []))
+        blocks = ''.join(f"""
+<div class="address" data-address-id="{a['id']}">
+  <p>{'<strong>Default</strong><br>' if a['default'] else ''}{_esc(a['first_name'])} {_esc(a['last_name'])}<br>
+     {_esc(a['company'])}<br>{_esc(a['address1'])}<br>{_esc(a['address2'])}<br>
+     {_esc(a['city'])} {_esc(a['province'])} {_esc(a['zip'])}<br>{_esc(a['phone'])}</p>
+  <form method="post" action="/account/addresses/{a['id']}" class="address-delete-form">
+    <input type="hidden" name="_method" value="delete">
+  </form>
+  <a href="#" data-button-delete data-address-id="{a['id']}"
+     onclick="event.preventDefault(); if (confirm('Are you sure you wish to delete this address?')) {{ this.previousElementSibling.submit(); }}">Delete</a>
+</div>""" for a in addresses)
+        inputs = ''.join(
+            f'<div class="field"><label for="{field_id}">{label}</label>'
+            f'<input id="{field_id}" type="text" name="address[{name}]"></div>'
+            for name, field_id, label in ADDRESS_FIELDS
+        )
+        options = ''.join(f'<option value="{_esc(p)}">{_esc(p)}</option>' for p in PROVINCES)
+        self._page('Addresses', f"""
+<h1>Your addresses</h1>
+<a class="btn btn--primary btn--solid" data-button-new href="#"
+   onclick="event.preventDefault(); document.getElementById('AddressNewForm').style.display='block'">Add a new address</a>
+<div id="AddressNewForm" style="display:none">
+  <form id="address_form_new" method="post" action="/account/addresses">
+    <div class="grid">{inputs}
+      <div class="field"><label for="AddressProvinceNew">Province</label>
+        <select id="AddressProvinceNew" name="address[province]"><option value="">---</option>{options}</select></div>
+    </div>
+    <p><input id="address_default_address_new" type="checkbox" name="address[default]" value="1">
+       <label for="address_default_address_new">Set as default address</label></p>
+    <p><button type="submit" class="btn">Add address</button></p>
+  </form>
+</div>
+{blocks}
+""")
+
+    def _add_address(self, form):
+        email = self._customer_email()
+        if not email:
+            return self._redirect('/account/login')
+        address = {name: form.get(f'address[{name}]', '') for name, _, _ in ADDRESS_FIELDS}
+        address['province'] = form.get('address[province]', '')
+        address['default'] = form.get('address[default]') == '1'
+        with self.state.lock:
+            address['id'] = self.state.next_address_id()
+            book = self.state.addresses.setdefault(email, [])
+            if address['default']:
+                for existing in book:
+                    existing['default'] = False
+            book.append(address)
+        self._redirect('/account/addresses')
+
+    def _delete_address(self, address_id, form):
+        email = self._customer_email()
+        if not email:
+            return self._redirect('/account/login')
+        with self.state.lock:
+            book = self.state.addresses.get(email, [])
+            self.state.addresses[email] = [a for a in book if str(a['id']) != address_id]
+        self._redirect('/account/addresses')
+
+    def _search(self, query):
+        q = query.strip().lower()
+        matches = [p for p in PRODUCTS if q in p['title'].lower()]
+        cards = ''.join(f"""
+<div class="product-item">
+  <a href="/products/{p['handle']}"><div class="product-title">{_esc(p['title'])}</div></a>
+  <div class="product-price">&#8377; {p['price']}</div>
+</div>""" for p in matches)
+        body = cards or '<p class="no-results">No results found</p>'
+        self._page(f'Search: {query}', f'<h1>Search results for "{_esc(query)}"</h1>{body}')
+
+    def _product(self, handle):
+        product = next((p for p in PRODUCTS if p['handle'] == handle), None)
+        if not product:
+            return self._page('Page not found', '<h1>404 Page Not Found</h1>', status=404)
+        options = ''.join(
+            f'<li><a href="#" data-value="{n}" onclick="event.preventDefault(); selectQty({n});">{n}</a></li>'
+            for n in range(1, 11)
+        )
+        self._page(product['title'], f"""
+<h1 class="product__title">{_esc(product['title'])}</h1>
+<div class="product__price">&#8377; {product['price']}</div>
+<div class="coupon">Use code <span id="cpnCode">{COUPON_CODE}</span>
+  <button id="cpnBtn" type="button" onclick="navigator.clipboard && navigator.clipboard.writeText('{COUPON_CODE}').catch(function () {{}})">Copy</button></div>
+<div class="select-popout">
+  <button class="select-popout__toggle" type="button"
+          onclick="document.getElementById('QtyList').classList.toggle('is-open')">Quantity: <span id="QtyValue">1</span></button>
+  <ul id="QtyList" class="select-popout__list">{options}</ul>
+</div>
+<button type="button" name="add" class="btn" data-handle="{product['handle']}" onclick="addToCart(this)">Add to cart</button>
+<script>
+  var quantity = 1;
+  function selectQty(n) {{
+    quantity = n;
+    document.getElementById('QtyValue').textContent = n;
+    document.getElementById('QtyList').classList.remove('is-open');
+  }}
+  function addToCart(button) {{
+    var body = 'handle=' + encodeURIComponent(button.dataset.handle) + '&quantity=' + quantity;
+    fetch('/cart/add.js', {{method: 'POST', headers: {{'Content-Type': 'application/x-www-form-urlencoded'}}, body: body}})
+      .then(function (r) {{ return r.json(); }})
+      .then(function (cart) {{
+        document.querySelectorAll('#cart-drawer h3 span, .cart-count').forEach(function (el) {{ el.textContent = cart.item_count; }});
+        document.getElementById('cart-drawer').classList.add('is-open');
+      }});
+  }}
+</script>
+""")
+
+    def _cart_add(self, form):
+        handle = form.get('handle', '')
+        try:
+            quantity = max(int(form.get('quantity', '1')), 1)
+        except ValueError:
+            quantity = 1
+        cookies = {}
+        token = self._cart_token()
+        if not token:
+            token = secrets.token_hex(8)
+            cookies[CART_COOKIE] = token
+        with self.state.lock:
+            cart = self.state.carts.setdefault(token, {})
+            cart[handle] = cart.get(handle, 0) + quantity
+            count = sum(cart.values())
+        self._send(200, json.dumps({'item_count': count}), content_type='application/json', cookies=cookies)
+
+    def _cart_json(self):
+        with self.state.lock:
+            cart = dict(self.state.carts.get(self._cart_token(), {}))
+        self._send(200, json.dumps({'item_count': sum(cart.values()), 'items': cart}),
+                   content_type='application/json')
+
+    def _cart_page(self):
+        with self.state.lock:
+            cart = dict(self.state.carts.get(self._cart_token(), {}))
+        rows = ''.join(f'<li>{_esc(handle)} x {qty}</li>' for handle, qty in cart.items())
+        self._page('Cart', f'<h1>Your cart</h1><ul class="cart-items">{rows}</ul>')
+
+
+class LocalSite:
+    """
+    Run the stand-in store on a background thread.
+
+    Usage:
+        site = LocalSite().start()
+        driver.get(site.url)
+        ...
+        site.stop()
+    """
+
+    def __init__(self, host='127.0.0.1', port=0):
+        self.host = host
+        self.port = port
+        self._server = None
+        self._thread = None
+
+    @property
+    def url(self):
+        return f"http://{self.host}:{self.port}"
+
+    @property
+    def state(self):
+        return self._server.state
+
+    def start(self):
+        self._server = ThreadingHTTPServer((self.host, self.port), _Handler)
+        self._server.daemon_threads = True
+        self._server.state = SiteState()
+        self.port = self._server.server_address[1]
+        self._thread = threading.Thread(target=self._server.serve_forever, name='local-site', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def reset(self):
+        """Drop all customers/sessions/addresses/carts created during the run."""
+        self._server.state = SiteState()
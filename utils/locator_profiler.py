@@ -0,0 +1,225 @@
+"""
+Locator profiler for page-object locators.
+
+Collects every `(By, value)` class attribute of the classes in page_objects/,
+evaluates each one inside a loaded page (or a saved DOM snapshot, e.g. the
+dom.html.gz attached to a failed test) and reports:
+
+- how long the browser takes to resolve it (mean of --repeat runs)
+- how many elements it matches (more than one = ambiguous)
+- for slow or positional locators (e.g. //*[@id='NavStandard']/div[5]/div[1]/a):
+  id/CSS selectors that resolve to exactly the same element, with their timing
+
+CLI:
+    python -m utils.locator_profiler --url https://market99.com/ --url https://market99.com/account/login
+    python -m utils.locator_profiler --snapshot reports/dom.html.gz --output reports/locator_profile.json
+"""
+import argparse
+import gzip
+import importlib
+import inspect
+import json
+import os
+import pkgutil
+import re
+import statistics
+import sys
+import tempfile
+from pathlib import Path
+
+from selenium.webdriver.common.by import By
+
+from utils.dom_scripts import FIND_ALL_JS
+
+BY_STRATEGIES = {value for name, value in vars(By).items() if not name.startswith('_') and isinstance(value, str)}
+
+# An XPath step with a position index, e.g. div[5]
+_POSITIONAL = re.compile(r'/[\w*-]+\[\d+\]')
+
+_PROFILE_SCRIPT = FIND_ALL_JS + """
+var locators = arguments[0], repeat = arguments[1];
+function timeIt(fn) {
+  var start = performance.now();
+  for (var i = 0; i < repeat; i++) { fn(); }
+  return (performance.now() - start) / repeat;
+}
+function resolvesTo(css, el) {
+  try {
+    var found = document.querySelectorAll(css);
+    return found.length === 1 && found[0] === el;
+  } catch (e) { return false; }
+}
+function candidates(el) {
+  var tag = el.tagName.toLowerCase(), out = [];
+  if (el.id) { out.push(['id', el.id, '#' + CSS.escape(el.id)]); }
+  ['name', 'data-testid', 'data-test', 'aria-label', 'href', 'type', 'placeholder', 'title'].forEach(function (attr) {
+    var v = el.getAttribute(attr);
+    if (v) { var css = tag + '[' + attr + '="' + v.replace(/"/g, '\\\\"') + '"]'; out.push(['css selector', css, css]); }
+  });
+  var classes = Array.from(el.classList).map(function (c) { return '.' + CSS.escape(c); }).join('');
+  if (classes) { out.push(['css selector', tag + classes, tag + classes]); }
+  for (var a = el.parentElement; a; a = a.parentElement) {
+    if (a.id) {
+      var scoped = '#' + CSS.escape(a.id) + ' ' + tag + classes;
+      out.push(['css selector', scoped, scoped]);
+      break;
+    }
+  }
+  return out;
+}
+return locators.map(function (loc) {
+  var found;
+  try { found = findAll(loc[0], loc[1]); } catch (e) { return {error: String(e)}; }
+  var result = {count: found.length, ms: timeIt(function () { findAll(loc[0], loc[1]); })};
+  if (found.length) {
+    var el = found[0], seen = {};
+    result.suggestions = candidates(el).filter(function (c) {
+      if (seen[c[2]] || !resolvesTo(c[2], el)) { return false; }
+      seen[c[2]] = true;
+      return true;
+    }).slice(0, 3).map(function (c) {
+      return {by: c[0], value: c[1], ms: timeIt(function () { document.querySelectorAll(c[2]); })};
+    });
+  }
+  return result;
+});
+"""
+
+
+def collect_locators(package='page_objects'):
+    """Return {(by, value): [Module.Class.ATTR, ...]} for every locator class attribute."""
+    pkg = importlib.import_module(package)
+    locators = {}
+    for info in pkgutil.iter_modules(pkg.__path__):
+        module = importlib.import_module(f"{package}.{info.name}")
+        for class_name, cls in inspect.getmembers(module, inspect.isclass):
+            if cls.__module__ != module.__name__:
+                continue
+            for attr, value in vars(cls).items():
+                if isinstance(value, tuple) and len(value) == 2 and value[0] in BY_STRATEGIES \
+                        and isinstance(value[1], str):
+                    locators.setdefault(value, []).append(f"{info.name}.{class_name}.{attr}")
+    return locators
+
+
+def is_positional(by, value):
+    return by == By.XPATH and bool(_POSITIONAL.search(value))
+
+
+def snapshot_url(path, temp_files=None):
+    """
+    file:// URL of a DOM snapshot (.html or .html.gz) the browser can load.
+
+    A .gz snapshot is decompressed into a temporary file, appended to
+    `temp_files` so the caller can delete it.
+    """
+    if path.endswith('.gz'):
+        with gzip.open(path, 'rb') as f:
+            html = f.read()
+        handle, path = tempfile.mkstemp(suffix='.html', prefix='dom_snapshot_')
+        if temp_files is not None:
+            temp_files.append(path)
+        with os.fdopen(handle, 'wb') as f:
+            f.write(html)
+    return Path(os.path.abspath(path)).as_uri()
+
+
+def profile_page(driver, locators, repeat=50):
+    """Evaluate `locators` ([(by, value), ...]) in the current page; one result dict per locator."""
+    return driver.execute_script(_PROFILE_SCRIPT, [list(loc) for loc in locators], repeat)
+
+
+def merge_results(locators, pages):
+    """
+    Combine per-page results into one row per locator.
+
+    `pages` is [(source, [result, ...]), ...] in locator order. A locator keeps
+    the result of the first page it matched on.
+    """
+    rows = []
+    for i, (locator, names) in enumerate(locators.items()):
+        row = {'by': locator[0], 'value': locator[1], 'names': names, 'count': 0, 'ms': None,
+               'source': None, 'positional': is_positional(*locator), 'suggestions': []}
+        for source, results in pages:
+            result = results[i] or {}
+            if result.get('count'):
+                row.update(count=result['count'], ms=result['ms'], source=source,
+                           suggestions=result.get('suggestions', []))
+                break
+        rows.append(row)
+    return rows
+
+
+def rank(rows, slow_ms=None):
+    """Split rows into (slowest first, most ambiguous first, never matched)."""
+    matched = [r for r in rows if r['count']]
+    if slow_ms is None and matched:
+        slow_ms = statistics.median(r['ms'] for r in matched)
+    slowest = sorted(matched, key=lambda r: r['ms'], reverse=True)
+    for row in slowest:
+        row['slow'] = row['ms'] > slow_ms or row['positional']
+    ambiguous = sorted((r for r in matched if r['count'] > 1), key=lambda r: r['count'], reverse=True)
+    unmatched = [r for r in rows if not r['count']]
+    return slowest, ambiguous, unmatched
+
+
+def format_report(slowest, ambiguous, unmatched):
+    lines = ["Slowest locators", f"{'ms':>8} {'matches':>7}  locator"]
+    for row in slowest:
+        flag = '  [positional]' if row['positional'] else ''
+        lines.append(f"{row['ms']:>8.3f} {row['count']:>7}  {', '.join(row['names'])}: {row['by']}={row['value']}{flag}")
+        if row.get('slow'):
+            for s in row['suggestions']:
+                lines.append(f"{s['ms']:>8.3f} {'':>7}    -> ({s['by']!r}, {s['value']!r})")
+    lines += ["", "Ambiguous locators (more than one match)"]
+    lines += [f"{row['count']:>7}  {', '.join(row['names'])}: {row['by']}={row['value']}" for row in ambiguous] or ['  none']
+    lines += ["", "Not found on the profiled pages"]
+    lines += [f"  {', '.join(row['names'])}: {row['by']}={row['value']}" for row in unmatched] or ['  none']
+    return '\n'.join(lines)
+
+
+def main(argv=None):
+    from utils.driver_utils import get_driver
+
+    parser = argparse.ArgumentParser(description="Time page-object locators and suggest faster equivalents.")
+    parser.add_argument('--url', action='append', default=[], help="page to profile (repeatable)")
+    parser.add_argument('--snapshot', action='append', default=[], help="saved DOM (.html or .html.gz), repeatable")
+    parser.add_argument('--browser', default='chrome')
+    parser.add_argument('--repeat', type=int, default=50, help="evaluations per locator")
+    parser.add_argument('--slow-ms', type=float, default=None, help="suggest alternatives above this (default: median)")
+    parser.add_argument('--output', help="also write the report as JSON")
+    args = parser.parse_args(argv)
+    if not (args.url or args.snapshot):
+        parser.error("give at least one --url or --snapshot")
+
+    locators = collect_locators()
+    temp_files = []
+    pages = []
+    try:
+        sources = args.url + [snapshot_url(p, temp_files) for p in args.snapshot]
+        os.environ.setdefault('HEADLESS', 'true')
+        driver = get_driver(args.browser)
+        try:
+            for source in sources:
+                driver.get(source)
+                pages.append((source, profile_page(driver, list(locators), args.repeat)))
+        finally:
+            driver.quit()
+    finally:
+        for path in temp_files:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    slowest, ambiguous, unmatched = rank(merge_results(locators, pages), args.slow_ms)
+    print(format_report(slowest, ambiguous, unmatched))
+    if args.output:
+        os.makedirs(os.path.dirname(args.output) or '.', exist_ok=True)
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump({'slowest': slowest, 'ambiguous': ambiguous, 'unmatched': unmatched}, f, indent=2)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,60 @@
+"""
+Longest-processing-time-first scheduling for pytest-xdist.
+
+Stock `--dist load` sends tests in collection order and in chunks, so a worker
+that is handed the long address tests late finishes minutes after the rest.
+DurationScheduling sorts the collection by the durations recorded in
+utils/duration_history.py and keeps only two tests queued per worker: the one
+running and the next. Every worker that frees up takes the longest remaining
+test, which is greedy LPT list scheduling and keeps the makespan close to the
+ideal even when the history is a little off.
+
+Used by conftest.py for `-n N` runs with the default `--dist load`.
+"""
+from xdist.scheduler import LoadScheduling
+
+from utils.duration_history import load_history, longest_first
+
+# Running test + the next one; xdist needs the lookahead to run teardown correctly
+_QUEUE_PER_WORKER = 2
+
+
+class DurationScheduling(LoadScheduling):
+    """LoadScheduling that hands tests out longest-first, one at a time."""
+
+    def __init__(self, config, log=None, history=None):
+        super().__init__(config, log)
+        self.history = load_history() if history is None else history
+
+    def schedule(self):
+        assert self.collection_is_completed
+        if self.collection is not None:
+            for node in self.nodes:
+                self.check_schedule(node)
+            return
+        if not self._check_nodes_have_same_collection():
+            self.log("**Different tests collected, aborting run**")
+            return
+
+        self.collection = next(iter(self.node2collection.values()))
+        self.pending[:] = longest_first(self.collection, self.history)
+        if not self.collection:
+            return
+        # Deal round-robin so the N longest tests start on N different workers
+        for _ in range(_QUEUE_PER_WORKER):
+            for node in self.nodes:
+                self._send_tests(node, 1)
+        if not self.pending:
+            for node in self.nodes:
+                node.shutdown()
+
+    def check_schedule(self, node, duration=0):
+        if node.shutting_down:
+            return
+        if self.pending:
+            missing = _QUEUE_PER_WORKER - len(self.node2pending[node])
+            if missing > 0:
+                self._send_tests(node, missing)
+        else:
+            node.shutdown()
+        self.log("num items waiting for node:", len(self.pending))
@@ -0,0 +1,147 @@
+"""
+Request blocking for local Chrome/Edge sessions.
+
+market99 pages pull in large images, trackers and chat widgets that the page
+objects never touch, and `document.readyState == 'complete'` waits for all of
+them. With BLOCK_RESOURCES=true, get_driver() sends the Chromium DevTools
+command `Network.setBlockedURLs` so those requests fail immediately.
+
+- Patterns use the DevTools wildcard syntax: `*` matches any characters.
+- DEFAULT_DENY covers images, fonts, media and well-known analytics/chat
+  hosts. BLOCKED_URL_PATTERNS (comma separated) adds to it; ALLOWED_URL_PATTERNS
+  removes every deny pattern it matches, e.g. `*.png*` or `*hotjar*`.
+- A test module can set its own lists with
+  `pytestmark = pytest.mark.block_resources(deny=[...], allow=[...])`.
+- Blocked requests are counted from the browser's performance log and
+  attached to the Allure report of every test.
+- DevTools is only reachable on local Chromium drivers, so remote/grid
+  sessions and Firefox are left untouched.
+"""
+import json
+import os
+import re
+from urllib.parse import urlsplit
+
+DEFAULT_DENY = (
+    # images, fonts and media
+    '*.png*', '*.jpg*', '*.jpeg*', '*.gif*', '*.webp*', '*.avif*', '*.svg*', '*.ico*',
+    '*.woff*', '*.ttf*', '*.otf*', '*.mp4*', '*.webm*',
+    # analytics, ads and tracking
+    '*google-analytics.com*', '*googletagmanager.com*', '*doubleclick.net*', '*googleadservices.com*',
+    '*connect.facebook.net*', '*hotjar.com*', '*clarity.ms*', '*monorail-edge.shopifysvc.com*',
+    # chat widgets
+    '*tawk.to*', '*zopim.com*', '*intercom.io*', '*tidio.co*', '*wati.io*',
+)
+
+# Reason Chromium reports for requests stopped by Network.setBlockedURLs
+_BLOCKED_REASON = 'inspector'
+
+
+def is_resource_blocking_enabled():
+    return os.environ.get('BLOCK_RESOURCES', 'false').lower() == 'true'
+
+
+def _patterns_from_env(name):
+    return [p.strip() for p in os.environ.get(name, '').split(',') if p.strip()]
+
+
+def _wildcard(pattern):
+    return re.compile('.*'.join(re.escape(part) for part in pattern.split('*')), re.IGNORECASE)
+
+
+def resolve_patterns(deny=None, allow=None):
+    """
+    Return the deny patterns to send to the browser.
+
+    `deny` replaces DEFAULT_DENY + BLOCKED_URL_PATTERNS when given. Allow
+    patterns (`allow` plus ALLOWED_URL_PATTERNS) drop every deny pattern they
+    match: setBlockedURLs has no exceptions, so allowing means not blocking.
+    """
+    if deny is None:
+        deny = list(DEFAULT_DENY) + _patterns_from_env('BLOCKED_URL_PATTERNS')
+    allow = list(allow or ()) + _patterns_from_env('ALLOWED_URL_PATTERNS')
+    allowed = [_wildcard(p) for p in allow]
+    resolved = []
+    for pattern in deny:
+        if pattern not in resolved and not any(a.fullmatch(pattern) for a in allowed):
+            resolved.append(pattern)
+    return resolved
+
+
+def logging_capability(browser):
+    """(capability name, value) that turns on the performance log the counters are read from."""
+    prefix = 'ms' if browser == 'edge' else 'goog'
+    return f'{prefix}:loggingPrefs', {'performance': 'ALL'}
+
+
+class ResourceBlocker:
+    """Applies block lists to one Chromium driver and counts what they stopped."""
+
+    def __init__(self, driver):
+        self.driver = driver
+        self.patterns = []
+        self._urls = {}
+        self._blocked = []
+
+    def apply(self, deny=None, allow=None):
+        self.patterns = resolve_patterns(deny, allow)
+        self.driver.execute_cdp_cmd('Network.enable', {})
+        self.driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': self.patterns})
+        return self.patterns
+
+    def clear(self):
+        self.patterns = []
+        self.driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': []})
+
+    def _drain_log(self):
+        try:
+            entries = self.driver.get_log('performance')
+        except Exception:
+            # logging was not enabled for this driver; blocking still works
+            return
+        for entry in entries:
+            try:
+                message = json.loads(entry['message'])['message']
+            except (KeyError, TypeError, ValueError):
+                continue
+            params = message.get('params', {})
+            if message.get('method') == 'Network.requestWillBeSent':
+                self._urls[params.get('requestId')] = params.get('request', {}).get('url', '')
+            elif message.get('method') == 'Network.loadingFailed' \
+                    and params.get('blockedReason') == _BLOCKED_REASON:
+                self._blocked.append(self._urls.get(params.get('requestId'), ''))
+
+    def reset_counters(self):
+        self._drain_log()
+        self._urls.clear()
+        self._blocked.clear()
+
+    def stats(self):
+        """Blocked request counters since the last reset_counters()."""
+        self._drain_log()
+        by_host = {}
+        by_pattern = {}
+        compiled = [(p, _wildcard(p)) for p in self.patterns]
+        for url in self._blocked:
+            host = urlsplit(url).hostname or ''
+            by_host[host] = by_host.get(host, 0) + 1
+            pattern = next((p for p, regex in compiled if regex.fullmatch(url)), '')
+            by_pattern[pattern] = by_pattern.get(pattern, 0) + 1
+        return {
+            'blocked': len(self._blocked),
+            'by_host': dict(sorted(by_host.items(), key=lambda kv: -kv[1])),
+            'by_pattern': dict(sorted(by_pattern.items(), key=lambda kv: -kv[1])),
+            'patterns': list(self.patterns),
+        }
+
+
+def install_blocker(driver, deny=None, allow=None):
+    """Block requests on `driver` and expose the blocker as `driver.resource_blocker`."""
+    blocker = ResourceBlocker(driver)
+    blocker.apply(deny, allow)
+    driver.resource_blocker = blocker
+    return driver
+
+
+def get_blocker(driver):
+    return getattr(driver, 'resource_blocker', None) if driver is not None else None
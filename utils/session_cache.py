@@ -0,0 +1,126 @@
+"""
+Authenticated-session cache.
+
+Logging in through the UI costs several page loads per test. After the first
+successful login for a `login_data` row the browser's cookies and localStorage
+are stored on disk and replayed into later sessions, including sessions on
+other xdist workers.
+
+- Entries live in SESSION_CACHE_DIR (default `.session_cache`), one JSON file
+  per credentials row, guarded by `utils.file_lock.file_lock`.
+- Entries expire after SESSION_CACHE_TTL seconds (default 1800).
+- Only one worker logs in through the UI per credentials row at a time
+  (SessionCache.login_lock); the others wait and reuse the captured session.
+- SESSION_CACHE=false disables the cache entirely.
+"""
+import hashlib
+import json
+import os
+import time
+
+from utils.file_lock import file_lock
+
+DEFAULT_TTL = 1800
+
+
+def is_session_cache_enabled():
+    return os.environ.get('SESSION_CACHE', 'true').lower() == 'true'
+
+
+def session_key(login_data, base_url=''):
+    """Stable key for a credentials row on a site (order of the columns does not matter)."""
+    payload = json.dumps([base_url, sorted((str(k), str(v)) for k, v in login_data.items())])
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()[:32]
+
+
+def capture_session(driver):
+    """Return the cookies and localStorage of the page currently open in `driver`."""
+    try:
+        local_storage = driver.execute_script(
+            "var out = {};"
+            "for (var i = 0; i < window.localStorage.length; i++) {"
+            "  var k = window.localStorage.key(i); out[k] = window.localStorage.getItem(k);"
+            "}"
+            "return out;"
+        ) or {}
+    except Exception:
+        local_storage = {}
+    return {'cookies': driver.get_cookies(), 'local_storage': local_storage}
+
+
+def restore_session(driver, base_url, state):
+    """
+    Inject a captured session into `driver`.
+
+    Cookies can only be added for the domain that is currently open, so the
+    browser is pointed at `base_url` first and reloaded afterwards.
+    """
+    if not driver.current_url.startswith(base_url.rstrip('/')):
+        driver.get(base_url)
+    for cookie in state.get('cookies', []):
+        cookie = dict(cookie)
+        if 'expiry' in cookie:
+            cookie['expiry'] = int(cookie['expiry'])
+        try:
+            driver.add_cookie(cookie)
+        except Exception:
+            # Cookies for other domains (e.g. third-party widgets) are rejected; skip them
+            pass
+    local_storage = state.get('local_storage') or {}
+    if local_storage:
+        driver.execute_script(
+            "var items = arguments[0];"
+            "for (var k in items) { window.localStorage.setItem(k, items[k]); }",
+            local_storage,
+        )
+    driver.refresh()
+
+
+class SessionCache:
+    """File-backed store of captured sessions shared between pytest workers."""
+
+    def __init__(self, directory=None, ttl=None):
+        self.directory = directory or os.environ.get('SESSION_CACHE_DIR', '.session_cache')
+        if ttl is None:
+            try:
+                ttl = float(os.environ.get('SESSION_CACHE_TTL', DEFAULT_TTL))
+            except ValueError:
+                ttl = DEFAULT_TTL
+        self.ttl = ttl
+
+    def _path(self, key):
+        return os.path.join(self.directory, f"{key}.json")
+
+    def get(self, key):
+        """Return the stored session state for `key`, or None if missing/expired."""
+        path = self._path(key)
+        with file_lock(path):
+            if not os.path.exists(path):
+                return None
+            try:
+                with open(path, encoding='utf-8') as f:
+                    entry = json.load(f)
+            except (OSError, ValueError):
+                return None
+            if time.time() - entry.get('created', 0) > self.ttl:
+                os.remove(path)
+                return None
+            return entry.get('state')
+
+    def put(self, key, state):
+        path = self._path(key)
+        with file_lock(path):
+            tmp = f"{path}.tmp"
+            with open(tmp, 'w', encoding='utf-8') as f:
+                json.dump({'created': time.time(), 'state': state}, f)
+            os.replace(tmp, path)
+
+    def login_lock(self, key, timeout=180):
+        """Lock held while one worker logs in for `key`, so the others wait and reuse its session."""
+        return file_lock(f"{self._path(key)}.login", timeout=timeout)
+
+    def invalidate(self, key):
+        path = self._path(key)
+        with file_lock(path):
+            if os.path.exists(path):
+                os.remove(path)
@@ -0,0 +1,20 @@
+"""
+Site under test.
+
+Everything that builds a market99 URL goes through get_base_url(), so the
+suite can be pointed at another environment (or the bundled local stand-in,
+see utils/local_site.py) with the BASE_URL environment variable.
+"""
+import os
+
+DEFAULT_BASE_URL = "https://market99.com"
+
+
+def get_base_url():
+    """Return the site root without a trailing slash."""
+    return os.environ.get('BASE_URL', DEFAULT_BASE_URL).rstrip('/')
+
+
+def is_local_site_enabled():
+    """LOCAL_SITE=true serves the suite from the in-process stand-in instead of the live site."""
+    return os.environ.get('LOCAL_SITE', 'false').lower() == 'true'
@@ -0,0 +1,212 @@
+"""
+Run independent data rows side by side in tabs of one browser.
+
+A data-driven test normally needs one browser per parameter row. TabRunner
+runs the rows on threads instead, each in its own tab of a single browser:
+
+- On local Chrome/Edge every row gets a separate browser context (DevTools
+  `Target.createBrowserContext`), so cookies, storage and logins do not leak
+  between rows. Other browsers get plain tabs, which share cookies.
+- `driver.execute` is wrapped while the rows run: before every command the
+  browser is switched to the calling thread's tab (only when focus has to
+  move), and commands are serialised. Page objects, WebDriverWait and
+  WebElements keep using the one driver object unchanged.
+- One WebDriver session runs one command at a time, so a command holds the
+  browser for its whole duration, including `driver.get` under the normal
+  page-load strategy and in-browser waits (utils/browser_waits.py). Rows
+  overlap in between commands: fixed sleeps and the gaps between
+  WebDriverWait polls. settings_warnings() flags the settings that hold the
+  browser longest (normal page loads; in-browser waits are cut to short
+  slices while rows run, but still hold it between those slices).
+- A failing row is recorded with its traceback and a screenshot of its tab;
+  the other rows carry on. A row that calls pytest.skip is reported as
+  skipped, not failed.
+
+conftest.py uses it for tests marked `tab_rows(argname)` when TAB_ROWS=N (N > 1
+tabs per browser): the rows are parametrized as one TabRows value.
+"""
+import os
+import threading
+import time
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from selenium.webdriver.remote.command import Command
+
+from utils import browser_waits
+from utils.driver_utils import page_load_strategy, prepare_tab
+
+
+def tab_count():
+    """Rows per browser from TAB_ROWS; 0 or 1 keeps one browser per row."""
+    try:
+        return max(0, int(os.environ.get('TAB_ROWS', '0')))
+    except ValueError:
+        return 0
+
+
+def settings_warnings():
+    """Settings under which rows mostly wait for each other instead of overlapping."""
+    warnings = []
+    if page_load_strategy() == 'normal':
+        warnings.append("TAB_ROWS with PAGE_LOAD_STRATEGY=normal: every page load holds the browser until the "
+                        "page has fully loaded; set PAGE_LOAD_STRATEGY=eager")
+    if browser_waits.is_browser_waits_enabled():
+        warnings.append("TAB_ROWS with BROWSER_WAITS=true: in-browser waits hold the browser while they run; "
+                        "set BROWSER_WAITS=false")
+    return warnings
+
+
+class TabRows(list):
+    """The rows of a `tab_rows` test folded into one parameter value: [(row_id, row), ...]."""
+
+
+class RowResult:
+    def __init__(self, row_id):
+        self.row_id = row_id
+        self.error = None
+        self.skipped = None
+        self.traceback = ''
+        self.screenshot = None
+        self.seconds = 0.0
+
+    @property
+    def passed(self):
+        return self.error is None
+
+    def as_dict(self):
+        return {'passed': self.passed, 'skipped': self.skipped, 'seconds': round(self.seconds, 3),
+                'error': None if self.passed else f"{type(self.error).__name__}: {self.error}"}
+
+
+class TabRunner:
+    """Runs `fn(row)` for many rows concurrently, one tab (or browser context) per row, on one driver."""
+
+    def __init__(self, driver, max_tabs=4, isolate=True):
+        self.driver = driver
+        self.max_tabs = max(1, max_tabs)
+        self.isolate = isolate and hasattr(driver, 'execute_cdp_cmd')
+        self._local = threading.local()
+        self._lock = threading.RLock()
+        self._current = None
+
+    def _focused_execute(self, execute):
+        def focused_execute(driver_command, params=None):
+            with self._lock:
+                handle = getattr(self._local, 'handle', None)
+                if handle is not None and handle != self._current:
+                    execute(Command.SWITCH_TO_WINDOW, {'handle': handle})
+                    self._current = handle
+                response = execute(driver_command, params)
+                if driver_command == Command.SWITCH_TO_WINDOW:
+                    # the row moved to another of its windows (e.g. a popup); follow it
+                    self._current = params['handle']
+                    if handle is not None:
+                        self._local.handle = self._current
+                elif driver_command == Command.CLOSE:
+                    self._current = None
+                return response
+        return focused_execute
+
+    def _open_tab(self):
+        """Open a tab for the calling thread; returns the browser context to dispose (or None)."""
+        context = None
+        if self.isolate:
+            try:
+                context = self.driver.execute_cdp_cmd('Target.createBrowserContext', {})['browserContextId']
+                target = self.driver.execute_cdp_cmd(
+                    'Target.createTarget', {'url': 'about:blank', 'browserContextId': context})['targetId']
+                if target not in self.driver.window_handles:
+                    raise RuntimeError('browser context tab is not visible to the driver')
+                self._local.handle = target
+            except Exception:
+                # older drivers do not expose other contexts as windows; share the default one
+                if context is not None:
+                    self._dispose(context)
+                context = None
+                self.isolate = False
+        if context is None:
+            self._local.handle = self.driver.execute(Command.NEW_WINDOW, {'type': 'tab'})['value']['handle']
+        # DevTools state (block lists, readiness tracker) belongs to a tab and does not carry over
+        prepare_tab(self.driver)
+        return context
+
+    def _close_tab(self, context):
+        try:
+            self.driver.execute(Command.CLOSE)
+        except Exception:
+            pass
+        self._local.handle = None
+        if context is not None:
+            self._dispose(context)
+
+    def _dispose(self, context):
+        try:
+            self.driver.execute_cdp_cmd('Target.disposeBrowserContext', {'browserContextId': context})
+        except Exception:
+            pass
+
+    def _run_row(self, row_id, row, fn):
+        result = RowResult(row_id)
+        start = time.perf_counter()
+        context = None
+        try:
+            context = self._open_tab()
+            fn(row)
+        except (KeyboardInterrupt, SystemExit):
+            raise
+        except pytest.skip.Exception as e:
+            result.skipped = str(e) or 'skipped'
+        except BaseException as e:
+            # BaseException: pytest.fail inside a row only ends that row
+            result.error = e
+            result.traceback = traceback.format_exc()
+            try:
+                result.screenshot = self.driver.get_screenshot_as_png()
+            except Exception:
+                pass
+        finally:
+            if getattr(self._local, 'handle', None) is not None:
+                self._close_tab(context)
+            result.seconds = time.perf_counter() - start
+        return result
+
+    def run(self, rows, fn):
+        """Run `fn(row)` for every `(row_id, row)` pair; returns a RowResult per row, in order."""
+        driver = self.driver
+        home = driver.current_window_handle
+        had_own_execute = 'execute' in vars(driver)
+        execute = driver.execute
+        driver.execute = self._focused_execute(execute)
+        self._current = home
+        try:
+            with browser_waits.short_slices(), ThreadPoolExecutor(max_workers=self.max_tabs, thread_name_prefix='tab-row') as pool:
+                futures = [pool.submit(self._run_row, row_id, row, fn) for row_id, row in rows]
+                return [f.result() for f in futures]
+        finally:
+            if had_own_execute:
+                driver.execute = execute
+            else:
+                del driver.execute
+            try:
+                driver.switch_to.window(home)
+            except Exception:
+                pass
+
+
+def raise_for_failures(results):
+    """
+    Raise an AssertionError naming every failed row (with its traceback).
+
+    Skipped rows are not failures; when every row skipped, the test is skipped.
+    """
+    failed = [r for r in results if not r.passed]
+    if not failed:
+        if results and all(r.skipped for r in results):
+            pytest.skip('; '.join(f"{r.row_id}: {r.skipped}" for r in results))
+        return
+    lines = [f"{len(failed)} of {len(results)} rows failed: {', '.join(r.row_id for r in failed)}"]
+    for r in failed:
+        lines += ['', f"--- {r.row_id} ---", r.traceback.rstrip()]
+    raise AssertionError('\n'.join(lines))
@@ -0,0 +1,156 @@
+"""
+Sleep/wait budget instrumentation.
+
+With WAIT_BUDGET=true every test records how much time it spent in fixed
+`time.sleep` calls and in WebDriverWait waits. Totals are attached to the
+Allure result, stored in the test report's user_properties and summarised at
+the end of the run, so removed sleeps show up as savings and new ones as
+regressions.
+
+Sleeps made by WebDriverWait's own polling are counted as wait time, not sleep.
+Other instrumentation (e.g. utils.command_metrics) can subscribe to finished
+waits with add_wait_listener().
+"""
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+from selenium.webdriver.support.wait import WebDriverWait
+
+_original_sleep = time.sleep
+_original_until = WebDriverWait.until
+_original_until_not = WebDriverWait.until_not
+
+_local = threading.local()
+_current = None
+_wait_listeners = []
+_hooks_installed = False
+
+
+def is_wait_budget_enabled():
+    return os.environ.get('WAIT_BUDGET', 'false').lower() == 'true'
+
+
+class WaitBudget:
+    def __init__(self):
+        self.sleep_seconds = 0.0
+        self.sleep_count = 0
+        self.wait_seconds = 0.0
+        self.wait_count = 0
+        self._lock = threading.Lock()
+
+    def add_sleep(self, seconds):
+        with self._lock:
+            self.sleep_seconds += seconds
+            self.sleep_count += 1
+
+    def add_wait(self, seconds):
+        with self._lock:
+            self.wait_seconds += seconds
+            self.wait_count += 1
+
+    def as_dict(self):
+        return {
+            'sleep_seconds': round(self.sleep_seconds, 3),
+            'sleep_count': self.sleep_count,
+            'wait_seconds': round(self.wait_seconds, 3),
+            'wait_count': self.wait_count,
+        }
+
+
+def in_wait():
+    """True while the current thread is inside a WebDriverWait (or timed_wait block)."""
+    return getattr(_local, 'depth', 0) > 0
+
+
+def add_wait_listener(listener):
+    """Call `listener(driver, seconds)` after every outermost wait. Installs the wait hooks."""
+    install_wait_hooks()
+    _wait_listeners.append(listener)
+
+
+@contextmanager
+def timed_wait(driver=None):
+    """Count the enclosed block as wait time (and not its internal sleeps)."""
+    _local.depth = getattr(_local, 'depth', 0) + 1
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        _local.depth -= 1
+        if not in_wait():
+            elapsed = time.perf_counter() - start
+            budget = _current
+            if budget is not None:
+                budget.add_wait(elapsed)
+            for listener in _wait_listeners:
+                listener(driver, elapsed)
+
+
+def _recording_sleep(seconds):
+    budget = _current
+    if budget is not None and not in_wait():
+        budget.add_sleep(seconds)
+    _original_sleep(seconds)
+
+
+def _recording_until(self, method, message=""):
+    with timed_wait(getattr(self, '_driver', None)):
+        return _original_until(self, method, message)
+
+
+def _recording_until_not(self, method, message=""):
+    with timed_wait(getattr(self, '_driver', None)):
+        return _original_until_not(self, method, message)
+
+
+def install_wait_hooks():
+    """Route WebDriverWait.until/until_not through timed_wait (idempotent)."""
+    global _hooks_installed
+    if not _hooks_installed:
+        WebDriverWait.until = _recording_until
+        WebDriverWait.until_not = _recording_until_not
+        _hooks_installed = True
+
+
+def _uninstall_wait_hooks():
+    global _hooks_installed
+    WebDriverWait.until = _original_until
+    WebDriverWait.until_not = _original_until_not
+    _hooks_installed = False
+
+
+def start():
+    """Begin recording a new budget (installs the sleep/wait hooks)."""
+    global _current
+    _current = WaitBudget()
+    install_wait_hooks()
+    time.sleep = _recording_sleep
+    return _current
+
+
+def stop():
+    """Stop recording, restore the originals and return the finished budget."""
+    global _current
+    budget, _current = _current, None
+    time.sleep = _original_sleep
+    if not _wait_listeners:
+        # listeners (command metrics) still need the wait hooks
+        _uninstall_wait_hooks()
+    return budget
+
+
+def format_report(rows):
+    """
+    Lines of the end-of-run summary for [(nodeid, budget dict), ...]: the totals,
+    then one line per test, most sleep first.
+    """
+    rows = sorted(rows, key=lambda r: r[1]['sleep_seconds'], reverse=True)
+    total_sleep = sum(r[1]['sleep_seconds'] for r in rows)
+    total_wait = sum(r[1]['wait_seconds'] for r in rows)
+    lines = [f"total sleep {total_sleep:.2f}s, total wait {total_wait:.2f}s over {len(rows)} tests"]
+    for nodeid, budget in rows:
+        lines.append(f"{budget['sleep_seconds']:8.2f}s sleep ({budget['sleep_count']:3d})  "
+                     f"{budget['wait_seconds']:8.2f}s wait ({budget['wait_count']:3d})  {nodeid}")
+    return lines
@@ -0,0 +1,205 @@
+"""
+Readiness conditions for WebDriverWait, used instead of fixed time.sleep calls.
+
+Each condition follows the selenium `expected_conditions` protocol: it is a
+callable taking the driver and returning a truthy value once the page is ready.
+The checks run inside the browser so a page that is already settled passes on
+the first poll.
+
+- element_settled(locator_or_element): not moving between two animation frames
+  and no running CSS animation/transition (dropdowns, drawers, smooth scroll)
+- network_idle(quiet_ms=500): document loaded and no resource finished loading
+  in the last `quiet_ms`
+- text_changed(locator, previous): element text differs from `previous`
+  (e.g. cart count after "add to cart")
+- input_value_settled(locator): input value unchanged since the previous poll
+- requests_idle(quiet_ms=300): no fetch/XHR in flight and none finished in the
+  last `quiet_ms` (does not wait for images etc.)
+- dom_quiet(quiet_ms=300): no DOM mutation in the last `quiet_ms`
+- page_ready(locators, quiet_ms=300): app-level readiness used with the eager/none
+  page-load strategies: DOM parsed, key elements present, requests idle, DOM quiet
+
+requests_idle/dom_quiet count from READINESS_TRACKER_SCRIPT. get_driver
+installs it before any page script runs on Chromium; elsewhere it is
+installed by the first poll.
+"""
+from selenium.common.exceptions import NoSuchElementException, StaleElementReferenceException, WebDriverException
+from selenium.webdriver.remote.webelement import WebElement
+
+_SETTLED_SCRIPT = """
+var el = arguments[0], done = arguments[arguments.length - 1];
+function rect() { var r = el.getBoundingClientRect(); return [r.top, r.left, r.width, r.height].join(','); }
+function animating() {
+  if (!el.getAnimations) { return false; }
+  return el.getAnimations({subtree: true}).some(function (a) { return a.playState === 'running'; });
+}
+var first = rect();
+requestAnimationFrame(function () {
+  requestAnimationFrame(function () { done(rect() === first && !animating()); });
+});
+"""
+
+_NETWORK_IDLE_SCRIPT = """
+var quiet = arguments[0];
+if (document.readyState !== 'complete') { return false; }
+var entries = performance.getEntriesByType('resource');
+var last = 0;
+for (var i = 0; i < entries.length; i++) { last = Math.max(last, entries[i].responseEnd); }
+return performance.now() - last >= quiet;
+"""
+
+
+# Counts fetch/XHR in flight and records the time of the last request/DOM change.
+# Safe to run more than once per document.
+READINESS_TRACKER_SCRIPT = """
+(function () {
+  if (window.__readiness) { return; }
+  var state = window.__readiness = {pending: 0, lastRequest: performance.now(), lastMutation: performance.now()};
+  function started() { state.pending++; state.lastRequest = performance.now(); }
+  function finished() { state.pending = Math.max(0, state.pending - 1); state.lastRequest = performance.now(); }
+  if (window.fetch) {
+    var fetch = window.fetch;
+    window.fetch = function () {
+      started();
+      return fetch.apply(this, arguments).finally(finished);
+    };
+  }
+  var send = XMLHttpRequest.prototype.send;
+  XMLHttpRequest.prototype.send = function () {
+    started();
+    this.addEventListener('loadend', finished);
+    return send.apply(this, arguments);
+  };
+  function observe() {
+    new MutationObserver(function () { state.lastMutation = performance.now(); })
+      .observe(document.documentElement, {childList: true, subtree: true, attributes: true, characterData: true});
+  }
+  if (document.documentElement) { observe(); } else { document.addEventListener('readystatechange', observe, {once: true}); }
+})();
+"""
+
+_READINESS_SCRIPT = READINESS_TRACKER_SCRIPT + """
+var quiet = arguments[0], state = window.__readiness, now = performance.now();
+return {
+  parsed: document.readyState !== 'loading' && window.__leavingPage !== true,
+  requestsIdle: state.pending === 0 && now - state.lastRequest >= quiet,
+  domQuiet: now - state.lastMutation >= quiet
+};
+"""
+
+
+def _readiness(driver, quiet_ms):
+    try:
+        return driver.execute_script(_READINESS_SCRIPT, quiet_ms) or {}
+    except WebDriverException:
+        # navigation in progress (eager/none strategies return before the new document exists)
+        return {}
+
+
+def _resolve(driver, locator_or_element):
+    if isinstance(locator_or_element, WebElement):
+        return locator_or_element
+    return driver.find_element(*locator_or_element)
+
+
+class element_settled:
+    """Element is in place: same position across two frames and not animating."""
+
+    def __init__(self, locator_or_element):
+        self.target = locator_or_element
+
+    def __call__(self, driver):
+        try:
+            element = _resolve(driver, self.target)
+            if driver.execute_async_script(_SETTLED_SCRIPT, element):
+                return element
+            return False
+        except (NoSuchElementException, StaleElementReferenceException):
+            return False
+
+
+class network_idle:
+    """Page finished loading and no subresource completed in the last `quiet_ms`."""
+
+    def __init__(self, quiet_ms=500):
+        self.quiet_ms = quiet_ms
+
+    def __call__(self, driver):
+        try:
+            return bool(driver.execute_script(_NETWORK_IDLE_SCRIPT, self.quiet_ms))
+        except WebDriverException:
+            return False
+
+
+class requests_idle:
+    """No fetch/XHR in flight and none finished in the last `quiet_ms`."""
+
+    def __init__(self, quiet_ms=300):
+        self.quiet_ms = quiet_ms
+
+    def __call__(self, driver):
+        return bool(_readiness(driver, self.quiet_ms).get('requestsIdle'))
+
+
+class dom_quiet:
+    """No DOM mutation in the last `quiet_ms`."""
+
+    def __init__(self, quiet_ms=300):
+        self.quiet_ms = quiet_ms
+
+    def __call__(self, driver):
+        return bool(_readiness(driver, self.quiet_ms).get('domQuiet'))
+
+
+class page_ready:
+    """
+    Page is usable: DOM parsed, every locator in `locators` present, requests idle
+    and DOM quiet for `quiet_ms`. Does not wait for images, fonts or trackers.
+    """
+
+    def __init__(self, locators=(), quiet_ms=300):
+        self.locators = tuple(locators)
+        self.quiet_ms = quiet_ms
+
+    def __call__(self, driver):
+        state = _readiness(driver, self.quiet_ms)
+        if not (state.get('parsed') and state.get('requestsIdle') and state.get('domQuiet')):
+            return False
+        try:
+            return all(driver.find_elements(*locator) for locator in self.locators)
+        except WebDriverException:
+            return False
+
+
+class text_changed:
+    """Text of the element at `locator` differs from `previous` (None = element absent before)."""
+
+    def __init__(self, locator, previous):
+        self.locator = locator
+        self.previous = previous
+
+    def __call__(self, driver):
+        try:
+            text = driver.find_element(*self.locator).text
+        except (NoSuchElementException, StaleElementReferenceException):
+            return False
+        # True rather than the text: a change to "" (e.g. a cleared counter) must count too
+        return text != self.previous
+
+
+class input_value_settled:
+    """Input value is non-changing between two consecutive polls."""
+
+    def __init__(self, locator_or_element):
+        self.target = locator_or_element
+        self._last = object()
+
+    def __call__(self, driver):
+        try:
+            value = _resolve(driver, self.target).get_attribute('value')
+        except (NoSuchElementException, StaleElementReferenceException):
+            return False
+        if value == self._last:
+            return True
+        self._last = value
+        return False